@@ -1,24 +1,48 @@
-"""BEMServer Core"""
+"""BEMServer Core
 
+Submodules are imported on first use to keep import time low. In particular,
+CLI commands that only need the database don't pay for the whole stack.
+"""
+
+import importlib
 import os
 
-from bemserver_core import (
-    common,
-    database,
-    input_output,  # noqa
-    plugins,
-    settings,
-    tasks,  # noqa
-    utils,
-)
-from bemserver_core.celery import celery as celery_app
-from bemserver_core.email import ems
+from bemserver_core import settings, utils
 from bemserver_core.exceptions import BEMServerCoreSettingsError
-from bemserver_core.process.weather import wdp
+
+# Objects exposed at package level, imported on first access
+_LAZY_OBJECTS = {
+    "celery_app": ("bemserver_core.celery", "celery"),
+    "ems": ("bemserver_core.email", "ems"),
+    "wdp": ("bemserver_core.process.weather", "wdp"),
+}
+
+
+def __getattr__(name):
+    """Import submodules and objects on first access"""
+    if name in _LAZY_OBJECTS:
+        module_name, attr_name = _LAZY_OBJECTS[name]
+        return getattr(importlib.import_module(module_name), attr_name)
+    try:
+        return importlib.import_module(f"{__name__}.{name}")
+    except ModuleNotFoundError as exc:
+        if exc.name != f"{__name__}.{name}":
+            raise
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
 
 
 class BEMServerCore:
-    def __init__(self):
+    def __init__(self, *, worker=False):
+        """Load configuration and initialize components
+
+        :param bool worker: Whether current process is a Celery worker process,
+            in which case worker specific engine options are used
+        """
+        from bemserver_core import common, database, input_output, plugins
+        from bemserver_core.celery import celery as celery_app
+        from bemserver_core.email import ems
+        from bemserver_core.process.weather import wdp
+
         # Load config
         self.config = settings.DEFAULT_CONFIG.copy()
         file_path = os.environ.get("BEMSERVER_CORE_SETTINGS_FILE")
@@ -33,9 +57,13 @@ class BEMServerCore:
         self.config.update(cfg)
 
         # Set db URL
-        database.db.set_db_url(self.config["SQLALCHEMY_DATABASE_URI"])
+        database.db.init_core(self, worker=worker)
+
+        # Init timeseries data I/O
+        input_output.tsdio.init_core(self)
 
         # Load unit definition files
+        common.ureg.init_core(self)
         for file_path in self.config["UNIT_DEFINITION_FILES"]:
             common.ureg.load_definitions(file_path)
 
@@ -46,6 +74,7 @@ class BEMServerCore:
         ems.init_core(self)
 
         # Configure Celery
+        # Tasks are registered on first access to the task registry
         celery_app.set_default()
         celery_app.init_app(self)
 
@@ -53,4 +82,6 @@ class BEMServerCore:
         plugins.init_core(self)
 
     def load_units_definitions_file(self, file_path):
+        from bemserver_core import common
+
         common.ureg.load_definitions(file_path)
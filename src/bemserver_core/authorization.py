@@ -10,18 +10,57 @@ from bemserver_core.exceptions import (
     BEMServerAuthorizationError,
     BEMServerAuthorizationUndefinedActionError,
 )
-from bemserver_core.utils import make_context_var_manager
+from bemserver_core.utils import ContextVarManager, make_context_var_manager
 
 if typing.TYPE_CHECKING:
     from bemserver_core.model import User
 
 CURRENT_USER = ContextVar("current_user", default=None)
+CURRENT_USER_CACHE = ContextVar("current_user_cache", default=None)
 OPEN_BAR = ContextVar("open_bar", default=False)
 
-CurrentUser = make_context_var_manager(CURRENT_USER)
 OpenBar = functools.partial(make_context_var_manager(OPEN_BAR), True)
 
 
+class CurrentUser(ContextVarManager):
+    """Set current user for context
+
+    An empty cache is also set for the context to memoize data about current user
+    such as memberships. See ``get_current_user_cache``.
+    """
+
+    def __init__(self, user):
+        super().__init__(CURRENT_USER, user)
+        self._cache_token = None
+
+    def __enter__(self):
+        super().__enter__()
+        self._cache_token = CURRENT_USER_CACHE.set({})
+
+    def __exit__(self, *args, **kwargs):
+        CURRENT_USER_CACHE.reset(self._cache_token)
+        super().__exit__(*args, **kwargs)
+
+
+def get_current_user_cache(user):
+    """Get current user cache
+
+    :param User user: User the cached data is about
+
+    Returns None if user is not current user.
+    """
+    current_user = CURRENT_USER.get()
+    if current_user is None or current_user.id != user.id:
+        return None
+    return CURRENT_USER_CACHE.get()
+
+
+def clear_current_user_cache():
+    """Clear current user cache"""
+    if (cache := CURRENT_USER_CACHE.get()) is not None:
+        cache.clear()
+
+
 def get_current_user():
     current_user = CURRENT_USER.get()
     if current_user is None or not current_user.is_active:
@@ -39,6 +78,7 @@ class OpenBarPolarClass:
 class AuthorizationsManager:
     def __init__(self) -> None:
         self._rules: dict = {}
+        self._many_rules: dict = {}
 
     def add_rule(self, action: str) -> typing.Callable:
         def decorator(func: typing.Callable):
@@ -53,6 +93,26 @@ class AuthorizationsManager:
 
         return decorator
 
+    def add_many_rule(self, action: str) -> typing.Callable:
+        """Add a rule to evaluate an action on many items at once
+
+        The rule is called with the actor and the list of items and must return
+        True only if the action is authorized on all items. If no such rule is
+        defined for an action, the single item rule is evaluated for each item.
+        """
+
+        def decorator(func: typing.Callable):
+            if action in self._many_rules:
+                warnings.warn(
+                    f"Redefining many items authorization rule for {action}",
+                    RuntimeWarning,
+                    stacklevel=1,
+                )
+            self._many_rules[action] = func
+            return func
+
+        return decorator
+
     def eval_rule(self, action: str, actor: "User", item: any):
         try:
             rule = self._rules[action]
@@ -69,6 +129,24 @@ class AuthorizationsManager:
         ):
             raise BEMServerAuthorizationError
 
+    def eval_many_rule(self, action: str, actor: "User", items: list):
+        try:
+            rule = self._many_rules[action]
+        except KeyError:
+            return all(self.eval_rule(action, actor, item) for item in items)
+        return rule(actor, items)
+
+    def authorize_many(self, action: str, items: typing.Iterable) -> bool:
+        actor = get_current_user()
+        items = list(items)
+        if not (
+            OPEN_BAR.get()
+            or actor.is_admin
+            or not items
+            or self.eval_many_rule(action, actor, items)
+        ):
+            raise BEMServerAuthorizationError
+
     def authorize_query(self, model_cls, query):
         actor = get_current_user()
         if not (OPEN_BAR.get() or actor.is_admin):
@@ -6,14 +6,14 @@ Manages scheduled and asynchronous tasks
 from functools import wraps
 from zoneinfo import ZoneInfo
 
-from celery import Celery, Task, signals
+from celery import Celery, Task, chord, signals
 from celery.exceptions import WorkerShutdown
 from celery.utils.log import get_task_logger
 
-from bemserver_core import model
 from bemserver_core.authorization import CurrentUser, OpenBar
-from bemserver_core.database import db
+from bemserver_core.database import PrimaryDB, db
 from bemserver_core.exceptions import BEMServerCoreSettingsError, BEMServerCoreTaskError
+from bemserver_core.time_utils import PeriodEnum, make_time_windows
 
 logger = get_task_logger(__name__)
 
@@ -29,11 +29,11 @@ class DefaultCeleryConfig:
 
 
 def task_wrapper(func):
-    """Wrap function in OpenBar context"""
+    """Wrap function in OpenBar and PrimaryDB contexts"""
 
     @wraps(func)
     def wrapper(*func_args, **func_kwargs):
-        with OpenBar():
+        with OpenBar(), PrimaryDB():
             return func(*func_args, **func_kwargs)
 
     return wrapper
@@ -49,6 +49,8 @@ class BEMServerCoreSystemTask(Task):
     """Celery Task override
 
     - Wrap tasks in OpenBar context
+    - Send all queries to primary database, as tasks may write data depending on
+      data they read
     """
 
     def __init__(self):
@@ -64,10 +66,28 @@ class BEMServerCoreClassBasedTaskMixin:
 
 
 class BEMServerCoreAsyncTask(BEMServerCoreClassBasedTaskMixin, Task):
+    """Asynchronous task
+
+    If ``window_unit`` parameter is passed, the time interval is split into
+    windows of ``window_value`` (default: 1) ``window_unit`` processed and
+    committed one after another. On failure, the task is retried from the
+    failed window, so that completed windows are not processed again.
+
+    All queries are sent to primary database, as tasks may write data depending
+    on data they read.
+    """
+
     TASK_FUNCTION = None
     DEFAULT_PARAMETERS = {}
 
     def run(self, user_id, campaign_id, start_dt, end_dt, **kwargs):
+        with PrimaryDB():
+            return self._run(user_id, campaign_id, start_dt, end_dt, **kwargs)
+
+    def _run(self, user_id, campaign_id, start_dt, end_dt, **kwargs):
+        # Imported here to avoid circular import (model imports system tasks)
+        from bemserver_core import model
+
         logger.info("Start")
 
         with OpenBar():
@@ -80,34 +100,101 @@ class BEMServerCoreAsyncTask(BEMServerCoreClassBasedTaskMixin, Task):
             if campaign is None:
                 raise BEMServerCoreTaskError(f"Unknown campaign ID {campaign_id}")
 
-            # Function is bound at init. Use __func__ to avoid passing self
-            self.TASK_FUNCTION.__func__(
-                campaign,
-                start_dt.astimezone(ZoneInfo(campaign.timezone)),
-                end_dt.astimezone(ZoneInfo(campaign.timezone)),
-                **{**self.DEFAULT_PARAMETERS, **kwargs},
-            )
+            tz_info = ZoneInfo(campaign.timezone)
+            start_dt = start_dt.astimezone(tz_info)
+            end_dt = end_dt.astimezone(tz_info)
+            params = {**self.DEFAULT_PARAMETERS, **kwargs}
+            window_unit = params.pop("window_unit", None)
+            window_value = params.pop("window_value", 1)
+
+            if window_unit is None:
+                # Function is bound at init. Use __func__ to avoid passing self
+                self.TASK_FUNCTION.__func__(campaign, start_dt, end_dt, **params)
+                return
+
+            for window_start_dt, window_end_dt in make_time_windows(
+                start_dt, end_dt, PeriodEnum(window_unit).value, window_value
+            ):
+                logger.info("Window: [%s - %s]", window_start_dt, window_end_dt)
+                try:
+                    self.TASK_FUNCTION.__func__(
+                        campaign, window_start_dt, window_end_dt, **params
+                    )
+                    db.session.commit()
+                except Exception as exc:
+                    db.session.rollback()
+                    # Resume from failed window
+                    raise self.retry(
+                        args=(user_id, campaign_id, window_start_dt, end_dt),
+                        kwargs=kwargs,
+                        exc=exc,
+                    ) from exc
 
 
 class BEMServerCoreScheduledTask(
     BEMServerCoreClassBasedTaskMixin, BEMServerCoreSystemTask
 ):
+    """Scheduled task
+
+    When called without arguments, fan out into child tasks processing enabled
+    campaigns in parallel. Campaigns are split into at most
+    ``SCHEDULED_TASKS_CONCURRENCY`` child tasks, or one child task per campaign
+    if concurrency is not limited.
+
+    Time windows parameters are supported as in ``BEMServerCoreAsyncTask``.
+    """
+
     TASK_FUNCTION = None
     DEFAULT_PARAMETERS = {}
 
-    def run(self):
+    def run(self, task_by_campaign_ids=None):
+        # Imported here to avoid circular import (model imports system tasks)
+        from bemserver_core import model
+
         logger.info("Start")
 
-        for tbc in model.TaskByCampaign.get(task_name=self.name, is_enabled=True):
-            start_dt, end_dt = tbc.make_interval()
+        if task_by_campaign_ids is None:
+            return self._fan_out()
 
-            # Function is bound at init. Use __func__ to avoid passing self
-            self.TASK_FUNCTION.__func__(
-                tbc.campaign,
-                start_dt,
-                end_dt,
-                **{**self.DEFAULT_PARAMETERS, **tbc.parameters},
-            )
+        campaign_ids = []
+        for tbc_id in task_by_campaign_ids:
+            tbc = model.TaskByCampaign.get_by_id(tbc_id)
+            start_dt, end_dt = tbc.make_interval()
+            params = {**self.DEFAULT_PARAMETERS, **tbc.parameters}
+            window_unit = params.pop("window_unit", None)
+            window_value = params.pop("window_value", 1)
+            if window_unit is None:
+                windows = [(start_dt, end_dt)]
+            else:
+                windows = make_time_windows(
+                    start_dt, end_dt, PeriodEnum(window_unit).value, window_value
+                )
+
+            for window_start_dt, window_end_dt in windows:
+                # Function is bound at init. Use __func__ to avoid passing self
+                self.TASK_FUNCTION.__func__(
+                    tbc.campaign, window_start_dt, window_end_dt, **params
+                )
+                db.session.commit()
+            campaign_ids.append(tbc.campaign_id)
+        return campaign_ids
+
+    def _fan_out(self):
+        from bemserver_core import model
+
+        tbc_ids = [
+            tbc.id
+            for tbc in model.TaskByCampaign.get(task_name=self.name, is_enabled=True)
+        ]
+        if not tbc_ids:
+            logger.debug("No enabled campaign")
+            return None
+        concurrency = self.app.scheduled_tasks_concurrency or len(tbc_ids)
+        batches = [tbc_ids[i::concurrency] for i in range(concurrency)]
+        header = [self.si(batch) for batch in batches if batch]
+        logger.debug("Running %s child tasks", len(header))
+        result = chord(header)(aggregate_scheduled_task_results.s(self.name))
+        return result.id
 
 
 class BEMServerCoreCelery(Celery):
@@ -117,11 +204,32 @@ class BEMServerCoreCelery(Celery):
     """
 
     SCHEDULED_TASKS_NAME_SUFFIX = "Scheduled"
+    NOTIFICATION_EMAIL_DIGEST_TASK_NAME = "NotificationEmailDigest"
+
+    # Max number of child tasks of a scheduled task (0 means no limit)
+    scheduled_tasks_concurrency = 0
 
     def init_app(self, bsc):
         """Init Celery app with BEMServerCore instance"""
         self.bsc = bsc
         self.conf.update(bsc.config["CELERY_CONFIG"])
+        self.scheduled_tasks_concurrency = bsc.config["SCHEDULED_TASKS_CONCURRENCY"]
+
+        # Schedule notification email digest unless already in beat schedule
+        beat_schedule = bsc.config["CELERY_CONFIG"].get("beat_schedule", {})
+        digest_interval = bsc.config["NOTIFICATION_EMAIL_DIGEST_INTERVAL"]
+        if digest_interval and not any(
+            entry["task"] == self.NOTIFICATION_EMAIL_DIGEST_TASK_NAME
+            for entry in beat_schedule.values()
+        ):
+            beat_schedule = {
+                **beat_schedule,
+                "notification_email_digest": {
+                    "task": self.NOTIFICATION_EMAIL_DIGEST_TASK_NAME,
+                    "schedule": digest_interval,
+                },
+            }
+        self.conf.beat_schedule = beat_schedule
 
     def register_task(self, task, **options):
         """Register task
@@ -146,14 +254,38 @@ celery = BEMServerCoreCelery("BEMServer Core")
 celery.config_from_object(DefaultCeleryConfig)
 
 
+@celery.task(name="AggregateScheduledTaskResults", base=BEMServerCoreSystemTask)
+def aggregate_scheduled_task_results(results, task_name):
+    """Aggregate results of scheduled task child tasks
+
+    Return the list of processed campaign IDs.
+    """
+    campaign_ids = [c_id for batch_results in results for c_id in batch_results]
+    logger.info("%s processed campaigns %s", task_name, campaign_ids)
+    return campaign_ids
+
+
+@celery.on_after_finalize.connect
+def register_tasks(sender, **kwargs):
+    """Register tasks on first access to the task registry
+
+    Tasks modules are not imported with the package to keep import time low.
+    """
+    import bemserver_core.tasks  # noqa: F401
+
+
 @signals.worker_process_init.connect
 def worker_process_init_cb(**kwargs):
     """Callback executed at worker init to setup BEMServerCore"""
     # Avoid circular import issue
     from bemserver_core import BEMServerCore
 
+    # Worker process is forked: drop DB connections inherited from parent
+    db.dispose(close=False)
+
+    # Use worker specific connection pool settings
     try:
-        BEMServerCore()
+        BEMServerCore(worker=True)
     except BEMServerCoreSettingsError as exc:
         logger.critical(str(exc))
         raise WorkerShutdown() from exc
@@ -1,4 +1,7 @@
-from bemserver_core import BEMServerCore
+from bemserver_core import (
+    BEMServerCore,
+    tasks,  # noqa
+)
 from bemserver_core.celery import celery  # noqa
 
 BEMServerCore()
@@ -5,7 +5,7 @@ This module provides commands made available as CLI commands.
 
 import click
 
-from bemserver_core import BEMServerCore, database, migrations, model
+from bemserver_core import BEMServerCore, database, migrations
 
 
 def setup_db():
@@ -15,6 +15,8 @@ def setup_db():
 
     This function assumes DB URI is set.
     """
+    from bemserver_core import model
+
     database.db.create_all(checkfirst=False)
     database.init_db_functions()
     model.events.init_db_events_triggers()
@@ -23,6 +25,7 @@ def setup_db():
     model.campaigns.init_db_campaigns_triggers()
     model.timeseries.init_db_timeseries_triggers()
     model.timeseries.init_db_timeseries()
+    model.timeseries_data.init_db_timeseries_data_partitions()
     model.sites.init_db_structural_elements_triggers()
     model.energy.init_db_energy()
     database.db.session.commit()
@@ -54,6 +57,8 @@ def setup_db_cmd():
 )
 def create_user_cmd(name, email, admin, inactive, password):
     """Create a new user"""
+    from bemserver_core import model
+
     BEMServerCore()
     user = model.User(
         name=name,
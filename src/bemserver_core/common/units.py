@@ -1,5 +1,8 @@
+from functools import lru_cache
 from pathlib import Path
 
+import numpy as np
+
 import pint
 
 from bemserver_core.exceptions import (
@@ -10,16 +13,62 @@ from bemserver_core.exceptions import (
 # This file adds units to Pint default units
 BEMSERVER_UNITS_FILE = Path(__file__).parent / "units.txt"
 
+# (scale, offset) conversion plan of a conversion leaving data unchanged
+IDENTITY_PLAN = (1.0, 0.0)
+
+# Span between points used to compute conversion scale
+CONVERSION_PLAN_SPAN = 1e6
+
 
 class BEMServerUnitRegistry:
-    def __init__(self):
-        self._ureg = pint.UnitRegistry()
+    """Unit registry
+
+    The pint registry is built on first use, loading definition files passed
+    to ``load_definitions`` until then. If ``cache_folder`` is set, parsed
+    definitions are cached on disk, which speeds up registry creation in new
+    processes.
+    """
+
+    def __init__(self, cache_folder=None):
+        self._cache_folder = cache_folder
+        self._definition_files = []
+        self._registry = None
+        self._get_conversion_plan = lru_cache(maxsize=1024)(self._make_conversion_plan)
+
+    def init_core(self, bsc):
+        """Initialize with settings from BEMServerCore configuration
+
+        If the cache folder changed, the registry is rebuilt on next use.
+        """
+        cache_folder = bsc.config["UNITS_CACHE_FOLDER"]
+        if cache_folder != self._cache_folder:
+            self._cache_folder = cache_folder
+            self._registry = None
+            self._get_conversion_plan.cache_clear()
+
+    @property
+    def _ureg(self):
+        if self._registry is None:
+            registry = pint.UnitRegistry(cache_folder=self._cache_folder)
+            for file_path in self._definition_files:
+                registry.load_definitions(file_path)
+            self._registry = registry
+        return self._registry
 
     def __iter__(self):
         return iter(self._ureg)
 
     def load_definitions(self, file_path):
-        self._ureg.load_definitions(file_path)
+        """Load unit definition file
+
+        Files already loaded are skipped.
+        """
+        if file_path in self._definition_files:
+            return
+        self._definition_files.append(file_path)
+        if self._registry is not None:
+            self._registry.load_definitions(file_path)
+            self._get_conversion_plan.cache_clear()
 
     def validate_unit(self, unit_str):
         try:
@@ -30,19 +79,43 @@ class BEMServerUnitRegistry:
         ) as exc:
             raise BEMServerCoreUndefinedUnitError(str(exc)) from exc
 
+    def _convert(self, data, src_unit, dest_unit):
+        try:
+            return self._ureg.Quantity(data, src_unit).m_as(dest_unit)
+        except pint.errors.UndefinedUnitError as exc:
+            raise BEMServerCoreUndefinedUnitError(str(exc)) from exc
+        except pint.errors.DimensionalityError as exc:
+            raise BEMServerCoreDimensionalityError(str(exc)) from exc
+
+    def _make_conversion_plan(self, src_unit, dest_unit):
+        """Compute (scale, offset) to convert data from a unit to another
+
+        Returns None if the conversion is not affine (e.g. logarithmic units).
+        """
+        # Compute scale from distant points to limit rounding errors due to offset
+        with np.errstate(all="ignore"):
+            offset, one, far = self._convert(
+                np.array([0.0, 1.0, CONVERSION_PLAN_SPAN]), src_unit, dest_unit
+            )
+        scale = (far - offset) / CONVERSION_PLAN_SPAN
+        if not np.isclose(one, offset + scale):
+            return None
+        return scale, offset
+
     def convert(self, data, src_unit, dest_unit):
         """Convert data from a unit to another
 
         :param Number|list data: Data to convert
         :param string src_unit: Source unit
         :param string dest_unit: Destination unit
+
+        Conversion scale and offset are cached for each couple of units.
         """
-        try:
-            return self._ureg.Quantity(data, src_unit).m_as(dest_unit)
-        except pint.errors.UndefinedUnitError as exc:
-            raise BEMServerCoreUndefinedUnitError(str(exc)) from exc
-        except pint.errors.DimensionalityError as exc:
-            raise BEMServerCoreDimensionalityError(str(exc)) from exc
+        plan = self._get_conversion_plan(src_unit, dest_unit)
+        if plan is None:
+            return self._convert(data, src_unit, dest_unit)
+        scale, offset = plan
+        return np.asarray(data) * scale + offset
 
     def convert_df(self, data_df, src_units, dest_units):
         """Convert data in a dataframe
@@ -54,9 +127,22 @@ class BEMServerUnitRegistry:
         Only columns in desc_units are converted. src_units is supposed to contain
         all keys in dest_units.
         """
-        for col in data_df.columns:
-            if col in dest_units:
-                data_df[col] = self.convert(
+        cols = [col for col in data_df.columns if col in dest_units]
+        plans = {
+            col: self._get_conversion_plan(src_units[col], dest_units[col])
+            for col in cols
+        }
+        # Convert columns with affine conversions at once
+        # Skip identity conversions to leave data (and dtype) unchanged
+        affine_cols = [col for col in cols if plans[col] not in (None, IDENTITY_PLAN)]
+        if affine_cols:
+            scales, offsets = np.array([plans[col] for col in affine_cols]).T
+            data_df[affine_cols] = (
+                data_df[affine_cols].to_numpy(dtype=float) * scales + offsets
+            )
+        for col in cols:
+            if plans[col] is None:
+                data_df[col] = self._convert(
                     data_df[col].values, src_units[col], dest_units[col]
                 )
 
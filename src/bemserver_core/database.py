@@ -1,11 +1,15 @@
 """Databases: SQLAlchemy database access"""
 
-from functools import wraps
+from contextvars import ContextVar
+from functools import partial, wraps
 from itertools import chain
 from textwrap import dedent
 
 import sqlalchemy as sqla
-from sqlalchemy.orm import DeclarativeBase, scoped_session, sessionmaker
+from sqlalchemy.orm import DeclarativeBase, Session, scoped_session, sessionmaker
+from sqlalchemy.sql.expression import SelectBase
+
+from bemserver_core.utils import make_context_var_manager
 
 # https://alembic.sqlalchemy.org/en/latest/naming.html
 NAMING_CONVENTION = {
@@ -17,7 +21,56 @@ NAMING_CONVENTION = {
 }
 
 
-SESSION_FACTORY = sessionmaker()
+# None if not explicitly set by ReadReplica or PrimaryDB
+READ_REPLICA = ContextVar("read_replica", default=None)
+
+# Send read queries to read replica database, if any, in context
+ReadReplica = partial(make_context_var_manager(READ_REPLICA), True)
+# Send all queries to primary database in context
+PrimaryDB = partial(make_context_var_manager(READ_REPLICA), False)
+
+
+def use_read_replica(func):
+    """Send read queries of decorated function to read replica database
+
+    Reads may lag behind the primary database. In particular, data written in
+    current transaction is not visible. Only use for read-only entry points
+    (e.g. API GET requests), never for functions writing data depending on data
+    they read. Use ``PrimaryDB`` context to read from primary database anyway.
+    """
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        if READ_REPLICA.get() is not None:
+            return func(*args, **kwargs)
+        with ReadReplica():
+            return func(*args, **kwargs)
+
+    return wrapper
+
+
+class RoutingSession(Session):
+    """Session routing read queries to read replica database in context
+
+    Only SELECT statements not locking rows are sent to read replica. Textual
+    SELECT statements must be declared as such using ``text(...).columns()``.
+    Anything else (flushes, data modification and textual statements, raw
+    connection usage,...) goes to primary database.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if (
+            db.replica_engine is not None
+            and READ_REPLICA.get()
+            and not self._flushing
+            and isinstance(clause, SelectBase)
+            and getattr(clause, "_for_update_arg", None) is None
+        ):
+            return db.replica_engine
+        return super().get_bind(mapper=mapper, clause=clause, **kwargs)
+
+
+SESSION_FACTORY = sessionmaker(class_=RoutingSession)
 DB_SESSION = scoped_session(SESSION_FACTORY)
 
 
@@ -186,17 +239,108 @@ class DBConnection:
 
     def __init__(self):
         self.engine = None
+        self.replica_engine = None
+        self._caches = []
 
-    def set_db_url(self, db_url):
-        """Set DB URL"""
-        self.engine = sqla.create_engine(
-            db_url,
-            # Set UTC for all connections
-            connect_args={"options": "-c timezone=utc"},
+    def register_cache(self, cache):
+        """Register a cache of database data
+
+        Registered caches are cleared when DB URL is set.
+        """
+        self._caches.append(cache)
+        return cache
+
+    def init_core(self, bsc, *, worker=False):
+        """Initialize with settings from BEMServerCore configuration
+
+        :param BEMServerCore bsc: BEMServerCore instance
+        :param bool worker: Whether current process is a Celery worker process,
+            in which case worker specific engine options are merged into engine
+            options, for both primary database and read replica engines
+        """
+        engine_options = bsc.config["SQLALCHEMY_ENGINE_OPTIONS"]
+        if worker:
+            engine_options = {
+                **engine_options,
+                **bsc.config["SQLALCHEMY_WORKER_ENGINE_OPTIONS"],
+            }
+        self.set_db_url(bsc.config["SQLALCHEMY_DATABASE_URI"], **engine_options)
+        self.set_replica_url(
+            bsc.config["SQLALCHEMY_READ_REPLICA_URI"], **engine_options
         )
+
+    @staticmethod
+    def _create_engine(db_url, **engine_options):
+        connect_args = dict(engine_options.pop("connect_args", {}))
+        # Set UTC for all connections, keeping user connection options
+        # (e.g. "-c statement_timeout=30000")
+        connect_args["options"] = " ".join(
+            filter(None, ("-c timezone=utc", connect_args.get("options")))
+        )
+        return sqla.create_engine(db_url, connect_args=connect_args, **engine_options)
+
+    def set_db_url(self, db_url, **engine_options):
+        """Set DB URL
+
+        :param str db_url: Database URL
+        :param engine_options: Keyword parameters passed to create_engine
+            (pool_size, max_overflow, pool_pre_ping, pool_recycle,...)
+
+        Any read replica is unset.
+        """
+        self.engine = self._create_engine(db_url, **engine_options)
+        self.replica_engine = None
         SESSION_FACTORY.configure(bind=self.engine)
         # Remove any existing session from registry
         DB_SESSION.remove()
+        # Clear caches of data from any former database
+        for cache in self._caches:
+            cache.clear()
+
+    def set_replica_url(self, db_url, **engine_options):
+        """Set read replica DB URL
+
+        :param str db_url: Read replica database URL. None to unset.
+        :param engine_options: Keyword parameters passed to create_engine
+
+        Read queries issued in ``ReadReplica`` context are sent to read replica.
+        """
+        self.replica_engine = (
+            None if db_url is None else self._create_engine(db_url, **engine_options)
+        )
+        # Remove any existing session bound to former read replica
+        DB_SESSION.remove()
+
+    def dispose(self, *, close=True):
+        """Dispose engines connection pools
+
+        :param bool close: Whether to close pooled connections. In a forked
+            process, use False to drop connections inherited from the parent
+            process without closing them, as the parent process still uses them.
+        """
+        for engine in (self.engine, self.replica_engine):
+            if engine is not None:
+                engine.dispose(close=close)
+
+    def get_pool_status(self, *, replica=False):
+        """Get connection pool statistics
+
+        :param bool replica: Whether to get read replica pool statistics
+
+        Returns a dict with pool size and number of connections checked in,
+        checked out and in overflow. Returns an empty dict if no DB URL is set
+        or if the pool does not keep connections (e.g. NullPool).
+        """
+        engine = self.replica_engine if replica else self.engine
+        pool = getattr(engine, "pool", None)
+        if not isinstance(pool, sqla.pool.QueuePool):
+            return {}
+        return {
+            "size": pool.size(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": pool.overflow(),
+        }
 
     @property
     def session(self):
@@ -1,6 +1,7 @@
 """Email"""
 
 import smtplib
+import threading
 from email.message import EmailMessage
 
 from bemserver_core.celery import BEMServerCoreSystemTask, celery, logger
@@ -11,29 +12,73 @@ class EmailSender:
 
     This implementation does not provide SMTP authentication. It assumes an open
     relay is available, typically localhost.
+
+    The SMTP connection is opened on first use and reused for subsequent
+    messages. If the server closed it in the meantime, it is reopened.
     """
 
     def __init__(self):
         self._enabled = False
         self._sender_addr = None
         self._host = None
+        self._port = None
+        self._smtp = None
+        self._lock = threading.Lock()
 
     def init_core(self, bsc):
         """Initialize with settings from BEMServerCore configuration"""
+        self.close()
         self._enabled = bsc.config["SMTP_ENABLED"]
         self._sender_addr = bsc.config["SMTP_FROM_ADDR"]
         self._host = bsc.config["SMTP_HOST"]
+        self._port = bsc.config["SMTP_PORT"]
+
+    def _make_message(self, dest_addrs, subject, content):
+        msg = EmailMessage()
+        msg["Subject"] = subject
+        msg["From"] = self._sender_addr
+        msg["To"] = ", ".join(dest_addrs)
+        msg.set_content(content)
+        return msg
+
+    def _send_message(self, msg):
+        """Send message using current connection, reconnecting if needed"""
+        if self._smtp is not None:
+            try:
+                self._smtp.send_message(msg)
+                return
+            except (smtplib.SMTPServerDisconnected, ConnectionError):
+                logger.debug("SMTP connection lost. Reconnecting.")
+                self._close()
+        self._smtp = smtplib.SMTP(self._host, self._port, timeout=3)
+        self._smtp.send_message(msg)
+
+    def _close(self):
+        if self._smtp is not None:
+            try:
+                self._smtp.quit()
+            except (smtplib.SMTPException, OSError):
+                pass
+            self._smtp = None
+
+    def close(self):
+        """Close SMTP connection"""
+        with self._lock:
+            self._close()
 
     def send(self, dest_addrs, subject, content):
         """Create and send message"""
+        self.send_many([(dest_addrs, subject, content)])
+
+    def send_many(self, messages):
+        """Create and send messages over a single SMTP connection
+
+        :param list messages: List of (dest_addrs, subject, content) tuples
+        """
         if self._enabled:
-            msg = EmailMessage()
-            msg["Subject"] = subject
-            msg["From"] = self._sender_addr
-            msg["To"] = ", ".join(dest_addrs)
-            msg.set_content(content)
-            with smtplib.SMTP(self._host, timeout=3) as smtp:
-                smtp.send_message(msg)
+            with self._lock:
+                for dest_addrs, subject, content in messages:
+                    self._send_message(self._make_message(dest_addrs, subject, content))
 
 
 ems = EmailSender()
@@ -41,6 +41,10 @@ class BEMServerCoreJSONIOError(BEMServerCoreIOError):
     """JSON IO error"""
 
 
+class BEMServerCoreArrowIOError(BEMServerCoreIOError):
+    """Arrow (IPC or Parquet) IO error"""
+
+
 class SitesCSVIOError(BEMServerCoreCSVIOError):
     """Sites CSV IO error"""
 
@@ -77,6 +81,10 @@ class TimeseriesDataJSONIOError(BEMServerCoreJSONIOError, TimeseriesDataIOError)
     """Timeseries data JSON IO error"""
 
 
+class TimeseriesDataArrowIOError(BEMServerCoreArrowIOError, TimeseriesDataIOError):
+    """Timeseries data Arrow (IPC or Parquet) IO error"""
+
+
 class BEMServerCoreUnitError(BEMServerCoreError):
     """Unit error"""
 
@@ -105,6 +113,10 @@ class BEMServerCoreTaskError(BEMServerCoreError):
     """Error in task execution"""
 
 
+class BEMServerCoreRetentionPolicyError(BEMServerCoreError):
+    """Retention policy error"""
+
+
 class BEMServerCoreWeatherAPIError(BEMServerCoreError):
     """Error in weather API call"""
 
@@ -1,5 +1,11 @@
 """I/O"""
 
-from .timeseries_data_io import tsdio, tsdcsvio, tsdjsonio  # noqa
+from .timeseries_data_io import (  # noqa
+    tsdio,
+    tsdcsvio,
+    tsdjsonio,
+    tsdarrowio,
+    tsdparquetio,
+)
 from .sites_io import sites_csv_io  # noqa
 from .timeseries_io import timeseries_csv_io  # noqa
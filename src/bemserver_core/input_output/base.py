@@ -104,3 +104,23 @@ class BaseCSVFileIO(BaseCSVIO, BaseFileIOMixin):
 
 class BaseJSONIO(BaseIO):
     """Base class for JSON IO classes"""
+
+
+class BaseArrowIO(BaseIO):
+    """Base class for Arrow (IPC or Parquet) IO classes
+
+    pyarrow is an optional dependency. It is imported on first use.
+    """
+
+    @staticmethod
+    def _import_pyarrow():
+        try:
+            import pyarrow
+            import pyarrow.ipc
+            import pyarrow.parquet
+        except ImportError as exc:
+            raise ImportError(
+                "pyarrow is required for Arrow IO. "
+                'Install it with "pip install bemserver-core[arrow]".'
+            ) from exc
+        return pyarrow
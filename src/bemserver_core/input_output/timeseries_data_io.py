@@ -15,6 +15,7 @@ from bemserver_core.authorization import auth_mgr
 from bemserver_core.common import ureg
 from bemserver_core.database import db
 from bemserver_core.exceptions import (
+    TimeseriesDataArrowIOError,
     TimeseriesDataCSVIOError,
     TimeseriesDataIODatetimeError,
     TimeseriesDataIOInvalidAggregationError,
@@ -26,26 +27,71 @@ from bemserver_core.model import (
     Timeseries,
     TimeseriesByDataState,
     TimeseriesData,
+    TimeseriesDataDirtyInterval,
+)
+from bemserver_core.model.timeseries_data import ROLLUP_PERIODS
+from bemserver_core.time_utils import (
+    FIXED_SIZE_PERIODS,
+    PERIODS,
+    ceil,
+    floor,
+    make_pandas_freq,
 )
-from bemserver_core.time_utils import PERIODS, ceil, floor, make_pandas_freq
 
-from .base import BaseCSVIO, BaseJSONIO
+from .base import BaseArrowIO, BaseCSVIO, BaseJSONIO
 
 AGGREGATION_FUNCTIONS = ("avg", "sum", "min", "max", "count")
 
-# Function to use to re-aggregate in pandas after SQL aggregation
-PANDAS_RE_AGGREG_FUNC_MAPPING = {
-    "avg": "mean",
-    "min": "min",
-    "max": "max",
-    "sum": "sum",
-    "count": "sum",
+# Default number of values per chunk when streaming exports
+EXPORT_CHUNK_SIZE = 100_000
+
+# Number of rows encoded and sent at once when inserting using COPY
+COPY_CHUNK_SIZE = 100_000
+
+# PostgreSQL binary COPY format
+# https://www.postgresql.org/docs/current/sql-copy.html#id-1.9.3.55.9.4
+COPY_BINARY_HEADER = b"PGCOPY\n\xff\r\n\x00" + bytes(8)
+COPY_BINARY_TRAILER = b"\xff\xff"
+# Row: field count, then (length, value) for each field, in network byte order
+COPY_BINARY_ROW_DTYPE = np.dtype(
+    [
+        ("nb_fields", ">i2"),
+        ("tsbds_id_len", ">i4"),
+        ("tsbds_id", ">i4"),
+        ("timestamp_len", ">i4"),
+        ("timestamp", ">i8"),
+        ("value_len", ">i4"),
+        ("value", ">f8"),
+    ]
+)
+# PostgreSQL timestamps are microseconds since 2000-01-01
+POSTGRES_EPOCH_US = 946_684_800_000_000
+
+# SQL expression to re-aggregate partial aggregates from raw data and rollups
+ROLLUP_RE_AGGREG_FUNC_MAPPING = {
+    "avg": "sum(sum) / CAST(NULLIF(sum(count), 0) AS float8)",
+    "sum": "sum(sum)",
+    "min": "min(min)",
+    "max": "max(max)",
+    "count": "CAST(sum(count) AS bigint)",
 }
 
 
 class TimeseriesDataIO:
     """Base class for TimeseriesData IO classes"""
 
+    # Whether set_timeseries_data uses COPY rather than INSERT by default
+    _use_copy = False
+    # Whether rollups are maintained and used for bucketed queries
+    _use_rollups = False
+
+    @classmethod
+    def init_core(cls, bsc):
+        """Initialize with settings from BEMServerCore configuration"""
+        # Set on base class so that the settings apply to all IO classes
+        TimeseriesDataIO._use_copy = bsc.config["TIMESERIES_DATA_IO_USE_COPY"]
+        TimeseriesDataIO._use_rollups = bsc.config["TIMESERIES_DATA_ROLLUPS"]
+
     @classmethod
     def get_last(
         cls,
@@ -73,8 +119,7 @@ class TimeseriesDataIO:
         Returns a dataframe.
         """
         # Check permissions
-        for ts in timeseries:
-            auth_mgr.authorize("read_ts_data", ts)
+        auth_mgr.authorize_many("read_ts_data", timeseries)
 
         params = {
             "timeseries_ids": [ts.id for ts in timeseries],
@@ -105,7 +150,7 @@ class TimeseriesDataIO:
             f"{time_interval_filter}"
             f"ORDER BY timeseries.{col_label}, timestamp DESC"
         )
-        data = db.session.execute(sqla.text(query), params)
+        data = db.session.execute(sqla.text(query).columns(), params)
 
         data_df = (
             pd.DataFrame(
@@ -145,8 +190,7 @@ class TimeseriesDataIO:
         Returns a dataframe.
         """
         # Check permissions
-        for ts in timeseries:
-            auth_mgr.authorize("read_ts_data", ts)
+        auth_mgr.authorize_many("read_ts_data", timeseries)
 
         params = {
             "timeseries_ids": [ts.id for ts in timeseries],
@@ -163,7 +207,7 @@ class TimeseriesDataIO:
             "  AND timeseries_id = ANY(:timeseries_ids) "
             "GROUP BY timeseries.id "
         )
-        data = db.session.execute(sqla.text(query), params)
+        data = db.session.execute(sqla.text(query).columns(), params)
 
         data_df = (
             pd.DataFrame(
@@ -244,9 +288,142 @@ class TimeseriesDataIO:
             convert_to,
         )
 
+    @staticmethod
+    def _insert_timeseries_data(tsbds_ids, timestamps, values):
+        """Insert timeseries data using INSERT
+
+        :param ndarray tsbds_ids: Timeseries x data state IDs
+        :param ndarray timestamps: Timestamps as UTC microseconds since epoch
+        :param ndarray values: Values
+
+        Arrays are flat and of same length. Data is sent as three arrays
+        unnested in the query, rather than as one parameter set per row.
+        Timestamps are converted in the database. Conflicting rows are ignored.
+        """
+        db.session.execute(
+            sqla.text(
+                "INSERT INTO ts_data (ts_by_data_state_id, timestamp, value) "
+                "SELECT tsbds_id, "
+                "  TIMESTAMPTZ 'epoch' + timestamp_us * INTERVAL '1 microsecond', "
+                "  value "
+                "FROM unnest("
+                "  CAST(:tsbds_ids AS integer[]),"
+                "  CAST(:timestamps AS bigint[]),"
+                "  CAST(:values AS float8[])"
+                ") AS data(tsbds_id, timestamp_us, value) "
+                "ON CONFLICT DO NOTHING"
+            ),
+            {
+                "tsbds_ids": tsbds_ids.tolist(),
+                "timestamps": timestamps.tolist(),
+                "values": values.tolist(),
+            },
+        )
+
+    @staticmethod
+    def _encode_copy_binary_rows(tsbds_ids, timestamps, values):
+        """Encode timeseries data rows in PostgreSQL binary COPY format
+
+        :param ndarray tsbds_ids: Timeseries x data state IDs
+        :param ndarray timestamps: Timestamps as UTC microseconds since epoch
+        :param ndarray values: Values
+
+        Returns rows as bytes, without COPY header and trailer.
+        """
+        rows = np.empty(len(values), dtype=COPY_BINARY_ROW_DTYPE)
+        rows["nb_fields"] = 3
+        rows["tsbds_id_len"] = 4
+        rows["tsbds_id"] = tsbds_ids
+        rows["timestamp_len"] = 8
+        rows["timestamp"] = timestamps - POSTGRES_EPOCH_US
+        rows["value_len"] = 8
+        rows["value"] = values
+        return rows.tobytes()
+
+    @classmethod
+    def _copy_timeseries_data(cls, tsbds_ids, timestamps, values):
+        """Insert timeseries data using COPY
+
+        :param ndarray tsbds_ids: Timeseries x data state IDs
+        :param ndarray timestamps: Timestamps as UTC microseconds since epoch
+        :param ndarray values: Values
+
+        Arrays are flat and of same length. Data is encoded in binary COPY
+        format by chunks of COPY_CHUNK_SIZE rows and streamed into a temporary
+        staging table, then merged into timeseries data table in a single
+        statement. Conflicting rows are ignored, just like in the INSERT path.
+        """
+        # Use session connection so that COPY runs in current transaction
+        cursor = db.session.connection().connection.cursor()
+        cursor.execute(
+            "CREATE TEMPORARY TABLE ts_data_staging "
+            "(ts_by_data_state_id integer, timestamp timestamptz, value float8) "
+            "ON COMMIT DROP"
+        )
+        with cursor.copy(
+            "COPY ts_data_staging (ts_by_data_state_id, timestamp, value) "
+            "FROM STDIN (FORMAT BINARY)"
+        ) as copy:
+            # Writing raw data requires sending header and trailer
+            copy.write(COPY_BINARY_HEADER)
+            for idx in range(0, len(values), COPY_CHUNK_SIZE):
+                chunk = slice(idx, idx + COPY_CHUNK_SIZE)
+                copy.write(
+                    cls._encode_copy_binary_rows(
+                        tsbds_ids[chunk], timestamps[chunk], values[chunk]
+                    )
+                )
+            copy.write(COPY_BINARY_TRAILER)
+        cursor.execute(
+            "INSERT INTO ts_data (ts_by_data_state_id, timestamp, value) "
+            "SELECT ts_by_data_state_id, timestamp, value FROM ts_data_staging "
+            "ON CONFLICT DO NOTHING"
+        )
+        # Drop staging table to allow several calls in the same transaction
+        cursor.execute("DROP TABLE ts_data_staging")
+
+    @staticmethod
+    def _log_dirty_intervals(tsbds_ids, index, mask):
+        """Log time intervals of written data for rollups refresh
+
+        :param list tsbds_ids: Timeseries x data state IDs, one per column
+        :param DatetimeIndex index: Data index
+        :param ndarray mask: Non-missing values mask, one row per column
+        """
+        intervals = [
+            (tsbds_id, (col_index := index[col_mask]).min(), col_index.max())
+            for tsbds_id, col_mask in zip(tsbds_ids, mask, strict=True)
+            if col_mask.any()
+        ]
+        TimeseriesDataDirtyInterval.log(
+            (i[0] for i in intervals),
+            (i[1] for i in intervals),
+            # End time is exclusive
+            (i[2] + dt.timedelta(microseconds=1) for i in intervals),
+        )
+
+    @staticmethod
+    def _rewind_cleanup_watermarks(tsbds_ids, index, mask):
+        """Ensure late data is processed by next cleanup
+
+        :param list tsbds_ids: Timeseries x data state IDs, one per column
+        :param DatetimeIndex index: Data index
+        :param ndarray mask: Non-missing values mask, one row per column
+        """
+        # Index may be unsorted: get min of each row, ignoring missing values
+        timestamps = pd.DatetimeIndex(index).as_unit("us").asi8
+        first_timestamps = np.where(mask, timestamps, np.iinfo(np.int64).max).min(
+            axis=1
+        )
+        cols_mask = mask.any(axis=1)
+        TimeseriesByDataState.rewind_cleanup_watermarks(
+            np.asarray(tsbds_ids)[cols_mask].tolist(),
+            pd.to_datetime(first_timestamps[cols_mask], unit="us", utc=True),
+        )
+
     @classmethod
     def set_timeseries_data(
-        cls, data_df, data_state, campaign=None, *, convert_from=None
+        cls, data_df, data_state, campaign=None, *, convert_from=None, use_copy=None
     ):
         """Insert timeseries data
 
@@ -255,6 +432,9 @@ class TimeseriesDataIO:
         :param Campaign campaign: Campaign
         :param dict convert_from: Mapping of timeseries ID/name -> unit to convert
             timeseries data from
+        :param bool use_copy: Insert data using COPY through a staging table.
+            This is faster for large datasets. Default: None, which means use
+            TIMESERIES_DATA_IO_USE_COPY setting.
         """
         # Copy so that modifications here don't affect input dataframe
         # Only a shallow copy is needed
@@ -275,8 +455,7 @@ class TimeseriesDataIO:
             timeseries = Timeseries.get_many_by_name(campaign, timeseries)
 
         # Check permissions
-        for ts in timeseries:
-            auth_mgr.authorize("write_ts_data", ts)
+        auth_mgr.authorize_many("write_ts_data", timeseries)
 
         if convert_from:
             cls._convert_from(
@@ -284,30 +463,35 @@ class TimeseriesDataIO:
             )
 
         # Get timeseries x data states ids
-        tsbds_ids = [
-            ts.get_timeseries_by_data_state(data_state).id for ts in timeseries
-        ]
-
-        data_df.columns = tsbds_ids
-
-        data_df = data_df.melt(
-            value_vars=data_df.columns,
-            var_name="timeseries_by_data_state_id",
-            ignore_index=False,
+        tsbds_ids = Timeseries.get_many_timeseries_by_data_state_ids(
+            timeseries, data_state
         )
-        data_rows = [
-            row
-            for row in data_df.reset_index().to_dict(orient="records")
-            if pd.notna(row["value"])
-        ]
+
+        # Flatten data column by column and drop missing values
+        values = data_df.to_numpy(dtype=float).T
+        mask = ~np.isnan(values)
         # Ensure values array is not empty (otherwise the query crashes)
-        if not data_rows:
+        if not mask.any():
             return
-
-        db.session.execute(
-            sqla.dialects.postgresql.insert(TimeseriesData).on_conflict_do_nothing(),
-            data_rows,
-        )
+        if cls._use_rollups:
+            cls._log_dirty_intervals(tsbds_ids, data_df.index, mask)
+        # Cleanup only processes raw data
+        if data_state.name == "Raw":
+            cls._rewind_cleanup_watermarks(tsbds_ids, data_df.index, mask)
+        values = values[mask]
+        mask = mask.ravel()
+        tsbds_ids = np.repeat(tsbds_ids, len(data_df.index))[mask]
+        # Timestamps as UTC microseconds since epoch, no Python object per value
+        timestamps = np.tile(
+            pd.DatetimeIndex(data_df.index).as_unit("us").asi8, len(data_df.columns)
+        )[mask]
+
+        if use_copy is None:
+            use_copy = cls._use_copy
+        if use_copy:
+            cls._copy_timeseries_data(tsbds_ids, timestamps, values)
+        else:
+            cls._insert_timeseries_data(tsbds_ids, timestamps, values)
 
     @staticmethod
     def _fill_missing_and_reorder_columns(data_df, ts_l, col_label, fill_value=np.nan):
@@ -324,40 +508,12 @@ class TimeseriesDataIO:
         # Ensure order
         return data_df[timeseries_labels]
 
-    @classmethod
-    def get_timeseries_data(
-        cls,
-        start_dt,
-        end_dt,
-        timeseries,
-        data_state,
-        *,
-        convert_to=None,
-        timezone="UTC",
-        inclusive="left",
-        col_label="id",
-    ):
-        """Export timeseries data
-
-        :param datetime start_dt: Time interval lower bound (tz-aware)
-        :param datetime end_dt: Time interval exclusive upper bound (tz-aware)
-        :param list timeseries: List of timeseries
-        :param TimeseriesDataState data_state: Timeseries data state
-        :param dict convert_to: Mapping of timeseries ID/name -> unit to convert
-            timeseries data to
-        :param str timezone: IANA timezone
-        :param str inclusive: Whether to set each bound as closed or open.
-            Must be "both", "neither", "left" or "right". Default: "left".
-        :param string col_label: Timeseries attribute to use for column header.
-            Should be "id" or "name". Default: "id".
+    @staticmethod
+    def _get_timeseries_data_stmt(start_dt, end_dt, timeseries, data_state, inclusive):
+        """Build timeseries data query
 
-        Returns a dataframe.
+        See ``get_timeseries_data``.
         """
-        # Check permissions
-        for ts in timeseries:
-            auth_mgr.authorize("read_ts_data", ts)
-
-        # Get timeseries data
         stmt = (
             sqla.select(
                 TimeseriesData.timestamp,
@@ -382,10 +538,18 @@ class TimeseriesDataIO:
                 stmt = stmt.filter(TimeseriesData.timestamp <= end_dt)
             else:
                 stmt = stmt.filter(TimeseriesData.timestamp < end_dt)
-        data = db.session.execute(stmt).all()
+        return stmt
+
+    @classmethod
+    def _rows_to_df(cls, rows, timeseries, *, convert_to, timezone, col_label):
+        """Build timeseries data dataframe from query result rows
+
+        :param list rows: List of (timestamp, id, name, value) rows
 
+        See ``get_timeseries_data``.
+        """
         data_df = pd.DataFrame(
-            data, columns=("timestamp", "id", "name", "value")
+            rows, columns=("timestamp", "id", "name", "value")
         ).set_index("timestamp")
         data_df["value"] = data_df["value"].astype(float)
         data_df.index = (
@@ -403,6 +567,351 @@ class TimeseriesDataIO:
 
         return data_df
 
+    @classmethod
+    def get_timeseries_data(
+        cls,
+        start_dt,
+        end_dt,
+        timeseries,
+        data_state,
+        *,
+        convert_to=None,
+        timezone="UTC",
+        inclusive="left",
+        col_label="id",
+    ):
+        """Export timeseries data
+
+        :param datetime start_dt: Time interval lower bound (tz-aware)
+        :param datetime end_dt: Time interval exclusive upper bound (tz-aware)
+        :param list timeseries: List of timeseries
+        :param TimeseriesDataState data_state: Timeseries data state
+        :param dict convert_to: Mapping of timeseries ID/name -> unit to convert
+            timeseries data to
+        :param str timezone: IANA timezone
+        :param str inclusive: Whether to set each bound as closed or open.
+            Must be "both", "neither", "left" or "right". Default: "left".
+        :param string col_label: Timeseries attribute to use for column header.
+            Should be "id" or "name". Default: "id".
+
+        Returns a dataframe.
+        """
+        # Check permissions
+        auth_mgr.authorize_many("read_ts_data", timeseries)
+
+        # Get timeseries data
+        stmt = cls._get_timeseries_data_stmt(
+            start_dt, end_dt, timeseries, data_state, inclusive
+        )
+        data = db.session.execute(stmt).all()
+
+        return cls._rows_to_df(
+            data,
+            timeseries,
+            convert_to=convert_to,
+            timezone=timezone,
+            col_label=col_label,
+        )
+
+    @classmethod
+    def iter_timeseries_data(
+        cls,
+        start_dt,
+        end_dt,
+        timeseries,
+        data_state,
+        *,
+        convert_to=None,
+        timezone="UTC",
+        inclusive="left",
+        col_label="id",
+        chunk_size=EXPORT_CHUNK_SIZE,
+    ):
+        """Export timeseries data as an iterator of time-ordered dataframes
+
+        :param int chunk_size: Approximate number of values per chunk
+
+        See ``get_timeseries_data`` for other parameters.
+
+        Data is fetched using a server-side cursor so that memory usage is
+        bounded by the chunk size rather than by the time range. All values for
+        a given timestamp belong to the same chunk. At least one dataframe is
+        returned, even if there is no data.
+
+        Permissions are checked when this method is called, not when the
+        iterator is consumed.
+        """
+        # Check permissions
+        auth_mgr.authorize_many("read_ts_data", timeseries)
+
+        stmt = cls._get_timeseries_data_stmt(
+            start_dt, end_dt, timeseries, data_state, inclusive
+        ).order_by(TimeseriesData.timestamp)
+
+        return cls._iter_timeseries_data(
+            stmt,
+            timeseries,
+            chunk_size=chunk_size,
+            convert_to=convert_to,
+            timezone=timezone,
+            col_label=col_label,
+        )
+
+    @classmethod
+    def _iter_timeseries_data(
+        cls, stmt, timeseries, *, chunk_size, convert_to, timezone, col_label
+    ):
+        result = db.session.execute(stmt, execution_options={"yield_per": chunk_size})
+        carry = []
+        empty = True
+        for partition in result.partitions():
+            rows = carry + partition
+            # Defer rows of last timestamp to next chunk as there may be more
+            last_timestamp = rows[-1][0]
+            split = len(rows)
+            while split and rows[split - 1][0] == last_timestamp:
+                split -= 1
+            carry = rows[split:]
+            if split:
+                empty = False
+                yield cls._rows_to_df(
+                    rows[:split],
+                    timeseries,
+                    convert_to=convert_to,
+                    timezone=timezone,
+                    col_label=col_label,
+                )
+        if carry or empty:
+            yield cls._rows_to_df(
+                carry,
+                timeseries,
+                convert_to=convert_to,
+                timezone=timezone,
+                col_label=col_label,
+            )
+
+    @staticmethod
+    def _query_buckets_data(
+        timeseries,
+        data_state,
+        start_dt,
+        end_dt,
+        bucket_width_value,
+        bucket_width_unit,
+        aggregation,
+        timezone,
+    ):
+        """Query bucketed data from raw data
+
+        Returns (bucket, timeseries ID, timeseries name, value) rows.
+
+        See ``get_timeseries_buckets_data``.
+        """
+        # Fixed size buckets are binned in absolute time from the floored start.
+        # Variable size buckets are truncated in the target timezone.
+        params = {
+            "timezone": timezone,
+            "timeseries_ids": [ts.id for ts in timeseries],
+            "data_state_id": data_state.id,
+            "start_dt": start_dt,
+            "end_dt": end_dt,
+            "bucket_width_unit": bucket_width_unit,
+            "bucket_width": f"{bucket_width_value} {bucket_width_unit}",
+        }
+        if bucket_width_unit in FIXED_SIZE_PERIODS:
+            bucket_expr = (
+                "date_bin(CAST(:bucket_width AS interval), timestamp, :start_dt)"
+            )
+            buckets_expr = (
+                "generate_series("
+                "  CAST(:start_dt AS timestamptz),"
+                "  CAST(:end_dt AS timestamptz) - CAST(:bucket_width AS interval),"
+                "  CAST(:bucket_width AS interval)"
+                ")"
+            )
+        else:
+            bucket_expr = "date_trunc(:bucket_width_unit, timestamp, :timezone)"
+            # Series of local times converted back to timestamptz
+            buckets_expr = (
+                "generate_series("
+                "  CAST(:start_dt_local AS timestamp),"
+                "  CAST(:end_dt_local AS timestamp) - CAST(:bucket_width AS interval),"
+                "  CAST(:bucket_width AS interval)"
+                ") AT TIME ZONE :timezone"
+            )
+            params["start_dt_local"] = start_dt.replace(tzinfo=None)
+            params["end_dt_local"] = end_dt.replace(tzinfo=None)
+        query = (
+            "WITH buckets AS ("
+            f"  SELECT {buckets_expr} AS bucket"
+            "), data AS ("
+            f"  SELECT {bucket_expr} AS bucket,"
+            f"    ts_by_data_states.timeseries_id, {aggregation}(value) AS value "
+            "  FROM ts_data, ts_by_data_states "
+            "  WHERE ts_data.ts_by_data_state_id = ts_by_data_states.id "
+            "    AND ts_by_data_states.data_state_id = :data_state_id "
+            "    AND ts_by_data_states.timeseries_id = ANY(:timeseries_ids) "
+            "    AND timestamp >= :start_dt AND timestamp < :end_dt "
+            "  GROUP BY 1, 2"
+            ") "
+            "SELECT buckets.bucket, timeseries.id, timeseries.name, data.value "
+            "FROM buckets CROSS JOIN timeseries "
+            "LEFT JOIN data "
+            "  ON data.bucket = buckets.bucket "
+            "  AND data.timeseries_id = timeseries.id "
+            "WHERE timeseries.id = ANY(:timeseries_ids) "
+            "ORDER BY buckets.bucket;"
+        )
+        return db.session.execute(sqla.text(query).columns(), params)
+
+    @staticmethod
+    def _query_buckets_data_from_rollups(
+        timeseries, data_state, complete_idx, end_dt, aggregation
+    ):
+        """Query bucketed data from rollups
+
+        Whole rollup periods inside each bucket are read from rollups. Remaining
+        parts at bucket edges, if any, are read from raw data.
+
+        Rollups are not refreshed here, this is left to RefreshRollups task.
+        Rollup periods intersecting dirty intervals (data modified since last
+        refresh) are read from raw data as well.
+
+        Returns (bucket, timeseries ID, timeseries name, value) rows.
+
+        See ``get_timeseries_buckets_data``.
+        """
+        tsbds_ids = db.session.scalars(
+            sqla.select(TimeseriesByDataState.id)
+            .filter(TimeseriesByDataState.data_state_id == data_state.id)
+            .filter(TimeseriesByDataState.timeseries_id.in_(ts.id for ts in timeseries))
+        ).all()
+
+        # Bucket bounds as UTC microseconds
+        starts = complete_idx.as_unit("us").asi8
+        ends = np.append(starts[1:], pd.DatetimeIndex([end_dt]).as_unit("us").asi8)
+        bounds = np.append(starts, ends[-1:])
+
+        # Use coarsest rollups aligned on all bucket bounds, if any
+        for period in reversed(ROLLUP_PERIODS):
+            period_us = pd.Timedelta(1, period).value // 1000
+            if not (bounds % period_us).any():
+                break
+        inner_starts = -(-starts // period_us) * period_us
+        inner_ends = ends // period_us * period_us
+        has_inner = inner_starts < inner_ends
+        # Leading edge is whole bucket if there is no inner part
+        lead_ends = np.where(has_inner, inner_starts, ends)
+        trail_starts = np.where(has_inner, inner_ends, ends)
+        has_lead = starts < lead_ends
+        has_trail = trail_starts < ends
+
+        def to_dts(values):
+            return pd.to_datetime(values, unit="us", utc=True).to_pydatetime().tolist()
+
+        params = {
+            "timeseries_ids": [ts.id for ts in timeseries],
+            "tsbds_ids": tsbds_ids,
+            "period": period,
+            "period_interval": f"1 {period}",
+            "buckets": to_dts(starts),
+            "raw_buckets": to_dts(
+                np.concatenate((starts[has_lead], starts[has_trail]))
+            ),
+            "raw_starts": to_dts(
+                np.concatenate((starts[has_lead], trail_starts[has_trail]))
+            ),
+            "raw_ends": to_dts(np.concatenate((lead_ends[has_lead], ends[has_trail]))),
+            "rollup_buckets": to_dts(starts[has_inner]),
+            "rollup_starts": to_dts(inner_starts[has_inner]),
+            "rollup_ends": to_dts(inner_ends[has_inner]),
+        }
+        query = (
+            "WITH tsbds AS ("
+            "  SELECT id, timeseries_id FROM ts_by_data_states"
+            "  WHERE id = ANY(:tsbds_ids)"
+            "), raw_ranges AS ("
+            "  SELECT * FROM unnest("
+            "    CAST(:raw_buckets AS timestamptz[]),"
+            "    CAST(:raw_starts AS timestamptz[]),"
+            "    CAST(:raw_ends AS timestamptz[])"
+            "  ) AS r(bucket, start_time, end_time)"
+            "), rollup_ranges AS ("
+            "  SELECT * FROM unnest("
+            "    CAST(:rollup_buckets AS timestamptz[]),"
+            "    CAST(:rollup_starts AS timestamptz[]),"
+            "    CAST(:rollup_ends AS timestamptz[])"
+            "  ) AS r(bucket, start_time, end_time)"
+            # Rollup periods modified since last refresh
+            "), dirty_slots AS ("
+            "  SELECT DISTINCT rollup_ranges.bucket, tsbds.id AS tsbds_id,"
+            "    tsbds.timeseries_id, slot"
+            "  FROM rollup_ranges CROSS JOIN tsbds"
+            "  JOIN ts_data_dirty_intervals AS dirty"
+            "    ON dirty.ts_by_data_state_id = tsbds.id"
+            "    AND dirty.start_time < rollup_ranges.end_time"
+            "    AND dirty.end_time > rollup_ranges.start_time"
+            "  CROSS JOIN LATERAL generate_series("
+            "    greatest("
+            "      date_trunc(CAST(:period AS text), dirty.start_time, 'UTC'),"
+            "      rollup_ranges.start_time"
+            "    ),"
+            "    least(dirty.end_time, rollup_ranges.end_time)"
+            "      - interval '1 microsecond',"
+            "    CAST(:period_interval AS interval)"
+            "  ) AS slot"
+            "), parts AS ("
+            "  SELECT raw_ranges.bucket, tsbds.timeseries_id,"
+            "    count(value) AS count, sum(value) AS sum,"
+            "    min(value) AS min, max(value) AS max"
+            "  FROM raw_ranges CROSS JOIN tsbds"
+            "  JOIN ts_data"
+            "    ON ts_data.ts_by_data_state_id = tsbds.id"
+            "    AND ts_data.timestamp >= raw_ranges.start_time"
+            "    AND ts_data.timestamp < raw_ranges.end_time"
+            "  GROUP BY 1, 2"
+            "  UNION ALL"
+            "  SELECT rollup_ranges.bucket, tsbds.timeseries_id,"
+            "    sum(rollups.count), sum(rollups.sum),"
+            "    min(rollups.min), max(rollups.max)"
+            "  FROM rollup_ranges CROSS JOIN tsbds"
+            "  JOIN ts_data_rollups AS rollups"
+            "    ON rollups.ts_by_data_state_id = tsbds.id"
+            "    AND rollups.period = CAST(:period AS periodenum)"
+            "    AND rollups.bucket >= rollup_ranges.start_time"
+            "    AND rollups.bucket < rollup_ranges.end_time"
+            "  WHERE NOT EXISTS ("
+            "    SELECT 1 FROM dirty_slots"
+            "    WHERE dirty_slots.tsbds_id = tsbds.id"
+            "      AND dirty_slots.slot = rollups.bucket"
+            "  )"
+            "  GROUP BY 1, 2"
+            "  UNION ALL"
+            "  SELECT dirty_slots.bucket, dirty_slots.timeseries_id,"
+            "    count(value), sum(value), min(value), max(value)"
+            "  FROM dirty_slots JOIN ts_data"
+            "    ON ts_data.ts_by_data_state_id = dirty_slots.tsbds_id"
+            "    AND ts_data.timestamp >= dirty_slots.slot"
+            "    AND ts_data.timestamp"
+            "      < dirty_slots.slot + CAST(:period_interval AS interval)"
+            "  GROUP BY 1, 2"
+            "), data AS ("
+            "  SELECT bucket, timeseries_id,"
+            f"    {ROLLUP_RE_AGGREG_FUNC_MAPPING[aggregation]} AS value"
+            "  FROM parts GROUP BY 1, 2"
+            "), buckets AS ("
+            "  SELECT unnest(CAST(:buckets AS timestamptz[])) AS bucket"
+            ") "
+            "SELECT buckets.bucket, timeseries.id, timeseries.name, data.value "
+            "FROM buckets CROSS JOIN timeseries "
+            "LEFT JOIN data "
+            "  ON data.bucket = buckets.bucket "
+            "  AND data.timeseries_id = timeseries.id "
+            "WHERE timeseries.id = ANY(:timeseries_ids) "
+            "ORDER BY buckets.bucket;"
+        )
+        return db.session.execute(sqla.text(query).columns(), params)
+
     @classmethod
     def get_timeseries_buckets_data(
         cls,
@@ -456,8 +965,7 @@ class TimeseriesDataIO:
             raise TimeseriesDataIOInvalidAggregationError("Invalid aggregation method")
 
         # Check permissions
-        for ts in timeseries:
-            auth_mgr.authorize("read_ts_data", ts)
+        auth_mgr.authorize_many("read_ts_data", timeseries)
 
         fill_value = 0 if aggregation == "count" else np.nan
         dtype = int if aggregation == "count" else float
@@ -488,30 +996,24 @@ class TimeseriesDataIO:
             ret_df.columns.name = col_label
             return ret_df
 
-        # At this stage, date_trunc can only aggregate by 1 x unit.
-        # For a N x width bucket size, the remaining aggregation is
-        # done in Pandas below.
-        params = {
-            "timezone": timezone,
-            "timeseries_ids": [ts.id for ts in timeseries],
-            "data_state_id": data_state.id,
-            "start_dt": start_dt,
-            "end_dt": end_dt,
-            "bucket_width_unit": bucket_width_unit,
-        }
-        query = (
-            "SELECT date_trunc(:bucket_width_unit, timestamp, :timezone) AS bucket,"
-            f"  timeseries.id, timeseries.name, {aggregation}(value) "
-            "FROM ts_data, timeseries, ts_by_data_states "
-            "WHERE ts_data.ts_by_data_state_id = ts_by_data_states.id "
-            "  AND ts_by_data_states.data_state_id = :data_state_id "
-            "  AND ts_by_data_states.timeseries_id = timeseries.id "
-            "  AND timeseries_id = ANY(:timeseries_ids) "
-            "  AND timestamp >= :start_dt AND timestamp < :end_dt "
-            "GROUP BY bucket, timeseries.id "
-            "ORDER BY bucket;"
-        )
-        data = db.session.execute(sqla.text(query), params)
+        # Bucketing and gap filling are done in the database so that each bucket
+        # is aggregated from raw values (or rollups) and one row per bucket and
+        # timeseries is returned.
+        if cls._use_rollups and bucket_width_unit not in ("second", "minute"):
+            data = cls._query_buckets_data_from_rollups(
+                timeseries, data_state, complete_idx, end_dt, aggregation
+            )
+        else:
+            data = cls._query_buckets_data(
+                timeseries,
+                data_state,
+                start_dt,
+                end_dt,
+                bucket_width_value,
+                bucket_width_unit,
+                aggregation,
+                timezone,
+            )
 
         data_df = pd.DataFrame(
             data, columns=("timestamp", "id", "name", "value")
@@ -520,17 +1022,12 @@ class TimeseriesDataIO:
         data_df.index = (
             pd.DatetimeIndex(data_df.index, tz="UTC").as_unit("us").tz_convert(tz_info)
         )
+        data_df.index.name = "timestamp"
 
         # Pivot table to get timeseries in columns
         data_df = data_df.pivot(values="value", columns=col_label).fillna(fill_value)
 
-        # Variable size intervals are aggregated to 1 x unit due to date_trunc
-        # Further aggregation is achieved here in pandas
-        if bucket_width_value != 1:
-            func = PANDAS_RE_AGGREG_FUNC_MAPPING[aggregation]
-            data_df = data_df.resample(pd_freq, closed="left", label="left").agg(func)
-
-        # Fill gaps: reindex with complete index
+        # Ensure complete index, even if there are no buckets
         data_df = data_df.reindex(complete_idx, fill_value=fill_value)
 
         # Fill missing columns
@@ -579,8 +1076,7 @@ class TimeseriesDataIO:
 
         Returns a dataframe.
         """
-        for ts in timeseries:
-            auth_mgr.authorize("read_ts_data", ts)
+        auth_mgr.authorize_many("read_ts_data", timeseries)
 
         if agg == "avg":
             agg_func = sqla.func.avg(TimeseriesData.value)
@@ -638,8 +1134,7 @@ class TimeseriesDataIO:
         :param TimeseriesDataState data_state: Timeseries data state
         """
         # Check permissions
-        for ts in timeseries:
-            auth_mgr.authorize("write_ts_data", ts)
+        auth_mgr.authorize_many("write_ts_data", timeseries)
 
         # Delete timeseries data
         (
@@ -655,9 +1150,43 @@ class TimeseriesDataIO:
             .delete(synchronize_session=False)
         )
 
+        if cls._use_rollups:
+            tsbds_ids = db.session.scalars(
+                sqla.select(TimeseriesByDataState.id)
+                .filter(TimeseriesByDataState.data_state_id == data_state.id)
+                .filter(
+                    TimeseriesByDataState.timeseries_id.in_(ts.id for ts in timeseries)
+                )
+            ).all()
+            TimeseriesDataDirtyInterval.log(
+                tsbds_ids, [start_dt] * len(tsbds_ids), [end_dt] * len(tsbds_ids)
+            )
+
 
 def to_utc_index(index):
-    """Create UTC datetime index from timezone aware datetime list"""
+    """Create UTC datetime index from timezone aware datetime list
+
+    Timestamps sharing a common UTC offset are parsed in a single vectorized
+    call. Mixed offsets (e.g. local time across a DST change) fall back to
+    parsing each timestamp individually.
+    """
+    try:
+        index = pd.to_datetime(index, format="ISO8601")
+    except (ValueError, pd.errors.OutOfBoundsDatetime):
+        # Mixed offsets, mixed naive/aware or invalid timestamps
+        return _to_utc_index_mixed(index)
+    if not len(index):
+        return pd.DatetimeIndex([], tz=dt.UTC, name="timestamp").as_unit("us")
+    if index.tz is None:
+        raise TimeseriesDataIODatetimeError("Invalid or TZ-naive timestamp")
+    return pd.DatetimeIndex(index.tz_convert(dt.UTC), name="timestamp").as_unit("us")
+
+
+def _to_utc_index_mixed(index):
+    """Create UTC datetime index from timezone aware datetime list
+
+    Slow path of ``to_utc_index`` handling timestamps one by one
+    """
     # https://github.com/pandas-dev/pandas/issues/54995
 
     try:
@@ -759,6 +1288,45 @@ class TimeseriesDataCSVIO(TimeseriesDataIO, BaseCSVIO):
         # https://github.com/pandas-dev/pandas/issues/27328
         return data_df.to_csv(date_format="%Y-%m-%dT%H:%M:%S%z")
 
+    @classmethod
+    def iter_export_csv(
+        cls,
+        start_dt,
+        end_dt,
+        timeseries,
+        data_state,
+        *,
+        convert_to=None,
+        timezone="UTC",
+        col_label="id",
+        chunk_size=EXPORT_CHUNK_SIZE,
+    ):
+        """Export timeseries data as an iterator of CSV string fragments
+
+        Concatenated fragments are identical to ``export_csv`` output.
+
+        See ``TimeseriesDataIO.iter_timeseries_data``.
+        """
+        chunks = cls.iter_timeseries_data(
+            start_dt,
+            end_dt,
+            timeseries,
+            data_state,
+            convert_to=convert_to,
+            timezone=timezone,
+            col_label=col_label,
+            chunk_size=chunk_size,
+        )
+        return cls._iter_export_csv(chunks)
+
+    @staticmethod
+    def _iter_export_csv(chunks):
+        header = True
+        for data_df in chunks:
+            data_df.index.name = "Datetime"
+            yield data_df.to_csv(header=header, date_format="%Y-%m-%dT%H:%M:%S%z")
+            header = False
+
     @classmethod
     def export_csv_bucket(
         cls,
@@ -886,6 +1454,83 @@ class TimeseriesDataJSONIO(TimeseriesDataIO, BaseJSONIO):
         )
         return cls._df_to_json(data_df, dropna=True)
 
+    @classmethod
+    def iter_export_json(
+        cls,
+        start_dt,
+        end_dt,
+        timeseries,
+        data_state,
+        *,
+        convert_to=None,
+        timezone="UTC",
+        col_label="id",
+        chunk_size=EXPORT_CHUNK_SIZE,
+    ):
+        """Export timeseries data as an iterator of JSON string fragments
+
+        Concatenated fragments are identical to ``export_json`` output.
+
+        JSON output is grouped by timeseries, so data is streamed one timeseries
+        at a time.
+
+        See ``TimeseriesDataIO.iter_timeseries_data``.
+        """
+        # Check permissions
+        auth_mgr.authorize_many("read_ts_data", timeseries)
+
+        # Build queries now as the iterator may be consumed out of user context
+        stmts = [
+            (
+                ts,
+                cls._get_timeseries_data_stmt(
+                    start_dt, end_dt, [ts], data_state, "left"
+                ).order_by(TimeseriesData.timestamp),
+            )
+            for ts in timeseries
+        ]
+
+        return cls._iter_export_json(
+            stmts,
+            convert_to=convert_to,
+            timezone=timezone,
+            col_label=col_label,
+            chunk_size=chunk_size,
+        )
+
+    @classmethod
+    def _iter_export_json(cls, stmts, *, convert_to, timezone, col_label, chunk_size):
+        yield "{"
+        sep = ""
+        for ts, stmt in stmts:
+            label = getattr(ts, col_label)
+            chunks = cls._iter_timeseries_data(
+                stmt,
+                [ts],
+                chunk_size=chunk_size,
+                convert_to=convert_to,
+                timezone=timezone,
+                col_label=col_label,
+            )
+            # Only open timeseries object when there is data, like export_json
+            item_sep = None
+            for data_df in chunks:
+                val = data_df[label].dropna()
+                if val.empty:
+                    continue
+                if item_sep is None:
+                    yield f"{sep}{json.dumps(str(label))}: {{"
+                    item_sep = ""
+                    sep = ", "
+                items = dict(
+                    zip((x.isoformat() for x in val.index), val.tolist(), strict=True)
+                )
+                yield item_sep + json.dumps(items)[1:-1]
+                item_sep = ", "
+            if item_sep is not None:
+                yield "}"
+        yield "}"
+
     @classmethod
     def export_json_bucket(
         cls,
@@ -920,6 +1565,277 @@ class TimeseriesDataJSONIO(TimeseriesDataIO, BaseJSONIO):
         return cls._df_to_json(data_df)
 
 
+class TimeseriesDataArrowIO(TimeseriesDataIO, BaseArrowIO):
+    """Timeseries data Arrow IPC (Feather v2) IO
+
+    Data is stored as a table with a "Datetime" tz-aware timestamp column and a
+    float column per timeseries, just like CSV files.
+    """
+
+    @classmethod
+    def _read_table(cls, data):
+        """Read Arrow table from bytes or binary stream"""
+        pa = cls._import_pyarrow()
+        return pa.ipc.open_file(data).read_all()
+
+    @classmethod
+    def _write_table(cls, table):
+        """Write Arrow table as bytes"""
+        pa = cls._import_pyarrow()
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+        return sink.getvalue().to_pybytes()
+
+    @classmethod
+    def _import(cls, data, data_state, campaign=None, convert_from=None):
+        """Import Arrow table from bytes or binary stream
+
+        :param bytes data: Arrow data as bytes or binary stream
+        :param TimeseriesDataState data_state: Timeseries data state
+        :param Campaign campaign: Campaign
+        :param dict convert_from: Mapping of timeseries ID/name -> unit to convert
+            timeseries data from
+
+        If campaign is None, the column names are expected to be timeseries IDs.
+        Otherwise, timeseries names are expected.
+        """
+        pa = cls._import_pyarrow()
+        if isinstance(data, bytes):
+            data = pa.py_buffer(data)
+
+        # Load table
+        try:
+            table = cls._read_table(data)
+        except (pa.ArrowInvalid, OSError) as exc:
+            raise TimeseriesDataArrowIOError("Invalid file") from exc
+        if "Datetime" not in table.column_names:
+            raise TimeseriesDataArrowIOError("Missing Datetime column")
+        if "" in table.column_names:
+            raise TimeseriesDataArrowIOError("Empty timeseries name")
+
+        # Index
+        datetime_type = table.schema.field("Datetime").type
+        if not pa.types.is_timestamp(datetime_type) or datetime_type.tz is None:
+            raise TimeseriesDataIODatetimeError("Invalid or TZ-naive timestamp")
+        data_df = table.to_pandas().set_index("Datetime")
+        data_df.index = pd.DatetimeIndex(
+            data_df.index.tz_convert(dt.UTC), name="timestamp"
+        ).as_unit("us")
+
+        # Values
+        try:
+            data_df = data_df.astype(float)
+        except (ValueError, TypeError) as exc:
+            raise TimeseriesDataArrowIOError("Invalid values") from exc
+
+        # Insert data
+        cls.set_timeseries_data(
+            data_df, data_state=data_state, campaign=campaign, convert_from=convert_from
+        )
+
+    @staticmethod
+    def _get_timeseries_data_arrays(start_dt, end_dt, timeseries, data_state):
+        """Get timeseries data as arrays using binary COPY
+
+        See ``get_timeseries_data``.
+
+        Rows are decoded from binary COPY format at once and pivoted in numpy,
+        without creating Python objects for each value.
+
+        Returns a (timestamps, values) tuple: sorted timestamps as UTC
+        microseconds since epoch and values with one row per timeseries, NaN
+        where there is no data.
+        """
+        tsbds_ids = dict(
+            db.session.execute(
+                sqla.select(
+                    TimeseriesByDataState.id, TimeseriesByDataState.timeseries_id
+                )
+                .filter(TimeseriesByDataState.data_state_id == data_state.id)
+                .filter(
+                    TimeseriesByDataState.timeseries_id.in_(ts.id for ts in timeseries)
+                )
+            ).all()
+        )
+        rows = np.empty(0, dtype=COPY_BINARY_ROW_DTYPE)
+        if tsbds_ids:
+            query = (
+                "COPY ("
+                "  SELECT ts_by_data_state_id, timestamp, coalesce(value, 'NaN') "
+                "  FROM ts_data "
+                "  WHERE ts_by_data_state_id = ANY(%(tsbds_ids)s)"
+            )
+            params = {"tsbds_ids": list(tsbds_ids)}
+            if start_dt:
+                query += " AND timestamp >= %(start_dt)s"
+                params["start_dt"] = start_dt
+            if end_dt:
+                query += " AND timestamp < %(end_dt)s"
+                params["end_dt"] = end_dt
+            query += ") TO STDOUT (FORMAT BINARY)"
+            cursor = db.session.connection().connection.cursor()
+            with cursor.copy(query, params) as copy:
+                data = b"".join(copy)
+            # Skip header (including extension area) and trailer
+            offset = len(COPY_BINARY_HEADER) + int.from_bytes(data[15:19], "big")
+            rows = np.frombuffer(
+                data,
+                dtype=COPY_BINARY_ROW_DTYPE,
+                count=(len(data) - offset - len(COPY_BINARY_TRAILER))
+                // COPY_BINARY_ROW_DTYPE.itemsize,
+                offset=offset,
+            )
+
+        # Pivot: timeseries x data state ID -> row, timestamp -> column
+        ts_rows = {ts.id: idx for idx, ts in enumerate(timeseries)}
+        ids = np.fromiter(tsbds_ids.keys(), dtype=np.int64, count=len(tsbds_ids))
+        id_rows = np.fromiter(
+            (ts_rows[ts_id] for ts_id in tsbds_ids.values()),
+            dtype=np.int64,
+            count=len(tsbds_ids),
+        )
+        sorter = np.argsort(ids)
+        value_rows = id_rows[
+            sorter[np.searchsorted(ids, rows["tsbds_id"], sorter=sorter)]
+        ]
+        timestamps, value_cols = np.unique(rows["timestamp"], return_inverse=True)
+        values = np.full((len(timeseries), len(timestamps)), np.nan)
+        values[value_rows, value_cols] = rows["value"]
+        return timestamps.astype(np.int64) + POSTGRES_EPOCH_US, values
+
+    @classmethod
+    def _df_to_bytes(cls, data_df):
+        """Serialize dataframe to Arrow bytes"""
+        pa = cls._import_pyarrow()
+        data_df.index.name = "Datetime"
+        data_df.columns = data_df.columns.astype(str)
+        table = pa.Table.from_pandas(data_df.reset_index(), preserve_index=False)
+        return cls._write_table(table)
+
+    @classmethod
+    def import_arrow(cls, arrow_data, data_state, campaign=None, convert_from=None):
+        """Import Arrow IPC file
+
+        See ``_import``.
+        """
+        cls._import(arrow_data, data_state, campaign, convert_from)
+
+    @classmethod
+    def export_arrow(
+        cls,
+        start_dt,
+        end_dt,
+        timeseries,
+        data_state,
+        *,
+        convert_to=None,
+        timezone="UTC",
+        col_label="id",
+    ):
+        """Export timeseries data as Arrow IPC bytes
+
+        See ``TimeseriesDataIO.get_timeseries_data``.
+
+        Arrow columns are built from arrays fetched using binary COPY, without
+        going through a dataframe.
+        """
+        pa = cls._import_pyarrow()
+
+        # Check permissions
+        auth_mgr.authorize_many("read_ts_data", timeseries)
+
+        timestamps, values = cls._get_timeseries_data_arrays(
+            start_dt, end_dt, timeseries, data_state
+        )
+        columns = {"Datetime": pa.array(timestamps, pa.timestamp("us", tz=timezone))}
+        for ts, ts_values in zip(timeseries, values, strict=True):
+            label = getattr(ts, col_label)
+            if convert_to and label in convert_to:
+                ts_values = ureg.convert(ts_values, ts.unit_symbol, convert_to[label])
+            # NaN values are exported as nulls
+            columns[str(label)] = pa.array(ts_values, from_pandas=True)
+        return cls._write_table(pa.table(columns))
+
+    @classmethod
+    def export_arrow_bucket(
+        cls,
+        start_dt,
+        end_dt,
+        timeseries,
+        data_state,
+        bucket_width_value,
+        bucket_width_unit,
+        aggregation="avg",
+        *,
+        convert_to=None,
+        timezone="UTC",
+        col_label="id",
+    ):
+        """Bucket timeseries data and export as Arrow IPC bytes
+
+        See ``TimeseriesDataIO.get_timeseries_buckets_data``.
+        """
+        data_df = cls.get_timeseries_buckets_data(
+            start_dt,
+            end_dt,
+            timeseries,
+            data_state,
+            bucket_width_value,
+            bucket_width_unit,
+            aggregation,
+            convert_to=convert_to,
+            timezone=timezone,
+            col_label=col_label,
+        )
+        return cls._df_to_bytes(data_df)
+
+
+class TimeseriesDataParquetIO(TimeseriesDataArrowIO):
+    """Timeseries data Parquet IO
+
+    See ``TimeseriesDataArrowIO``.
+    """
+
+    @classmethod
+    def _read_table(cls, data):
+        pa = cls._import_pyarrow()
+        return pa.parquet.read_table(data)
+
+    @classmethod
+    def _write_table(cls, table):
+        pa = cls._import_pyarrow()
+        sink = pa.BufferOutputStream()
+        pa.parquet.write_table(table, sink)
+        return sink.getvalue().to_pybytes()
+
+    @classmethod
+    def import_parquet(cls, parquet_data, data_state, campaign=None, convert_from=None):
+        """Import Parquet file
+
+        See ``TimeseriesDataArrowIO._import``.
+        """
+        cls._import(parquet_data, data_state, campaign, convert_from)
+
+    @classmethod
+    def export_parquet(cls, *args, **kwargs):
+        """Export timeseries data as Parquet bytes
+
+        See ``TimeseriesDataArrowIO.export_arrow``.
+        """
+        return cls.export_arrow(*args, **kwargs)
+
+    @classmethod
+    def export_parquet_bucket(cls, *args, **kwargs):
+        """Bucket timeseries data and export as Parquet bytes
+
+        See ``TimeseriesDataArrowIO.export_arrow_bucket``.
+        """
+        return cls.export_arrow_bucket(*args, **kwargs)
+
+
 tsdio = TimeseriesDataIO()
 tsdcsvio = TimeseriesDataCSVIO()
 tsdjsonio = TimeseriesDataJSONIO()
+tsdarrowio = TimeseriesDataArrowIO()
+tsdparquetio = TimeseriesDataParquetIO()
@@ -28,6 +28,7 @@ from .events import (
     TimeseriesByEvent,
 )
 from .notifications import Notification
+from .retention import RetentionPolicy
 from .sites import (
     Building,
     BuildingProperty,
@@ -59,7 +60,11 @@ from .timeseries import (
     TimeseriesProperty,
     TimeseriesPropertyData,
 )
-from .timeseries_data import TimeseriesData
+from .timeseries_data import (
+    TimeseriesData,
+    TimeseriesDataDirtyInterval,
+    TimeseriesDataRollup,
+)
 from .users import User, UserByUserGroup, UserGroup
 from .weather import (
     WeatherParameterEnum,
@@ -91,12 +96,15 @@ __all__ = [
     "SpacePropertyData",
     "ZonePropertyData",
     "TaskByCampaign",
+    "RetentionPolicy",
     "TimeseriesDataState",
     "TimeseriesProperty",
     "Timeseries",
     "TimeseriesPropertyData",
     "TimeseriesByDataState",
     "TimeseriesData",
+    "TimeseriesDataRollup",
+    "TimeseriesDataDirtyInterval",
     "TimeseriesBySite",
     "TimeseriesByBuilding",
     "TimeseriesByStorey",
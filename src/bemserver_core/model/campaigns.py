@@ -1,8 +1,14 @@
 """Campaings"""
 
+from itertools import chain
+
 import sqlalchemy as sqla
 
-from bemserver_core.authorization import AuthMgrMixin
+from bemserver_core.authorization import (
+    AuthMgrMixin,
+    clear_current_user_cache,
+    get_current_user_cache,
+)
 from bemserver_core.database import Base, db, make_columns_read_only
 
 from .users import UserByUserGroup, UserGroup
@@ -29,6 +35,9 @@ class Campaign(AuthMgrMixin, Base):
         return self.is_member(actor)
 
     def is_member(self, user):
+        member_ids = _get_member_ids(user, UserGroupByCampaign.campaign_id)
+        if member_ids is not None:
+            return self.id in member_ids
         return bool(
             db.session.query(
                 db.session.query(UserGroupByCampaign)
@@ -66,6 +75,9 @@ class CampaignScope(AuthMgrMixin, Base):
         return self.is_member(actor)
 
     def is_member(self, user):
+        member_ids = _get_member_ids(user, UserGroupByCampaignScope.campaign_scope_id)
+        if member_ids is not None:
+            return self.id in member_ids
         return bool(
             db.session.query(
                 db.session.query(UserGroupByCampaignScope)
@@ -77,6 +89,30 @@ class CampaignScope(AuthMgrMixin, Base):
             ).scalar()
         )
 
+    @classmethod
+    def is_member_of_all(cls, user, campaign_scope_ids):
+        """Check whether a user is member of all campaign scopes in a list
+
+        :param User user: User
+        :param list campaign_scope_ids: List of campaign scope IDs
+        """
+        campaign_scope_ids = set(campaign_scope_ids)
+        member_ids = _get_member_ids(user, UserGroupByCampaignScope.campaign_scope_id)
+        if member_ids is not None:
+            return campaign_scope_ids <= member_ids
+        stmt = (
+            sqla.select(
+                sqla.func.count(
+                    sqla.distinct(UserGroupByCampaignScope.campaign_scope_id)
+                )
+            )
+            .join(UserGroup)
+            .join(UserByUserGroup)
+            .filter(UserByUserGroup.user_id == user.id)
+            .filter(UserGroupByCampaignScope.campaign_scope_id.in_(campaign_scope_ids))
+        )
+        return db.session.execute(stmt).scalar() == len(campaign_scope_ids)
+
 
 class UserGroupByCampaign(AuthMgrMixin, Base):
     """UserGroup x Campaign associations"""
@@ -150,6 +186,66 @@ class UserGroupByCampaignScope(AuthMgrMixin, Base):
         ).scalar()
 
 
+def _get_member_ids(user, column):
+    """Get IDs of campaigns or campaign scopes a user is member of
+
+    :param User user: User
+    :param Column column: Campaign or campaign scope ID column of a user group
+        association table
+
+    IDs are queried once and memoized in current user cache.
+
+    Returns None if user is not current user.
+    """
+    cache = get_current_user_cache(user)
+    if cache is None:
+        return None
+    key = ("member_ids", column.key)
+    if key not in cache:
+        stmt = (
+            sqla.select(column)
+            .join(UserGroup)
+            .join(UserByUserGroup)
+            .filter(UserByUserGroup.user_id == user.id)
+        )
+        cache[key] = set(db.session.execute(stmt).scalars())
+    return cache[key]
+
+
+# Changes to these classes may affect memberships
+MEMBERSHIP_CLASSES = (
+    UserGroup,
+    UserByUserGroup,
+    Campaign,
+    UserGroupByCampaign,
+    CampaignScope,
+    UserGroupByCampaignScope,
+)
+
+
+@sqla.event.listens_for(db.session, "after_attach")
+def membership_after_attach(session, instance):
+    """Invalidate memoized memberships when an association is added to session"""
+    if isinstance(instance, MEMBERSHIP_CLASSES):
+        clear_current_user_cache()
+
+
+@sqla.event.listens_for(db.session, "after_flush")
+def membership_after_flush(session, flush_context):
+    """Invalidate memoized memberships when associations are modified"""
+    if any(
+        isinstance(instance, MEMBERSHIP_CLASSES)
+        for instance in chain(session.new, session.dirty, session.deleted)
+    ):
+        clear_current_user_cache()
+
+
+@sqla.event.listens_for(db.session, "after_soft_rollback")
+def membership_after_soft_rollback(session, previous_transaction):
+    """Invalidate memoized memberships on rollback"""
+    clear_current_user_cache()
+
+
 def init_db_campaigns_triggers():
     """Create triggers to protect some columns from update.
 
@@ -275,17 +275,32 @@ class Event(AuthMgrMixin, Base):
         return query
 
     def notify(self, timestamp):
+        """Create notifications for users concerned by the event
+
+        Notifications are inserted in a single INSERT ... SELECT statement.
+        Emails are not sent here but by NotificationEmailDigest task.
+
+        Returns the list of created notification IDs.
+        """
         from bemserver_core.model.notifications import (
             Notification,
         )
 
+        # Ensure event is flushed to get its ID
+        db.session.flush()
+
         ecbu_q = sqla.orm.aliased(
             EventCategoryByUser,
             alias=EventCategoryByUser.get(category_id=self.category_id).subquery(),
         )
 
         query = (
-            db.session.query(User)
+            sqla.select(
+                User.id,
+                sqla.literal(self.id, sqla.Integer),
+                sqla.literal(timestamp, sqla.DateTime(timezone=True)),
+            )
+            .distinct()
             .join(UserByUserGroup)
             .join(UserGroup)
             .join(UserGroupByCampaignScope)
@@ -303,8 +318,15 @@ class Event(AuthMgrMixin, Base):
 
         query = query.filter(level_filter)
 
-        for user in list(query):
-            Notification.new(user=user, event=self, timestamp=timestamp)
+        stmt = (
+            sqla.insert(Notification)
+            .from_select(
+                [Notification.user_id, Notification.event_id, Notification.timestamp],
+                query,
+            )
+            .returning(Notification.id)
+        )
+        return db.session.scalars(stmt).all()
 
 
 @sqla.event.listens_for(Event, "after_insert")
@@ -425,6 +447,28 @@ class TimeseriesByEvent(AuthMgrMixin, Base):
             .one()
         )
 
+    @classmethod
+    def get_last_category_for_many_timeseries(cls, timeseries, categories):
+        """Get category of last event among categories for a list of timeseries
+
+        :param list timeseries: List of timeseries IDs
+        :param list categories: List of event category IDs
+
+        Returns a dict of the form {ts_id: category_id}. Timeseries with no
+        event in those categories are not in the dict.
+        """
+        stmt = (
+            sqla.select(cls.timeseries_id, Event.category_id)
+            .join(Event)
+            .filter(cls.timeseries_id.in_(timeseries))
+            .filter(Event.category_id.in_(categories))
+            .distinct(cls.timeseries_id)
+            .order_by(
+                cls.timeseries_id, sqla.desc(Event.timestamp), sqla.desc(Event.id)
+            )
+        )
+        return dict(list(db.session.execute(stmt)))
+
     @classmethod
     def authorize_query(cls, actor, query):
         return Event.authorize_query(actor, query.join(Event))
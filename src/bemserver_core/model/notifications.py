@@ -1,5 +1,7 @@
 """Notification"""
 
+import smtplib
+
 import sqlalchemy as sqla
 
 from bemserver_core.authorization import AuthMgrMixin, auth_mgr
@@ -22,6 +24,7 @@ class Notification(AuthMgrMixin, Base):
     event_id = sqla.Column(sqla.ForeignKey("events.id"), nullable=False)
     timestamp = sqla.Column(sqla.DateTime(timezone=True), nullable=False)
     read = sqla.Column(sqla.Boolean, nullable=False, default=False)
+    email_sent = sqla.Column(sqla.Boolean, nullable=False, default=False)
 
     user = sqla.orm.relationship(
         "User",
@@ -131,23 +134,36 @@ def authorize_mark_notifications(actor: User, user: User) -> bool:
     return actor.id == user.id
 
 
-@sqla.event.listens_for(Notification, "after_insert")
-def notification_after_insert(_mapper, _connection, target):
-    """Callback executed on insert event
+def _make_notification_subject(notif):
+    event = notif.event
+    return (
+        f"[{event.campaign_scope.campaign.name}] "
+        f"{event.level.name}: {event.category.name}"
+    )
 
-    Email notification. Since the email is sent in a separate thread, we want to
-    ensure the notification is committed to database, so we register a callback
-    to run on the next commit event of the session.
 
-    https://stackoverflow.com/questions/25078815/
-    """
+def _make_notification_email(notif):
+    return (
+        [notif.user.email],
+        _make_notification_subject(notif),
+        notif.event.description or "",
+    )
+
 
-    @sqla.event.listens_for(db.session, "after_commit", once=True)
-    def notification_after_commit_after_insert(_session):
-        """Callback executed on commit event after an insert"""
-        # Ensure the notification has not been deleted or rolled-back since flush
-        if sqla.inspect(target).persistent:
-            send_notification_email.delay(target.id)
+def _make_notification_digest_email(notifs):
+    """Make a single email for notifications of a user"""
+    if len(notifs) == 1:
+        return _make_notification_email(notifs[0])
+    return (
+        [notifs[0].user.email],
+        f"{len(notifs)} new notifications",
+        "\n\n".join(
+            "\n".join(
+                filter(None, (_make_notification_subject(n), n.event.description))
+            )
+            for n in notifs
+        ),
+    )
 
 
 @celery.task(name="NotificationEmail", base=BEMServerCoreSystemTask)
@@ -157,15 +173,60 @@ def send_notification_email(notification_id):
     notif = Notification.get_by_id(notification_id)
     if notif is None:
         raise BEMServerCoreTaskError(f"Unknown notification ID {notification_id}")
-    event = notif.event
-    ems.send(
-        [notif.user.email],
-        (
-            f"[{event.campaign_scope.campaign.name}] "
-            f"{event.level.name}: {event.category.name}"
-        ),
-        notif.event.description or "",
-    )
+    ems.send(*_make_notification_email(notif))
+    notif.email_sent = True
+    db.session.commit()
+
+
+@celery.task(name="NotificationEmailDigest", base=BEMServerCoreSystemTask)
+def send_notification_email_digest():
+    """Send one email per user for all notifications not emailed yet
+
+    Users are processed one after another. Notifications of a user are locked
+    while they are emailed so that concurrent runs don't email them twice, then
+    flagged as sent and committed. If sending fails for a user, the error is
+    logged and the other users are processed. Notifications of that user are
+    emailed on next run.
+    """
+    logger.info("Send notification email digest")
+    user_ids = db.session.scalars(
+        sqla.select(Notification.user_id)
+        .filter(Notification.email_sent.is_(False))
+        .distinct()
+        .order_by(Notification.user_id)
+    ).all()
+    if not user_ids:
+        logger.debug("No notification to email")
+        return
+    for user_id in user_ids:
+        notifs = db.session.scalars(
+            sqla.select(Notification)
+            .filter_by(user_id=user_id)
+            .filter(Notification.email_sent.is_(False))
+            .options(
+                sqla.orm.selectinload(Notification.user),
+                sqla.orm.selectinload(Notification.event),
+            )
+            .order_by(Notification.timestamp, Notification.id)
+            .with_for_update(skip_locked=True)
+        ).all()
+        if not notifs:
+            # Processed by a concurrent run
+            db.session.rollback()
+            continue
+        try:
+            ems.send(*_make_notification_digest_email(notifs))
+        except (smtplib.SMTPException, OSError) as exc:
+            logger.error("Failed to email notifications to user %s: %s", user_id, exc)
+            db.session.rollback()
+            continue
+        db.session.execute(
+            sqla.update(Notification)
+            .where(Notification.id.in_(n.id for n in notifs))
+            .values(email_sent=True),
+            execution_options={"synchronize_session": False},
+        )
+        db.session.commit()
 
 
 def init_db_events_triggers():
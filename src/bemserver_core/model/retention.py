@@ -0,0 +1,90 @@
+"""Retention policies"""
+
+import sqlalchemy as sqla
+
+from bemserver_core.authorization import AuthMgrMixin
+from bemserver_core.database import Base
+from bemserver_core.exceptions import BEMServerCoreRetentionPolicyError
+from bemserver_core.time_utils import FIXED_SIZE_PERIODS, PeriodEnum
+
+from .campaigns import Campaign
+
+
+class RetentionPolicy(AuthMgrMixin, Base):
+    """Timeseries data retention policy for a campaign and a data state
+
+    Data of the source data state older than the retention period is deleted.
+    If a target data state is set, data is downsampled into it before deletion.
+
+    ``processed_until`` records the progress: data before this datetime has
+    already been processed.
+    """
+
+    __tablename__ = "retention_policies"
+    __table_args__ = (sqla.UniqueConstraint("campaign_id", "source_data_state_id"),)
+
+    id = sqla.Column(sqla.Integer, primary_key=True)
+    is_enabled = sqla.Column(sqla.Boolean, default=True, nullable=False)
+    campaign_id = sqla.Column(sqla.ForeignKey("campaigns.id"), nullable=False)
+    campaign = sqla.orm.relationship(
+        "Campaign",
+        backref=sqla.orm.backref("retention_policies", cascade="all, delete-orphan"),
+    )
+    source_data_state_id = sqla.Column(
+        sqla.ForeignKey("ts_data_states.id"), nullable=False
+    )
+    source_data_state = sqla.orm.relationship(
+        "TimeseriesDataState", foreign_keys=[source_data_state_id]
+    )
+    target_data_state_id = sqla.Column(sqla.ForeignKey("ts_data_states.id"))
+    target_data_state = sqla.orm.relationship(
+        "TimeseriesDataState", foreign_keys=[target_data_state_id]
+    )
+    retention_unit = sqla.Column(
+        sqla.Enum(PeriodEnum, name="periodenum"), nullable=False
+    )
+    retention_value = sqla.Column(sqla.Integer, nullable=False)
+    bucket_width_unit = sqla.Column(sqla.Enum(PeriodEnum, name="periodenum"))
+    bucket_width_value = sqla.Column(sqla.Integer)
+    aggregation = sqla.Column(sqla.String(20), default="avg", nullable=False)
+    processed_until = sqla.Column(sqla.DateTime(timezone=True))
+
+    @classmethod
+    def authorize_query(cls, actor, query):
+        return Campaign.authorize_query(actor, query.join(Campaign))
+
+    def authorize_read(self, actor):
+        campaign = Campaign.get_by_id(self.campaign_id)
+        return campaign.is_member(actor)
+
+    def _before_flush(self):
+        if self.target_data_state_id is not None and (
+            self.bucket_width_unit is None or self.bucket_width_value is None
+        ):
+            raise BEMServerCoreRetentionPolicyError(
+                "Bucket width required to downsample into target data state"
+            )
+        if self.target_data_state_id == self.source_data_state_id:
+            raise BEMServerCoreRetentionPolicyError(
+                "Target data state must differ from source data state"
+            )
+        # Avoid circular import
+        from bemserver_core.input_output.timeseries_data_io import (
+            AGGREGATION_FUNCTIONS,
+        )
+
+        if (
+            self.aggregation is not None
+            and self.aggregation not in AGGREGATION_FUNCTIONS
+        ):
+            raise BEMServerCoreRetentionPolicyError(
+                f"Aggregation must be one of {AGGREGATION_FUNCTIONS}"
+            )
+        if (
+            self.bucket_width_unit is not None
+            and self.bucket_width_unit.value not in FIXED_SIZE_PERIODS
+            and (self.bucket_width_value or 1) > 1
+        ):
+            raise BEMServerCoreRetentionPolicyError(
+                "Bucket width value must be 1 for calendar units"
+            )
@@ -5,7 +5,10 @@ import sqlalchemy as sqla
 from bemserver_core.authorization import AuthMgrMixin, auth_mgr
 from bemserver_core.common import PropertyType, ureg
 from bemserver_core.database import Base, db, make_columns_read_only
-from bemserver_core.exceptions import TimeseriesNotFoundError
+from bemserver_core.exceptions import (
+    BEMServerAuthorizationError,
+    TimeseriesNotFoundError,
+)
 from bemserver_core.model.campaigns import (
     Campaign,
     CampaignScope,
@@ -14,6 +17,11 @@ from bemserver_core.model.campaigns import (
 from bemserver_core.model.events import Event, TimeseriesByEvent
 from bemserver_core.model.sites import Building, Site, Space, Storey, Zone
 from bemserver_core.model.users import User, UserByUserGroup, UserGroup
+from bemserver_core.utils import LRUCache
+
+# Timeseries x data state associations are never updated, so they can be cached.
+# Mapping of (timeseries ID, data state ID) -> timeseries x data state ID
+TSBDS_CACHE = db.register_cache(LRUCache(maxsize=65536))
 
 
 class TimeseriesProperty(AuthMgrMixin, Base):
@@ -289,6 +297,67 @@ class Timeseries(AuthMgrMixin, Base):
             db.session.flush()
         return tsbds
 
+    @classmethod
+    def get_many_timeseries_by_data_state_ids(cls, timeseries, data_state):
+        """Return timeseries x data state association IDs for a given data state
+
+        :param list timeseries: List of timeseries
+        :param TimeseriesDataState data_state: Timeseries data state
+
+        Create the timeseries x data state associations on the fly if needed.
+
+        Associations are fetched and created in a single query and their IDs
+        are cached. This method does not check permissions.
+
+        Returns a list of IDs in the order of the timeseries list.
+        """
+        tsbds_ids = {}
+        for ts in timeseries:
+            if (tsbds_id := TSBDS_CACHE.get((ts.id, data_state.id))) is not None:
+                tsbds_ids[ts.id] = tsbds_id
+        missing_ts_ids = [ts.id for ts in timeseries if ts.id not in tsbds_ids]
+
+        if missing_ts_ids:
+            # Ensure associations pending in session are visible to the query
+            db.session.flush()
+            params = {
+                "timeseries_ids": missing_ts_ids,
+                "data_state_id": data_state.id,
+            }
+            # Rows inserted in the CTE are not visible to the select on the
+            # table, so each association is returned once
+            query = (
+                "WITH inserted AS ("
+                "  INSERT INTO ts_by_data_states (timeseries_id, data_state_id) "
+                "  SELECT unnest(CAST(:timeseries_ids AS integer[])), :data_state_id "
+                "  ON CONFLICT DO NOTHING "
+                "  RETURNING timeseries_id, id"
+                ") "
+                "SELECT timeseries_id, id FROM inserted "
+                "UNION ALL "
+                "SELECT timeseries_id, id FROM ts_by_data_states "
+                "WHERE data_state_id = :data_state_id "
+                "  AND timeseries_id = ANY(:timeseries_ids)"
+            )
+            new_ids = dict(db.session.execute(sqla.text(query), params).all())
+            # Associations created concurrently in another transaction are
+            # neither inserted nor visible in the query snapshot
+            if len(new_ids) < len(missing_ts_ids):
+                query = (
+                    "SELECT timeseries_id, id FROM ts_by_data_states "
+                    "WHERE data_state_id = :data_state_id "
+                    "  AND timeseries_id = ANY(:timeseries_ids)"
+                )
+                new_ids = dict(db.session.execute(sqla.text(query), params).all())
+            tsbds_ids.update(new_ids)
+
+            # Only cache associations once committed
+            pending = db.session.info.setdefault("tsbds_cache_pending", {})
+            for ts_id, tsbds_id in new_ids.items():
+                pending[(ts_id, data_state.id)] = tsbds_id
+
+        return [tsbds_ids[ts.id] for ts in timeseries]
+
     @classmethod
     def get_by_name(cls, campaign, name):
         """Get timeseries by name for a given campaign
@@ -303,13 +372,25 @@ class Timeseries(AuthMgrMixin, Base):
         """Get a list of timeseries by ID
 
         :param list timeseries: List of timeseries IDs
+
+        Timeseries are queried at once, with permissions checked in the query.
         """
-        ts_d = {ts_id: Timeseries.get_by_id(ts_id) for ts_id in timeseries}
-        if None in ts_d.values():
-            raise TimeseriesNotFoundError(
-                f"Unknown timeseries: {[k for k in ts_d.keys() if ts_d[k] is None]}"
+        ts_ids = list(dict.fromkeys(int(ts_id) for ts_id in timeseries))
+        query = auth_mgr.authorize_query(cls, db.session.query(cls))
+        ts_d = {ts.id: ts for ts in query.filter(cls.id.in_(ts_ids))}
+        if missing_ids := [ts_id for ts_id in ts_ids if ts_id not in ts_d]:
+            # Timeseries may be missing because they don't exist or because
+            # they were filtered out for lack of permissions
+            existing_ids = set(
+                db.session.execute(
+                    sqla.select(cls.id).filter(cls.id.in_(missing_ids))
+                ).scalars()
             )
-        return list(ts_d.values())
+            unknown_ids = [i for i in missing_ids if i not in existing_ids]
+            if unknown_ids:
+                raise TimeseriesNotFoundError(f"Unknown timeseries: {unknown_ids}")
+            raise BEMServerAuthorizationError
+        return [ts_d[ts_id] for ts_id in ts_ids]
 
     @classmethod
     def get_many_by_name(cls, campaign, timeseries):
@@ -317,13 +398,17 @@ class Timeseries(AuthMgrMixin, Base):
 
         :param list timeseries: List of timeseries names
         :param Campaign campaign: Campaign
+
+        Timeseries are queried at once, with permissions checked in the query.
         """
-        ts_d = {ts_id: Timeseries.get_by_name(campaign, ts_id) for ts_id in timeseries}
-        if None in ts_d.values():
-            raise TimeseriesNotFoundError(
-                f"Unknown timeseries: {[k for k in ts_d.keys() if ts_d[k] is None]}"
-            )
-        return list(ts_d.values())
+        ts_names = list(dict.fromkeys(timeseries))
+        ts_d = {
+            ts.name: ts
+            for ts in cls.get(campaign_id=campaign.id).filter(cls.name.in_(ts_names))
+        }
+        if unknown_names := [name for name in ts_names if name not in ts_d]:
+            raise TimeseriesNotFoundError(f"Unknown timeseries: {unknown_names}")
+        return [ts_d[name] for name in ts_names]
 
     def get_property_value(self, property_name):
         """Get propery value for a given property name
@@ -386,6 +471,20 @@ def authorize_write_ts_data(actor: User, timeseries: Timeseries) -> bool:
     return campaign_scope.is_member(actor)
 
 
+@auth_mgr.add_many_rule("read_ts_data")
+def authorize_many_read_ts_data(actor: User, timeseries: list[Timeseries]) -> bool:
+    return CampaignScope.is_member_of_all(
+        actor, (ts.campaign_scope_id for ts in timeseries)
+    )
+
+
+@auth_mgr.add_many_rule("write_ts_data")
+def authorize_many_write_ts_data(actor: User, timeseries: list[Timeseries]) -> bool:
+    return CampaignScope.is_member_of_all(
+        actor, (ts.campaign_scope_id for ts in timeseries)
+    )
+
+
 class TimeseriesPropertyData(AuthMgrMixin, Base):
     """Timeseries property data"""
 
@@ -425,6 +524,8 @@ class TimeseriesByDataState(AuthMgrMixin, Base):
     id = sqla.Column(sqla.Integer, primary_key=True)
     timeseries_id = sqla.Column(sqla.ForeignKey("timeseries.id"), nullable=False)
     data_state_id = sqla.Column(sqla.ForeignKey("ts_data_states.id"), nullable=False)
+    # Timestamp of last data processed by cleanup task
+    cleanup_watermark = sqla.Column(sqla.DateTime(timezone=True))
 
     timeseries = sqla.orm.relationship(
         "Timeseries",
@@ -439,6 +540,30 @@ class TimeseriesByDataState(AuthMgrMixin, Base):
         ),
     )
 
+    @staticmethod
+    def rewind_cleanup_watermarks(tsbds_ids, start_times):
+        """Move cleanup watermarks before written data
+
+        :param list tsbds_ids: Timeseries x data state IDs
+        :param list start_times: Timestamp of first written data
+
+        Watermarks after first written data are moved just before it, so that
+        late or backfilled data is processed by next cleanup.
+        """
+        db.session.execute(
+            sqla.text(
+                "UPDATE ts_by_data_states "
+                "SET cleanup_watermark = written.start_time - interval '1 microsecond' "
+                "FROM unnest("
+                "  CAST(:tsbds_ids AS integer[]),"
+                "  CAST(:start_times AS timestamptz[])"
+                ") AS written(id, start_time) "
+                "WHERE ts_by_data_states.id = written.id "
+                "  AND ts_by_data_states.cleanup_watermark >= written.start_time"
+            ),
+            {"tsbds_ids": list(tsbds_ids), "start_times": list(start_times)},
+        )
+
     @classmethod
     def authorize_query(cls, actor, query):
         return Timeseries.authorize_query(actor, query.join(Timeseries))
@@ -460,6 +585,25 @@ class TimeseriesByDataState(AuthMgrMixin, Base):
         return timeseries.authorize_read(actor)
 
 
+@sqla.event.listens_for(db.session, "after_commit")
+def tsbds_cache_after_commit(session):
+    """Cache timeseries x data state associations once committed"""
+    for key, tsbds_id in session.info.pop("tsbds_cache_pending", {}).items():
+        TSBDS_CACHE.set(key, tsbds_id)
+
+
+@sqla.event.listens_for(db.session, "after_soft_rollback")
+def tsbds_cache_after_soft_rollback(session, previous_transaction):
+    """Discard timeseries x data state associations rolled-back"""
+    session.info.pop("tsbds_cache_pending", None)
+
+
+@sqla.event.listens_for(TimeseriesByDataState, "after_delete")
+def tsbds_after_delete(_mapper, _connection, target):
+    """Remove deleted timeseries x data state association from cache"""
+    TSBDS_CACHE.pop((target.timeseries_id, target.data_state_id))
+
+
 class TimeseriesBySite(AuthMgrMixin, Base):
     __tablename__ = "ts_by_sites"
     __table_args__ = (sqla.UniqueConstraint("site_id", "timeseries_id"),)
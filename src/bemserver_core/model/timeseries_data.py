@@ -1,13 +1,44 @@
 """Timeseries data"""
 
+import datetime as dt
+
 import sqlalchemy as sqla
 
-from bemserver_core.database import Base
+import pandas as pd
+
+from bemserver_core.database import Base, db
+from bemserver_core.time_utils import PeriodEnum
+
+# Periods of rollups, aligned in UTC, finest first
+ROLLUP_PERIODS = ("hour", "day")
+
+PANDAS_ROLLUP_PERIOD_ALIASES = {
+    "hour": "h",
+    "day": "D",
+}
+
+
+# Partition catching data outside of monthly partitions
+TS_DATA_DEFAULT_PARTITION = "ts_data_default"
+TS_DATA_PARTITION_NAME_FORMAT = "ts_data_p%Y_%m"
 
 
 class TimeseriesData(Base):
+    """Timeseries data
+
+    The table is partitioned by month (UTC) on timestamp. Data outside of
+    existing monthly partitions goes into a default partition.
+
+    Partitions for current and upcoming months are created by
+    CreateTimeseriesDataPartitions task, which should be scheduled to run
+    monthly.
+    """
+
     __tablename__ = "ts_data"
-    __table_args__ = (sqla.PrimaryKeyConstraint("ts_by_data_state_id", "timestamp"),)
+    __table_args__ = (
+        sqla.PrimaryKeyConstraint("ts_by_data_state_id", "timestamp"),
+        {"postgresql_partition_by": "RANGE (timestamp)"},
+    )
 
     timestamp = sqla.Column(sqla.DateTime(timezone=True))
     timeseries_by_data_state_id = sqla.Column(
@@ -22,3 +53,387 @@ class TimeseriesData(Base):
         "TimeseriesByDataState",
         backref=sqla.orm.backref("timeseries_data", cascade="all, delete-orphan"),
     )
+
+    @staticmethod
+    def get_partitions():
+        """Get monthly partitions
+
+        Returns a sorted list of (name, start, end) tuples. The default
+        partition is not included.
+        """
+        names = db.session.scalars(
+            sqla.text(
+                "SELECT pg_class.relname FROM pg_inherits "
+                "JOIN pg_class ON pg_class.oid = pg_inherits.inhrelid "
+                "WHERE pg_inherits.inhparent = CAST('ts_data' AS regclass)"
+            )
+        ).all()
+        partitions = []
+        for name in names:
+            if name == TS_DATA_DEFAULT_PARTITION:
+                continue
+            start = dt.datetime.strptime(name, TS_DATA_PARTITION_NAME_FORMAT).replace(
+                tzinfo=dt.UTC
+            )
+            partitions.append((name, start, _next_month(start)))
+        return sorted(partitions, key=lambda p: p[1])
+
+    @classmethod
+    def create_partitions(cls, start_dt, end_dt):
+        """Create missing monthly partitions covering a time interval
+
+        :param datetime start_dt: Time interval lower bound (tz-aware)
+        :param datetime end_dt: Time interval exclusive upper bound (tz-aware)
+
+        Data already stored in the default partition for a new partition's time
+        range is moved to the new partition. Inserts into the default partition
+        are blocked until the end of the transaction.
+
+        Returns the list of created partition names.
+        """
+        months = []
+        start = start_dt.astimezone(dt.UTC).replace(
+            day=1, hour=0, minute=0, second=0, microsecond=0
+        )
+        while start < end_dt:
+            months.append((start.strftime(TS_DATA_PARTITION_NAME_FORMAT), start))
+            start = _next_month(start)
+        if {m[0] for m in months} <= {p[0] for p in cls.get_partitions()}:
+            return []
+
+        # Prevent concurrent partitions creation and inserts into default
+        # partition, as data inserted into default partition in the range of a
+        # new partition after data is moved would make attaching it fail
+        db.session.execute(
+            sqla.text("LOCK TABLE ONLY ts_data IN SHARE UPDATE EXCLUSIVE MODE")
+        )
+        db.session.execute(
+            sqla.text(f"LOCK TABLE {TS_DATA_DEFAULT_PARTITION} IN EXCLUSIVE MODE")
+        )
+        existing = {p[0] for p in cls.get_partitions()}
+
+        created = []
+        for name, start in months:
+            end = _next_month(start)
+            if name not in existing:
+                # Create table apart and attach it, as a partition can't be
+                # created while the default partition holds data in its range
+                db.session.execute(
+                    sqla.text(
+                        f"CREATE TABLE {name} "
+                        "(LIKE ts_data INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+                    )
+                )
+                db.session.execute(
+                    sqla.text(
+                        "WITH moved AS ("
+                        f"  DELETE FROM {TS_DATA_DEFAULT_PARTITION}"
+                        "  WHERE timestamp >= :start AND timestamp < :end"
+                        "  RETURNING *"
+                        f") INSERT INTO {name} SELECT * FROM moved"
+                    ),
+                    {"start": start, "end": end},
+                )
+                db.session.execute(
+                    sqla.text(
+                        f"ALTER TABLE ts_data ATTACH PARTITION {name} "
+                        f"FOR VALUES FROM ('{start.isoformat()}') "
+                        f"TO ('{end.isoformat()}')"
+                    )
+                )
+                created.append(name)
+        return created
+
+    @classmethod
+    def create_upcoming_partitions(cls, months_ahead=3):
+        """Create missing partitions for current and upcoming months
+
+        :param int months_ahead: Number of months to create after current month
+
+        Returns the list of created partition names.
+        """
+        start_dt = dt.datetime.now(tz=dt.UTC).replace(
+            day=1, hour=0, minute=0, second=0, microsecond=0
+        )
+        end_dt = start_dt
+        for _ in range(months_ahead + 1):
+            end_dt = _next_month(end_dt)
+        return cls.create_partitions(start_dt, end_dt)
+
+    @classmethod
+    def drop_partitions(cls, end_dt):
+        """Drop monthly partitions ending before a given datetime
+
+        :param datetime end_dt: Datetime (tz-aware)
+
+        This is a cheap way to delete old data. Only partitions lying entirely
+        before ``end_dt`` are dropped. Data in the default partition is left
+        untouched. Rollups are not modified, so that aggregates of dropped data
+        are kept.
+
+        Returns the list of dropped partition names.
+        """
+        dropped = []
+        for name, _, end in cls.get_partitions():
+            if end > end_dt:
+                break
+            db.session.execute(
+                sqla.text(f"ALTER TABLE ts_data DETACH PARTITION {name}")
+            )
+            db.session.execute(sqla.text(f"DROP TABLE {name}"))
+            dropped.append(name)
+        return dropped
+
+
+class TimeseriesDataRollup(Base):
+    """Timeseries data aggregates per hour and per day (UTC)
+
+    Rollups are refreshed from the dirty intervals log.
+    """
+
+    __tablename__ = "ts_data_rollups"
+    __table_args__ = (
+        sqla.PrimaryKeyConstraint("ts_by_data_state_id", "period", "bucket"),
+    )
+
+    timeseries_by_data_state_id = sqla.Column(
+        "ts_by_data_state_id",
+        sqla.Integer,
+        sqla.ForeignKey("ts_by_data_states.id"),
+        nullable=False,
+    )
+    period = sqla.Column(sqla.Enum(PeriodEnum, name="periodenum"), nullable=False)
+    bucket = sqla.Column(sqla.DateTime(timezone=True), nullable=False)
+    count = sqla.Column(sqla.Integer, nullable=False)
+    sum = sqla.Column(sqla.Float)
+    min = sqla.Column(sqla.Float)
+    max = sqla.Column(sqla.Float)
+    first = sqla.Column(sqla.Float)
+    last = sqla.Column(sqla.Float)
+
+    timeseries_by_data_state = sqla.orm.relationship(
+        "TimeseriesByDataState",
+        backref=sqla.orm.backref(
+            "timeseries_data_rollups", cascade="all, delete-orphan"
+        ),
+    )
+
+    @classmethod
+    def refresh(cls, tsbds_ids=None):
+        """Refresh rollups from dirty intervals log
+
+        :param list tsbds_ids: Timeseries x data state IDs to refresh.
+            Default: None, which means all.
+
+        Processed dirty intervals are removed from the log. Hourly rollups are
+        computed from raw data, daily rollups from hourly rollups.
+        """
+        stmt = sqla.delete(TimeseriesDataDirtyInterval).returning(
+            TimeseriesDataDirtyInterval.timeseries_by_data_state_id,
+            TimeseriesDataDirtyInterval.start_time,
+            TimeseriesDataDirtyInterval.end_time,
+        )
+        if tsbds_ids is not None:
+            stmt = stmt.where(
+                TimeseriesDataDirtyInterval.timeseries_by_data_state_id.in_(tsbds_ids)
+            )
+        intervals = db.session.execute(
+            stmt, execution_options={"synchronize_session": False}
+        ).all()
+        if not intervals:
+            return
+
+        for period in ROLLUP_PERIODS:
+            ranges = cls._merge_intervals(intervals, period)
+            params = {
+                "period": period,
+                "tsbds_ids": [r[0] for r in ranges],
+                "start_times": [r[1] for r in ranges],
+                "end_times": [r[2] for r in ranges],
+            }
+            ranges_expr = (
+                "unnest("
+                "  CAST(:tsbds_ids AS integer[]),"
+                "  CAST(:start_times AS timestamptz[]),"
+                "  CAST(:end_times AS timestamptz[])"
+                ") AS ranges(tsbds_id, start_time, end_time)"
+            )
+            db.session.execute(
+                sqla.text(
+                    "DELETE FROM ts_data_rollups "
+                    f"USING {ranges_expr} "
+                    "WHERE ts_data_rollups.period = CAST(:period AS periodenum) "
+                    "  AND ts_data_rollups.ts_by_data_state_id = ranges.tsbds_id "
+                    "  AND ts_data_rollups.bucket >= ranges.start_time "
+                    "  AND ts_data_rollups.bucket < ranges.end_time"
+                ),
+                params,
+            )
+            if period == ROLLUP_PERIODS[0]:
+                query = (
+                    "INSERT INTO ts_data_rollups "
+                    "  (ts_by_data_state_id, period, bucket,"
+                    "   count, sum, min, max, first, last) "
+                    "SELECT ts_data.ts_by_data_state_id,"
+                    "  CAST(:period AS periodenum),"
+                    "  date_trunc(CAST(:period AS text), ts_data.timestamp, 'UTC')"
+                    "    AS bucket,"
+                    "  count(value), sum(value), min(value), max(value),"
+                    "  (array_agg(value ORDER BY timestamp))[1],"
+                    "  (array_agg(value ORDER BY timestamp DESC))[1] "
+                    f"FROM ts_data JOIN {ranges_expr} "
+                    "  ON ts_data.ts_by_data_state_id = ranges.tsbds_id "
+                    "  AND ts_data.timestamp >= ranges.start_time "
+                    "  AND ts_data.timestamp < ranges.end_time "
+                    "GROUP BY 1, 3"
+                )
+            else:
+                query = (
+                    "INSERT INTO ts_data_rollups "
+                    "  (ts_by_data_state_id, period, bucket,"
+                    "   count, sum, min, max, first, last) "
+                    "SELECT rollups.ts_by_data_state_id,"
+                    "  CAST(:period AS periodenum),"
+                    "  date_trunc(CAST(:period AS text), rollups.bucket, 'UTC')"
+                    "    AS bucket,"
+                    "  sum(count), sum(sum), min(min), max(max),"
+                    "  (array_agg(first ORDER BY rollups.bucket))[1],"
+                    "  (array_agg(last ORDER BY rollups.bucket DESC))[1] "
+                    f"FROM ts_data_rollups AS rollups JOIN {ranges_expr} "
+                    "  ON rollups.ts_by_data_state_id = ranges.tsbds_id "
+                    "  AND rollups.bucket >= ranges.start_time "
+                    "  AND rollups.bucket < ranges.end_time "
+                    f"WHERE rollups.period = '{ROLLUP_PERIODS[0]}' "
+                    "GROUP BY 1, 3"
+                )
+            db.session.execute(sqla.text(query), params)
+
+    @staticmethod
+    def _merge_intervals(intervals, period):
+        """Align intervals on period boundaries and merge overlapping intervals
+
+        :param list intervals: List of (tsbds_id, start_time, end_time) tuples
+        :param str period: Rollup period
+
+        Returns a sorted list of non-overlapping (tsbds_id, start, end) tuples.
+        """
+        pd_freq = PANDAS_ROLLUP_PERIOD_ALIASES[period]
+        aligned = sorted(
+            (
+                tsbds_id,
+                pd.Timestamp(start_time).tz_convert("UTC").floor(pd_freq),
+                pd.Timestamp(end_time).tz_convert("UTC").ceil(pd_freq),
+            )
+            for tsbds_id, start_time, end_time in intervals
+        )
+        ranges = []
+        for tsbds_id, start_time, end_time in aligned:
+            if ranges and ranges[-1][0] == tsbds_id and start_time <= ranges[-1][2]:
+                ranges[-1][2] = max(ranges[-1][2], end_time)
+            else:
+                ranges.append([tsbds_id, start_time, end_time])
+        return [tuple(r) for r in ranges]
+
+    @classmethod
+    def rebuild(cls, tsbds_ids=None):
+        """Rebuild rollups from scratch
+
+        :param list tsbds_ids: Timeseries x data state IDs to rebuild.
+            Default: None, which means all.
+
+        This is meant to be used when enabling rollups on existing data.
+        """
+        delete_stmt = sqla.delete(cls)
+        where = "TRUE"
+        if tsbds_ids is not None:
+            delete_stmt = delete_stmt.where(
+                cls.timeseries_by_data_state_id.in_(tsbds_ids)
+            )
+            where = "ts_by_data_state_id = ANY(:tsbds_ids)"
+        db.session.execute(
+            delete_stmt, execution_options={"synchronize_session": False}
+        )
+        db.session.execute(
+            sqla.text(
+                "INSERT INTO ts_data_dirty_intervals "
+                "  (ts_by_data_state_id, start_time, end_time) "
+                "SELECT ts_by_data_state_id,"
+                "  min(timestamp), max(timestamp) + interval '1 microsecond' "
+                f"FROM ts_data WHERE {where} "
+                "GROUP BY ts_by_data_state_id"
+            ),
+            {"tsbds_ids": tsbds_ids},
+        )
+        cls.refresh(tsbds_ids)
+
+
+class TimeseriesDataDirtyInterval(Base):
+    """Log of time intervals of timeseries data modified since rollups refresh
+
+    Intervals are [start_time, end_time).
+    """
+
+    __tablename__ = "ts_data_dirty_intervals"
+
+    id = sqla.Column(sqla.Integer, primary_key=True)
+    timeseries_by_data_state_id = sqla.Column(
+        "ts_by_data_state_id",
+        sqla.Integer,
+        sqla.ForeignKey("ts_by_data_states.id"),
+        nullable=False,
+    )
+    start_time = sqla.Column(sqla.DateTime(timezone=True), nullable=False)
+    end_time = sqla.Column(sqla.DateTime(timezone=True), nullable=False)
+
+    timeseries_by_data_state = sqla.orm.relationship(
+        "TimeseriesByDataState",
+        backref=sqla.orm.backref(
+            "timeseries_data_dirty_intervals", cascade="all, delete-orphan"
+        ),
+    )
+
+    @staticmethod
+    def log(tsbds_ids, start_times, end_times):
+        """Log dirty intervals
+
+        :param list tsbds_ids: Timeseries x data state IDs
+        :param list start_times: Interval start times
+        :param list end_times: Interval exclusive end times
+        """
+        db.session.execute(
+            sqla.text(
+                "INSERT INTO ts_data_dirty_intervals "
+                "  (ts_by_data_state_id, start_time, end_time) "
+                "SELECT * FROM unnest("
+                "  CAST(:tsbds_ids AS integer[]),"
+                "  CAST(:start_times AS timestamptz[]),"
+                "  CAST(:end_times AS timestamptz[])"
+                ")"
+            ),
+            {
+                "tsbds_ids": list(tsbds_ids),
+                "start_times": list(start_times),
+                "end_times": list(end_times),
+            },
+        )
+
+
+def _next_month(datetime):
+    """Return first day of the month following a month start datetime"""
+    if datetime.month == 12:
+        return datetime.replace(year=datetime.year + 1, month=1)
+    return datetime.replace(month=datetime.month + 1)
+
+
+def init_db_timeseries_data_partitions():
+    """Create default partition and partitions for upcoming months
+
+    This function is meant to be used for tests or dev setups after create_all.
+    Production setups should rely on migration scripts.
+    """
+    db.session.execute(
+        sqla.text(
+            f"CREATE TABLE {TS_DATA_DEFAULT_PARTITION} PARTITION OF ts_data DEFAULT"
+        )
+    )
+    TimeseriesData.create_upcoming_partitions()
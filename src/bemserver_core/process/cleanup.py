@@ -3,8 +3,12 @@
 Remove outliers from timeseries data
 """
 
+import sqlalchemy as sqla
+
 import numpy as np
 
+from bemserver_core.authorization import auth_mgr
+from bemserver_core.database import db
 from bemserver_core.input_output import tsdio
 from bemserver_core.model import Timeseries
 
@@ -22,8 +26,6 @@ def cleanup(
     Remove outliers from a list of timeseries.
     The bounds are the "Min" and "Max" timeseries properties.
     """
-    timeseries_ids = [ts.id for ts in timeseries]
-
     # Get source data
     data_df = tsdio.get_timeseries_data(
         start_dt,
@@ -33,6 +35,22 @@ def cleanup(
         inclusive=inclusive,
     )
 
+    return remove_outliers(data_df, timeseries)
+
+
+def remove_outliers(data_df, timeseries):
+    """Remove outliers from timeseries data
+
+    :param DataFrame data_df: Timeseries data, with timeseries IDs as columns
+    :param list timeseries: List of timeseries
+
+    Outliers are replaced by NaN in place. The bounds are the "Min" and "Max"
+    timeseries properties.
+
+    Returns the dataframe.
+    """
+    timeseries_ids = [ts.id for ts in timeseries]
+
     # Get min/max properties values for each TS
     ts_mins = Timeseries.get_property_for_many_timeseries(timeseries_ids, "Min")
     ts_maxs = Timeseries.get_property_for_many_timeseries(timeseries_ids, "Max")
@@ -44,3 +62,94 @@ def cleanup(
             data_df.loc[data_df[ts_id] > float(ts_max), ts_id] = np.nan
 
     return data_df
+
+
+def cleanup_in_db(
+    start_dt,
+    end_dt,
+    timeseries,
+    data_state,
+    target_data_state,
+    *,
+    inclusive="left",
+):
+    """Cleanup process executed in the database
+
+    Copy data of a list of timeseries from a data state to another, skipping
+    outliers, in a single INSERT ... SELECT statement. The bounds are the "Min"
+    and "Max" timeseries properties. Data already present in target data state
+    is left untouched.
+
+    This is equivalent to writing the output of ``cleanup`` into target data
+    state, except data is not loaded into the application. ``cleanup`` may
+    still be used to apply custom logic before writing.
+    """
+    # Check permissions
+    auth_mgr.authorize_many("read_ts_data", timeseries)
+    auth_mgr.authorize_many("write_ts_data", timeseries)
+
+    params = {
+        "timeseries_ids": [ts.id for ts in timeseries],
+        "source_ids": Timeseries.get_many_timeseries_by_data_state_ids(
+            timeseries, data_state
+        ),
+        "target_ids": Timeseries.get_many_timeseries_by_data_state_ids(
+            timeseries, target_data_state
+        ),
+        "start_dt": start_dt,
+        "end_dt": end_dt,
+    }
+    where = ""
+    if start_dt:
+        where += (
+            " AND ts_data.timestamp >= :start_dt"
+            if inclusive in {"both", "left"}
+            else " AND ts_data.timestamp > :start_dt"
+        )
+    if end_dt:
+        where += (
+            " AND ts_data.timestamp <= :end_dt"
+            if inclusive in {"both", "right"}
+            else " AND ts_data.timestamp < :end_dt"
+        )
+    bounds_query = (
+        "SELECT tsbds.source_id, tsbds.target_id,"
+        "  CAST(ts_min.value AS float8) AS min,"
+        "  CAST(ts_max.value AS float8) AS max "
+        "FROM unnest("
+        "  CAST(:timeseries_ids AS integer[]),"
+        "  CAST(:source_ids AS integer[]),"
+        "  CAST(:target_ids AS integer[])"
+        ") AS tsbds(timeseries_id, source_id, target_id) "
+        "LEFT JOIN ("
+        "  ts_prop_data AS ts_min JOIN ts_props AS prop_min"
+        "    ON prop_min.id = ts_min.property_id AND prop_min.name = 'Min'"
+        ") ON ts_min.timeseries_id = tsbds.timeseries_id "
+        "LEFT JOIN ("
+        "  ts_prop_data AS ts_max JOIN ts_props AS prop_max"
+        "    ON prop_max.id = ts_max.property_id AND prop_max.name = 'Max'"
+        ") ON ts_max.timeseries_id = tsbds.timeseries_id"
+    )
+    insert_query = (
+        "INSERT INTO ts_data (ts_by_data_state_id, timestamp, value) "
+        "SELECT bounds.target_id, ts_data.timestamp, ts_data.value "
+        "FROM ts_data JOIN bounds ON ts_data.ts_by_data_state_id = bounds.source_id "
+        "WHERE (bounds.min IS NULL OR ts_data.value >= bounds.min) "
+        "  AND (bounds.max IS NULL OR ts_data.value <= bounds.max)"
+        f"{where} "
+        "ON CONFLICT DO NOTHING"
+    )
+    if tsdio._use_rollups:
+        # Log written intervals for rollups refresh
+        query = (
+            f"WITH bounds AS ({bounds_query}), "
+            f"inserted AS ({insert_query} RETURNING ts_by_data_state_id, timestamp) "
+            "INSERT INTO ts_data_dirty_intervals "
+            "  (ts_by_data_state_id, start_time, end_time) "
+            "SELECT ts_by_data_state_id,"
+            "  min(timestamp), max(timestamp) + interval '1 microsecond' "
+            "FROM inserted GROUP BY ts_by_data_state_id"
+        )
+    else:
+        query = f"WITH bounds AS ({bounds_query}) {insert_query}"
+    db.session.execute(sqla.text(query), params)
@@ -5,9 +5,6 @@ import json
 
 import pandas as pd
 
-import requests
-from requests.exceptions import RequestException
-
 from bemserver_core.authorization import auth_mgr
 from bemserver_core.exceptions import (
     BEMServerCoreSettingsError,
@@ -71,6 +68,9 @@ class OikolabWeatherDataClient:
 
         model = OIKOLAB_FORECAST_SOURCE if forecast else OIKOLAB_REANALYSIS_SOURCE
 
+        # Imported here as only needed when querying weather API
+        import requests
+
         try:
             resp = requests.get(
                 url=self._api_url,
@@ -86,7 +86,7 @@ class OikolabWeatherDataClient:
                 # Set a long timeout as Oikolab responses may take a while
                 timeout=60,
             )
-        except RequestException as exc:
+        except requests.exceptions.RequestException as exc:
             raise BEMServerCoreWeatherAPIConnectionError(
                 f"Error while connecting to weather API: {exc}"
             ) from exc
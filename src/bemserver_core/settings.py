@@ -3,8 +3,27 @@
 DEFAULT_CONFIG = {
     # SQLAlchemy parameters
     "SQLALCHEMY_DATABASE_URI": "",
+    # Read replica for reads in ReadReplica context (None to use primary database)
+    "SQLALCHEMY_READ_REPLICA_URI": None,
+    # Keyword parameters passed to create_engine (pool_size, pool_pre_ping,...)
+    # for primary database and read replica
+    "SQLALCHEMY_ENGINE_OPTIONS": {},
+    # Engine parameters overriding SQLALCHEMY_ENGINE_OPTIONS in Celery workers,
+    # key by key (shallow merge), for primary database and read replica
+    "SQLALCHEMY_WORKER_ENGINE_OPTIONS": {},
+    # Timeseries data I/O
+    # Insert timeseries data using COPY through a staging table
+    "TIMESERIES_DATA_IO_USE_COPY": False,
+    # Maintain hourly/daily rollups and use them in bucketed queries
+    # Rollups are refreshed by RefreshRollups task
+    "TIMESERIES_DATA_ROLLUPS": False,
     # Unit definitions
     "UNIT_DEFINITION_FILES": [],
+    # Folder where parsed unit definitions are cached, to speed up registry
+    # creation in new processes (None to disable, ":auto:" for pint default user
+    # cache folder). Disabled by default as the user running the application or
+    # workers may not have a writable cache folder.
+    "UNITS_CACHE_FOLDER": None,
     # Weather data client config
     "WEATHER_DATA_CLIENT_API_URL": "https://api.oikolab.com/weather",
     "WEATHER_DATA_CLIENT_API_KEY": "",
@@ -12,8 +31,15 @@ DEFAULT_CONFIG = {
     "SMTP_ENABLED": False,
     "SMTP_FROM_ADDR": "",
     "SMTP_HOST": "localhost",
+    "SMTP_PORT": 25,
+    # Interval in seconds between notification email digests, scheduled in
+    # Celery beat unless CELERY_CONFIG beat schedule already has the task
+    # (None to disable)
+    "NOTIFICATION_EMAIL_DIGEST_INTERVAL": 300,
     # Celery config
     "CELERY_CONFIG": {},
+    # Max number of parallel child tasks of a scheduled task (0: one per campaign)
+    "SCHEDULED_TASKS_CONCURRENCY": 0,
     # Plugins
     "PLUGIN_PATHS": [],
 }
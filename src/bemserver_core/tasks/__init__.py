@@ -5,4 +5,7 @@ from . import (
     check_outliers,  # noqa
     cleanup,  # noqa
     download_weather_data,  # noqa
+    refresh_rollups,  # noqa
+    retention,  # noqa
+    ts_data_partitions,  # noqa
 )
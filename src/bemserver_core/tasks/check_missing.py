@@ -1,7 +1,5 @@
 """Check missing data scheduled task"""
 
-import sqlalchemy as sqla
-
 from bemserver_core.celery import BEMServerCoreAsyncTask, celery, logger
 from bemserver_core.database import db
 from bemserver_core.input_output import tsdio
@@ -35,54 +33,43 @@ def check_missing_ts_data(campaign, start_dt, end_dt, min_completeness_ratio=0.9
         logger.debug("Querying for already missing timeseries")
 
         # Check current status: which timeseries are already missing
-        ts_status_missing = {}
-        for ts in c_scope.timeseries:
-            query = (
-                db.session.query(Event)
-                .join(TimeseriesByEvent)
-                .filter(TimeseriesByEvent.timeseries_id == ts.id)
-                .filter(
-                    sqla.or_(
-                        Event.category_id == ec_data_missing.id,
-                        Event.category_id == ec_data_present.id,
-                    )
-                )
-                .order_by(sqla.desc(Event.timestamp))
-                .limit(1)
-            )
-            tbes = list(query)
-            ts_status_missing[(ts.id, ts.name)] = (
-                bool(tbes) and tbes[0].category_id == ec_data_missing.id
-            )
-
-            logger.debug("Timeseries missing status: %s", ts_status_missing)
-
-            # Get count for each TS
-            counts_df = tsdio.get_timeseries_aggregate_data(
-                start_dt,
-                end_dt,
-                c_scope.timeseries,
-                ds_raw,
-                agg="count",
-            )
-
-            # TS is missing if either count/expected < min or no expectation and count=0
-            nb_s = (end_dt - start_dt).total_seconds()
-            ts_intervals = Timeseries.get_property_for_many_timeseries(
-                [ts.id for ts in c_scope.timeseries], "Interval"
-            )
-            missing_ts = []
-            for timeseries in c_scope.timeseries:
-                if ts_intervals[timeseries.id] is not None:
-                    if (
-                        counts_df.loc[timeseries.id, "count"]
-                        * float(ts_intervals[timeseries.id])
-                        / nb_s
-                        < min_completeness_ratio
-                    ):
-                        missing_ts.append((timeseries.id, timeseries.name))
-                elif counts_df.loc[timeseries.id, "count"] == 0:
+        ts_last_category = TimeseriesByEvent.get_last_category_for_many_timeseries(
+            [ts.id for ts in c_scope.timeseries],
+            [ec_data_missing.id, ec_data_present.id],
+        )
+        ts_status_missing = {
+            (ts.id, ts.name): ts_last_category.get(ts.id) == ec_data_missing.id
+            for ts in c_scope.timeseries
+        }
+
+        logger.debug("Timeseries missing status: %s", ts_status_missing)
+
+        # Get count for each TS
+        counts_df = tsdio.get_timeseries_aggregate_data(
+            start_dt,
+            end_dt,
+            c_scope.timeseries,
+            ds_raw,
+            agg="count",
+        )
+
+        # TS is missing if either count/expected < min or no expectation and count=0
+        nb_s = (end_dt - start_dt).total_seconds()
+        ts_intervals = Timeseries.get_property_for_many_timeseries(
+            [ts.id for ts in c_scope.timeseries], "Interval"
+        )
+        missing_ts = []
+        for timeseries in c_scope.timeseries:
+            if ts_intervals[timeseries.id] is not None:
+                if (
+                    counts_df.loc[timeseries.id, "count"]
+                    * float(ts_intervals[timeseries.id])
+                    / nb_s
+                    < min_completeness_ratio
+                ):
                     missing_ts.append((timeseries.id, timeseries.name))
+            elif counts_df.loc[timeseries.id, "count"] == 0:
+                missing_ts.append((timeseries.id, timeseries.name))
 
         logger.debug("Missing timeseries: %s", missing_ts)
 
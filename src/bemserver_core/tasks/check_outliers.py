@@ -1,7 +1,5 @@
 """Check outliers scheduled task"""
 
-import sqlalchemy as sqla
-
 from bemserver_core.celery import BEMServerCoreAsyncTask, celery, logger
 from bemserver_core.database import db
 from bemserver_core.input_output import tsdio
@@ -40,25 +38,14 @@ def check_outliers_ts_data(
         logger.debug("Querying for timeseries with outliers already")
 
         # Check current status: which timeseries have outliers in last period
-        ts_status_outliers = {}
-        for ts in c_scope.timeseries:
-            query = (
-                db.session.query(Event)
-                .join(TimeseriesByEvent)
-                .filter(TimeseriesByEvent.timeseries_id == ts.id)
-                .filter(
-                    sqla.or_(
-                        Event.category_id == ec_data_outliers.id,
-                        Event.category_id == ec_data_no_outliers.id,
-                    )
-                )
-                .order_by(sqla.desc(Event.timestamp))
-                .limit(1)
-            )
-            tbes = list(query)
-            ts_status_outliers[(ts.id, ts.name)] = (
-                bool(tbes) and tbes[0].category_id == ec_data_outliers.id
-            )
+        ts_last_category = TimeseriesByEvent.get_last_category_for_many_timeseries(
+            [ts.id for ts in c_scope.timeseries],
+            [ec_data_outliers.id, ec_data_no_outliers.id],
+        )
+        ts_status_outliers = {
+            (ts.id, ts.name): ts_last_category.get(ts.id) == ec_data_outliers.id
+            for ts in c_scope.timeseries
+        }
 
         logger.debug("Timeseries outliers status: %s", ts_status_outliers)
 
@@ -1,36 +1,114 @@
 """Cleanup scheduled task"""
 
+import sqlalchemy as sqla
+
+import numpy as np
+
 from bemserver_core.celery import BEMServerCoreAsyncTask, celery, logger
 from bemserver_core.database import db
 from bemserver_core.input_output import tsdio
-from bemserver_core.model import TimeseriesDataState
-from bemserver_core.process.cleanup import cleanup as cleanup_process
+from bemserver_core.model import TimeseriesByDataState, TimeseriesDataState
+from bemserver_core.process.cleanup import remove_outliers
+
 
+def cleanup_data(campaign, start_dt, end_dt, batch_size=100):
+    """Cleanup campaign data
 
-def cleanup_data(campaign, start_dt, end_dt):
+    Timeseries are processed by batches of ``batch_size``. For each timeseries,
+    only raw data after its cleanup watermark (the timestamp of the last raw
+    data processed) is read, so that data is not cleaned twice. Writing raw data
+    before the watermark moves it back, so that late data is cleaned.
+
+    Timeseries without raw data are skipped.
+    """
     logger.info("Cleanup campaign %s", campaign.name)
     logger.info("Time interval: [%s - %s]", start_dt, end_dt)
 
     ds_raw = TimeseriesDataState.get(name="Raw").first()
     ds_clean = TimeseriesDataState.get(name="Clean").first()
 
-    for ts in campaign.timeseries:
-        logger.debug("Cleaning data for timeseries %s", ts.name)
+    timeseries = list(campaign.timeseries)
+    for idx in range(0, len(timeseries), batch_size):
+        ts_batch = timeseries[idx : idx + batch_size]
+
+        tsbds = {
+            ts_id: (tsbds_id, watermark)
+            for ts_id, tsbds_id, watermark in db.session.execute(
+                sqla.select(
+                    TimeseriesByDataState.timeseries_id,
+                    TimeseriesByDataState.id,
+                    TimeseriesByDataState.cleanup_watermark,
+                )
+                .filter(TimeseriesByDataState.data_state_id == ds_raw.id)
+                .filter(
+                    TimeseriesByDataState.timeseries_id.in_(ts.id for ts in ts_batch)
+                )
+            ).all()
+        }
+        ts_batch = [ts for ts in ts_batch if ts.id in tsbds]
+        if not ts_batch:
+            logger.debug("No raw data")
+            continue
+        logger.debug("Cleaning data for timeseries %s", [ts.name for ts in ts_batch])
+        tsbds_ids, watermarks = zip(*(tsbds[ts.id] for ts in ts_batch), strict=True)
 
-        data_df = cleanup_process(
-            start_dt,
+        # Exclusive lower bound for each timeseries
+        lower_bounds = [
+            start_dt if wm is None else max(start_dt, wm) for wm in watermarks
+        ]
+        batch_start_dt = min(lower_bounds)
+        if batch_start_dt >= end_dt:
+            logger.debug("No data since last run")
+            continue
+
+        data_df = tsdio.get_timeseries_data(
+            batch_start_dt,
             end_dt,
-            [ts],
+            ts_batch,
             ds_raw,
             inclusive="neither",
         )
+        for ts, lower_bound in zip(ts_batch, lower_bounds, strict=True):
+            if lower_bound > batch_start_dt:
+                data_df.loc[data_df.index <= lower_bound, ts.id] = np.nan
 
-        if data_df.empty:
+        # Move watermarks to last raw data, before removing outliers
+        valid = data_df.notna().to_numpy()
+        new_watermarks = [
+            (tsbds_id, watermark, data_df.index[np.flatnonzero(col)[-1]])
+            for tsbds_id, watermark, col in zip(
+                tsbds_ids, watermarks, valid.T, strict=True
+            )
+            if col.any()
+        ]
+        if not new_watermarks:
             logger.debug("No data since last run")
             continue
 
+        data_df = remove_outliers(data_df, ts_batch)
+
         logger.debug("Writing clean data")
-        tsdio.set_timeseries_data(data_df, ds_clean)
+        tsdio.set_timeseries_data(data_df.dropna(axis=1, how="all"), ds_clean)
+        # Don't overwrite watermarks moved back by a concurrent write of late data
+        db.session.execute(
+            sqla.text(
+                "UPDATE ts_by_data_states "
+                "SET cleanup_watermark = processed.new_watermark "
+                "FROM unnest("
+                "  CAST(:tsbds_ids AS integer[]),"
+                "  CAST(:old_watermarks AS timestamptz[]),"
+                "  CAST(:new_watermarks AS timestamptz[])"
+                ") AS processed(id, old_watermark, new_watermark) "
+                "WHERE ts_by_data_states.id = processed.id "
+                "  AND ts_by_data_states.cleanup_watermark "
+                "    IS NOT DISTINCT FROM processed.old_watermark"
+            ),
+            {
+                "tsbds_ids": [w[0] for w in new_watermarks],
+                "old_watermarks": [w[1] for w in new_watermarks],
+                "new_watermarks": [w[2] for w in new_watermarks],
+            },
+        )
 
         logger.debug("Committing")
         db.session.commit()
@@ -39,4 +117,4 @@ def cleanup_data(campaign, start_dt, end_dt):
 @celery.register_task
 class Cleanup(BEMServerCoreAsyncTask):
     TASK_FUNCTION = cleanup_data
-    DEFAULT_PARAMETERS = {}
+    DEFAULT_PARAMETERS = {"batch_size": 100}
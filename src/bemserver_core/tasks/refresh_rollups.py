@@ -0,0 +1,31 @@
+"""Refresh rollups scheduled task"""
+
+import sqlalchemy as sqla
+
+from bemserver_core.celery import BEMServerCoreAsyncTask, celery, logger
+from bemserver_core.database import db
+from bemserver_core.model import Timeseries, TimeseriesByDataState, TimeseriesDataRollup
+
+
+def refresh_rollups(campaign, start_dt, end_dt):
+    """Refresh rollups of campaign timeseries
+
+    Rollups are refreshed from dirty intervals log regardless of time interval.
+    """
+    logger.info("Refresh rollups for campaign %s", campaign.name)
+
+    tsbds_ids = db.session.scalars(
+        sqla.select(TimeseriesByDataState.id)
+        .join(Timeseries)
+        .filter(Timeseries.campaign_id == campaign.id)
+    ).all()
+    TimeseriesDataRollup.refresh(tsbds_ids)
+
+    logger.debug("Committing")
+    db.session.commit()
+
+
+@celery.register_task
+class RefreshRollups(BEMServerCoreAsyncTask):
+    TASK_FUNCTION = refresh_rollups
+    DEFAULT_PARAMETERS = {}
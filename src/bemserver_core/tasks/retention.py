@@ -0,0 +1,120 @@
+"""Retention scheduled task"""
+
+from zoneinfo import ZoneInfo
+
+import sqlalchemy as sqla
+
+from bemserver_core.celery import BEMServerCoreAsyncTask, celery, logger
+from bemserver_core.database import db
+from bemserver_core.input_output import tsdio
+from bemserver_core.model import (
+    RetentionPolicy,
+    TimeseriesByDataState,
+    TimeseriesData,
+)
+from bemserver_core.time_utils import ceil, floor, make_date_offset
+
+
+def _get_first_timestamp(timeseries, data_state):
+    return db.session.scalar(
+        sqla.select(sqla.func.min(TimeseriesData.timestamp))
+        .join(TimeseriesByDataState)
+        .filter(TimeseriesByDataState.data_state_id == data_state.id)
+        .filter(TimeseriesByDataState.timeseries_id.in_(ts.id for ts in timeseries))
+    )
+
+
+def _iter_batches(start_dt, end_dt, policy):
+    """Split time interval into batches of one month
+
+    Batch bounds are aligned on months in start_dt timezone and on downsampling
+    buckets, if any.
+    """
+    month_offset = make_date_offset("month", 1)
+    batch_start = start_dt
+    while batch_start < end_dt:
+        batch_end = floor(batch_start, "month") + month_offset
+        if policy.target_data_state_id is not None:
+            batch_end = ceil(
+                batch_end, policy.bucket_width_unit.value, policy.bucket_width_value
+            )
+        batch_end = min(batch_end, end_dt)
+        yield batch_start, batch_end
+        batch_start = batch_end
+
+
+def apply_retention(campaign, start_dt, end_dt):
+    """Apply retention policies of a campaign
+
+    Data older than ``end_dt`` minus retention period is downsampled into
+    target data state, if any, then deleted from source data state. ``start_dt``
+    is ignored: policies resume from where they stopped.
+
+    Data is processed in batches of one month (campaign timezone) and progress is
+    committed after each batch, so that an interrupted run resumes from the
+    last processed batch.
+    """
+    logger.info("Apply retention policies for campaign %s", campaign.name)
+
+    timeseries = list(campaign.timeseries)
+    if not timeseries:
+        logger.debug("No timeseries in campaign")
+        return
+    tz_info = ZoneInfo(campaign.timezone)
+
+    for policy in RetentionPolicy.get(campaign_id=campaign.id, is_enabled=True):
+        source_ds = policy.source_data_state
+        target_ds = policy.target_data_state
+        logger.debug("Applying retention policy on %s data", source_ds.name)
+
+        cutoff_dt = end_dt.astimezone(tz_info) + make_date_offset(
+            policy.retention_unit.value, -policy.retention_value
+        )
+        start_dt = policy.processed_until
+        if start_dt is None:
+            start_dt = _get_first_timestamp(timeseries, source_ds)
+            if start_dt is None:
+                logger.debug("No data")
+                continue
+        start_dt = start_dt.astimezone(tz_info)
+        if target_ds is not None:
+            # Only process complete buckets
+            start_dt = floor(
+                start_dt, policy.bucket_width_unit.value, policy.bucket_width_value
+            )
+            cutoff_dt = floor(
+                cutoff_dt, policy.bucket_width_unit.value, policy.bucket_width_value
+            )
+
+        for batch_start_dt, batch_end_dt in _iter_batches(start_dt, cutoff_dt, policy):
+            logger.debug("Time interval: [%s - %s]", batch_start_dt, batch_end_dt)
+
+            if target_ds is not None:
+                logger.debug("Downsampling into %s data", target_ds.name)
+                data_df = tsdio.get_timeseries_buckets_data(
+                    batch_start_dt,
+                    batch_end_dt,
+                    timeseries,
+                    source_ds,
+                    policy.bucket_width_value,
+                    policy.bucket_width_unit.value,
+                    policy.aggregation,
+                    timezone=campaign.timezone,
+                )
+                if policy.aggregation == "count":
+                    # Drop empty buckets
+                    data_df = data_df.where(data_df != 0)
+                tsdio.set_timeseries_data(data_df, target_ds)
+
+            logger.debug("Deleting %s data", source_ds.name)
+            tsdio.delete(batch_start_dt, batch_end_dt, timeseries, source_ds)
+            policy.processed_until = batch_end_dt
+
+            logger.debug("Committing")
+            db.session.commit()
+
+
+@celery.register_task
+class ApplyRetention(BEMServerCoreAsyncTask):
+    TASK_FUNCTION = apply_retention
+    DEFAULT_PARAMETERS = {}
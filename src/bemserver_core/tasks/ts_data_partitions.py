@@ -0,0 +1,20 @@
+"""Timeseries data partitions scheduled task"""
+
+from bemserver_core.celery import BEMServerCoreSystemTask, celery, logger
+from bemserver_core.database import db
+from bemserver_core.model import TimeseriesData
+
+
+@celery.task(name="CreateTimeseriesDataPartitions", base=BEMServerCoreSystemTask)
+def create_ts_data_partitions(months_ahead=3):
+    """Create timeseries data partitions for current and upcoming months
+
+    :param int months_ahead: Number of months to create after current month
+    """
+    logger.info("Create timeseries data partitions")
+
+    created = TimeseriesData.create_upcoming_partitions(months_ahead)
+    logger.debug("Created partitions: %s", created)
+
+    logger.debug("Committing")
+    db.session.commit()
@@ -151,3 +151,23 @@ def make_date_range_around_datetime(
     start_dt = datetime - periods_before * period_offset
     end_dt = datetime + periods_after * period_offset
     return start_dt, end_dt
+
+
+def make_time_windows(start_dt, end_dt, period, period_multiplier=1):
+    """Split time interval into consecutive time windows
+
+    :param datetime start_dt: Timezone aware start datetime
+    :param datetime end_dt: Timezone aware end datetime
+    :param str period: Period in
+        ["second", "minute", "hour", "day", "week", "month", "year"]
+    :param int period_multiplier: Period multiplier.
+
+    Yields (start, end) tuples of timezone aware datetimes. Last window is
+    truncated to end at end_dt.
+    """
+    period_offset = make_date_offset(period, period_multiplier)
+    window_start = start_dt
+    while window_start < end_dt:
+        window_end = min((window_start + period_offset).to_pydatetime(), end_dt)
+        yield window_start, window_end
+        window_start = window_end
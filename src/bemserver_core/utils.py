@@ -1,7 +1,9 @@
 """Utils"""
 
 import functools
+import threading
 import types
+from collections import OrderedDict
 from contextlib import AbstractContextManager
 from pathlib import Path
 
@@ -26,6 +28,44 @@ def make_context_var_manager(context_var):
     return functools.partial(ContextVarManager, context_var)
 
 
+class LRUCache:
+    """Thread-safe least recently used cache
+
+    :param int maxsize: Maximum number of items in cache
+    """
+
+    def __init__(self, maxsize):
+        self._maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                self._data.move_to_end(key)
+            except KeyError:
+                return default
+            return self._data[key]
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self._maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key, default=None):
+        with self._lock:
+            return self._data.pop(key, default)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
 # Adapted from Flask config code
 def get_dict_from_pyfile(file_path):
     """Turn python module into a dict"""
@@ -0,0 +1,107 @@
+"""Timeseries data I/O benchmarks
+
+Benchmarks are skipped unless BEMSERVER_CORE_BENCHMARKS environment variable is
+set. Run with -s to display results::
+
+    BEMSERVER_CORE_BENCHMARKS=1 pytest -s tests/benchmarks
+"""
+
+import os
+import time
+from unittest import mock
+
+import pytest
+
+import numpy as np
+import pandas as pd
+
+from bemserver_core.authorization import CurrentUser, OpenBar
+from bemserver_core.database import db
+from bemserver_core.input_output import tsdcsvio, tsdjsonio
+from bemserver_core.input_output.timeseries_data_io import TimeseriesDataIO
+from bemserver_core.model import TimeseriesDataState
+
+pytestmark = pytest.mark.skipif(
+    not os.environ.get("BEMSERVER_CORE_BENCHMARKS"),
+    reason="BEMSERVER_CORE_BENCHMARKS not set",
+)
+
+NB_TIMESERIES = 10
+
+
+def make_data_df(timeseries, nb_points):
+    """Create a dataframe with nb_points values spread across timeseries"""
+    index = pd.date_range(
+        "2020-01-01",
+        periods=nb_points // len(timeseries),
+        freq="min",
+        tz="UTC",
+        name="Datetime",
+    )
+    rng = np.random.default_rng(42)
+    return pd.DataFrame(
+        rng.random((len(index), len(timeseries))),
+        index=index,
+        columns=[ts.id for ts in timeseries],
+    )
+
+
+def report(name, nb_points, duration):
+    print(
+        f"\n{name}: {nb_points} points in {duration:.2f} s "
+        f"({nb_points / duration:.0f} rows/s)"
+    )
+
+
+class TestTimeseriesDataIOBenchmark:
+    @pytest.mark.parametrize("timeseries", (NB_TIMESERIES,), indirect=True)
+    @pytest.mark.parametrize("nb_points", (10_000, 100_000, 1_000_000, 10_000_000))
+    @pytest.mark.parametrize("use_copy", (False, True))
+    def test_timeseries_data_io_import_csv_benchmark(
+        self, users, timeseries, nb_points, use_copy, record_property
+    ):
+        admin_user = users[0]
+        with OpenBar():
+            ds_1 = TimeseriesDataState.get(name="Raw").first()
+
+        csv_data = make_data_df(timeseries, nb_points).to_csv(
+            date_format="%Y-%m-%dT%H:%M:%S%z"
+        )
+
+        with (
+            CurrentUser(admin_user),
+            mock.patch.object(TimeseriesDataIO, "_use_copy", use_copy),
+        ):
+            start = time.perf_counter()
+            tsdcsvio.import_csv(csv_data, ds_1)
+            db.session.commit()
+            duration = time.perf_counter() - start
+
+        report(f"import_csv (use_copy={use_copy})", nb_points, duration)
+        record_property("rows_per_second", nb_points / duration)
+
+    @pytest.mark.parametrize("timeseries", (NB_TIMESERIES,), indirect=True)
+    @pytest.mark.parametrize("nb_points", (10_000, 100_000, 1_000_000, 10_000_000))
+    @pytest.mark.parametrize("use_copy", (False, True))
+    def test_timeseries_data_io_import_json_benchmark(
+        self, users, timeseries, nb_points, use_copy, record_property
+    ):
+        admin_user = users[0]
+        with OpenBar():
+            ds_1 = TimeseriesDataState.get(name="Raw").first()
+
+        data_df = make_data_df(timeseries, nb_points)
+        data_df.index = data_df.index.map(lambda x: x.isoformat())
+        json_data = data_df.to_json(orient="columns")
+
+        with (
+            CurrentUser(admin_user),
+            mock.patch.object(TimeseriesDataIO, "_use_copy", use_copy),
+        ):
+            start = time.perf_counter()
+            tsdjsonio.import_json(json_data, ds_1)
+            db.session.commit()
+            duration = time.perf_counter() - start
+
+        report(f"import_json (use_copy={use_copy})", nb_points, duration)
+        record_property("rows_per_second", nb_points / duration)
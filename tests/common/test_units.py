@@ -9,6 +9,7 @@ from pandas.testing import assert_frame_equal
 
 from bemserver_core import BEMServerCore
 from bemserver_core.common import ureg
+from bemserver_core.common.units import BEMServerUnitRegistry
 from bemserver_core.exceptions import (
     BEMServerCoreDimensionalityError,
     BEMServerCoreUndefinedUnitError,
@@ -20,11 +21,50 @@ class TestUnits:
         assert "meter" in ureg
 
     def test_ureg_load_definitions(self):
+        unit_registry = BEMServerUnitRegistry(cache_folder=None)
         with mock.patch("pint.UnitRegistry.load_definitions") as load_mock:
-            ureg.load_definitions("dummy_path")
-
-        load_mock.assert_called_once()
-        load_mock.assert_called_with("dummy_path")
+            # Registry is not built yet: file is loaded on first use
+            unit_registry.load_definitions("dummy_path")
+            load_mock.assert_not_called()
+            # (pint also uses load_definitions to load its default definitions)
+            unit_registry.validate_unit("")
+            load_mock.assert_called_with("dummy_path")
+            # Already loaded files are skipped
+            load_mock.reset_mock()
+            unit_registry.load_definitions("dummy_path")
+            load_mock.assert_not_called()
+            # Registry is built: file is loaded immediately
+            unit_registry.load_definitions("dummy_path_2")
+            load_mock.assert_called_once_with("dummy_path_2")
+
+    def test_ureg_lazy_registry(self, tmp_path):
+        unit_registry = BEMServerUnitRegistry(cache_folder=tmp_path)
+        assert unit_registry._registry is None
+        assert not any(tmp_path.iterdir())
+        unit_registry.validate_unit("m")
+        assert unit_registry._registry is not None
+        # Parsed definitions are cached on disk
+        assert any(tmp_path.iterdir())
+
+    def test_ureg_init_core(self, tmp_path):
+        unit_registry = BEMServerUnitRegistry()
+        unit_registry.validate_unit("m")
+        unit_registry.convert(1.0, "km", "m")
+        assert unit_registry._registry is not None
+
+        # Same cache folder: registry and conversion plans are kept
+        bsc = mock.Mock(config={"UNITS_CACHE_FOLDER": None})
+        unit_registry.init_core(bsc)
+        assert unit_registry._registry is not None
+        assert unit_registry._get_conversion_plan.cache_info().currsize == 1
+
+        bsc = mock.Mock(config={"UNITS_CACHE_FOLDER": tmp_path})
+        unit_registry.init_core(bsc)
+        # Registry is rebuilt on next use with new cache folder
+        assert unit_registry._registry is None
+        assert unit_registry._get_conversion_plan.cache_info().currsize == 0
+        unit_registry.validate_unit("m")
+        assert any(tmp_path.iterdir())
 
     def test_ureg_validate_unit(self):
         assert ureg.validate_unit("")
@@ -54,6 +94,35 @@ class TestUnits:
             3000.0,
         ]
 
+    def test_ureg_convert_affine(self):
+        assert ureg.convert(100.0, "degC", "degF") == pytest.approx(212.0)
+        assert list(ureg.convert([0.0, 100.0], "degC", "K")) == pytest.approx(
+            [273.15, 373.15]
+        )
+
+    def test_ureg_conversion_plan_offset_precision(self):
+        unit_registry = BEMServerUnitRegistry(cache_folder=None)
+        assert unit_registry._make_conversion_plan("degC", "K") == (1.0, 273.15)
+        scale, offset = unit_registry._make_conversion_plan("degF", "K")
+        assert scale == pytest.approx(5 / 9, rel=1e-15, abs=0)
+        assert offset == pytest.approx(255.37222222222223, rel=1e-15, abs=0)
+
+    def test_ureg_convert_non_affine(self):
+        assert list(ureg.convert([0.0, 10.0], "dBm", "mW")) == pytest.approx(
+            [1.0, 10.0]
+        )
+
+    def test_ureg_convert_cache(self):
+        unit_registry = BEMServerUnitRegistry(cache_folder=None)
+        unit_registry.convert(1.0, "km", "m")
+        unit_registry.convert([1.0, 2.0], "km", "m")
+        cache_info = unit_registry._get_conversion_plan.cache_info()
+        assert cache_info.misses == 1
+        assert cache_info.hits == 1
+        with mock.patch("pint.UnitRegistry.load_definitions"):
+            unit_registry.load_definitions("dummy_path")
+        assert unit_registry._get_conversion_plan.cache_info().currsize == 0
+
     def test_ureg_convert_undefined_unit(self):
         with pytest.raises(BEMServerCoreUndefinedUnitError):
             ureg.convert(1.0, "dummy", "m")
@@ -69,6 +138,39 @@ class TestUnits:
         ureg.convert_df(data_df, {"id": "km"}, {"id": "m"})
         assert_frame_equal(data_df, (1000.0 * pd.DataFrame({"id": [0, 1, 2]})))
 
+    def test_ureg_convert_df_many_columns(self):
+        data_df = pd.DataFrame(
+            {
+                "km": [0.0, 1.0],
+                "degC": [0.0, 100.0],
+                "dBm": [0.0, 10.0],
+                "m": [0.0, 1.0],
+                "ignored": [0.0, 1.0],
+            }
+        )
+        ureg.convert_df(
+            data_df,
+            {"km": "km", "degC": "degC", "dBm": "dBm", "m": "m"},
+            {"km": "m", "degC": "degF", "dBm": "mW", "m": "m"},
+        )
+        assert_frame_equal(
+            data_df,
+            pd.DataFrame(
+                {
+                    "km": [0.0, 1000.0],
+                    "degC": [32.0, 212.0],
+                    "dBm": [1.0, 10.0],
+                    "m": [0.0, 1.0],
+                    "ignored": [0.0, 1.0],
+                }
+            ),
+        )
+
+    def test_ureg_convert_df_same_unit(self):
+        data_df = pd.DataFrame({"id": [0, 1, 2]})
+        ureg.convert_df(data_df, {"id": "count"}, {"id": "count"})
+        assert_frame_equal(data_df, pd.DataFrame({"id": [0, 1, 2]}))
+
     def test_ureg_convert_df_undefined_unit(self):
         data_df = pd.DataFrame({"id": [0, 1, 2]})
         with pytest.raises(BEMServerCoreUndefinedUnitError):
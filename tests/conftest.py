@@ -23,6 +23,7 @@ def inhibit_celery():
 
 postgresql_proc = ppf.postgresql_proc()
 postgresql = ppf.postgresql("postgresql_proc")
+postgresql_replica = ppf.postgresql("postgresql_proc", dbname="replica")
 
 
 def _get_db_url(postgresql):
@@ -40,6 +41,22 @@ def postgresql_db(postgresql):
     db.session.remove()
 
 
+@pytest.fixture
+def replica_db(postgresql_replica):
+    """Read replica database with tables and initial data only
+
+    Replication is not set up. This database is used to check reads are sent
+    to read replica rather than to primary database.
+    """
+    db_url = _get_db_url(postgresql_replica)
+    db.set_db_url(db_url)
+    setup_db()
+    db.session.remove()
+    db.dispose()
+    yield db_url
+    db.session.remove()
+
+
 @pytest.fixture
 def database(postgresql_db):
     db.set_db_url(postgresql_db)
@@ -981,3 +998,28 @@ def tasks_by_campaigns(bemservercore, campaigns):
         )
         db.session.commit()
     return (tbc_1, tbc_2)
+
+
+@pytest.fixture
+def retention_policies(bemservercore, campaigns):
+    with OpenBar():
+        ds_raw = model.TimeseriesDataState.get(name="Raw").first()
+        ds_clean = model.TimeseriesDataState.get(name="Clean").first()
+        rp_1 = model.RetentionPolicy.new(
+            campaign_id=campaigns[0].id,
+            source_data_state_id=ds_raw.id,
+            target_data_state_id=ds_clean.id,
+            retention_unit=PeriodEnum.day,
+            retention_value=90,
+            bucket_width_unit=PeriodEnum.minute,
+            bucket_width_value=15,
+        )
+        rp_2 = model.RetentionPolicy.new(
+            campaign_id=campaigns[1].id,
+            source_data_state_id=ds_raw.id,
+            retention_unit=PeriodEnum.year,
+            retention_value=1,
+            is_enabled=False,
+        )
+        db.session.commit()
+    return (rp_1, rp_2)
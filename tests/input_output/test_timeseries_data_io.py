@@ -3,6 +3,7 @@
 import datetime as dt
 import json
 import math
+from unittest import mock
 from zoneinfo import ZoneInfo
 
 import pytest
@@ -11,13 +12,17 @@ import numpy as np
 import pandas as pd
 from pandas.testing import assert_frame_equal
 
+import pyarrow as pa
+import pyarrow.parquet
+
 from bemserver_core.authorization import CurrentUser, OpenBar
-from bemserver_core.database import db
+from bemserver_core.database import ReadReplica, db
 from bemserver_core.exceptions import (
     BEMServerAuthorizationError,
     BEMServerCoreDimensionalityError,
     BEMServerCorePeriodError,
     BEMServerCoreUndefinedUnitError,
+    TimeseriesDataArrowIOError,
     TimeseriesDataCSVIOError,
     TimeseriesDataIODatetimeError,
     TimeseriesDataIOInvalidAggregationError,
@@ -26,10 +31,23 @@ from bemserver_core.exceptions import (
     TimeseriesDataJSONIOError,
     TimeseriesNotFoundError,
 )
-from bemserver_core.input_output import tsdcsvio, tsdio, tsdjsonio
+from bemserver_core.input_output import (
+    tsdarrowio,
+    tsdcsvio,
+    tsdio,
+    tsdjsonio,
+    tsdparquetio,
+)
+from bemserver_core.input_output.timeseries_data_io import (
+    AGGREGATION_FUNCTIONS,
+    TimeseriesDataIO,
+    to_utc_index,
+)
 from bemserver_core.model import (
     TimeseriesByDataState,
     TimeseriesData,
+    TimeseriesDataDirtyInterval,
+    TimeseriesDataRollup,
     TimeseriesDataState,
 )
 from tests.utils import create_timeseries_data
@@ -39,8 +57,9 @@ class TestTimeseriesDataIO:
     @pytest.mark.parametrize("campaigns", (2,), indirect=True)
     @pytest.mark.parametrize("timeseries", (3,), indirect=True)
     @pytest.mark.parametrize("for_campaign", (True, False))
+    @pytest.mark.parametrize("use_copy", (True, False))
     def test_timeseries_data_io_set_timeseries_data_as_admin(
-        self, users, campaigns, timeseries, for_campaign
+        self, users, campaigns, timeseries, for_campaign, use_copy
     ):
         admin_user = users[0]
         assert admin_user.is_admin
@@ -74,7 +93,7 @@ class TestTimeseriesDataIO:
         )
 
         with CurrentUser(admin_user):
-            tsdio.set_timeseries_data(data_df, ds_1, campaign)
+            tsdio.set_timeseries_data(data_df, ds_1, campaign, use_copy=use_copy)
 
         # Check TSBDS are correctly auto-created
         tsbds_l = (
@@ -129,6 +148,7 @@ class TestTimeseriesDataIO:
                 data_df,
                 ds_1,
                 campaign,
+                use_copy=use_copy,
                 convert_from={ts_2.name if for_campaign else ts_2.id: "km"},
             )
 
@@ -165,6 +185,7 @@ class TestTimeseriesDataIO:
                     data_df,
                     ds_1,
                     campaign,
+                    use_copy=use_copy,
                     convert_from={ts_2.name if for_campaign else ts_2.id: "dummy"},
                 )
 
@@ -175,6 +196,7 @@ class TestTimeseriesDataIO:
                     data_df,
                     ds_1,
                     campaign,
+                    use_copy=use_copy,
                     convert_from={ts_2.name if for_campaign else ts_2.id: "kW"},
                 )
 
@@ -314,8 +336,9 @@ class TestTimeseriesDataIO:
                 tsdio.set_timeseries_data(data_df, ds_1, campaign)
 
     @pytest.mark.parametrize("for_campaign", (True, False))
+    @pytest.mark.parametrize("use_copy", (True, False))
     def test_timeseries_data_io_import_set_timeseries_data_empty_dataframe(
-        self, users, campaigns, timeseries, for_campaign
+        self, users, campaigns, timeseries, for_campaign, use_copy
     ):
         admin_user = users[0]
         assert admin_user.is_admin
@@ -331,7 +354,7 @@ class TestTimeseriesDataIO:
 
         # Nothing happens. No crash.
         with CurrentUser(admin_user):
-            tsdio.set_timeseries_data(data_df, ds_1, campaign)
+            tsdio.set_timeseries_data(data_df, ds_1, campaign, use_copy=use_copy)
 
         index = pd.DatetimeIndex(["2020-01-01T00:00:00+00:00"]).as_unit("us")
         val_0 = [np.nan]
@@ -344,7 +367,142 @@ class TestTimeseriesDataIO:
 
         # Nothing happens. No crash.
         with CurrentUser(admin_user):
-            tsdio.set_timeseries_data(data_df, ds_1, campaign)
+            tsdio.set_timeseries_data(data_df, ds_1, campaign, use_copy=use_copy)
+
+    @pytest.mark.parametrize("timeseries", (1,), indirect=True)
+    @pytest.mark.parametrize("use_copy", (True, False))
+    def test_timeseries_data_io_set_timeseries_data_timestamps(
+        self, users, timeseries, use_copy, monkeypatch
+    ):
+        """Check timestamps are written exactly, whatever the index timezone"""
+        # Check COPY data is sent by chunks
+        monkeypatch.setattr(
+            "bemserver_core.input_output.timeseries_data_io.COPY_CHUNK_SIZE", 2
+        )
+        admin_user = users[0]
+        assert admin_user.is_admin
+        ts_0 = timeseries[0]
+
+        with OpenBar():
+            ds_1 = TimeseriesDataState.get(name="Raw").first()
+
+        index = pd.DatetimeIndex(
+            [
+                "1969-12-31T23:59:59.999999+00:00",
+                "2020-01-01T00:00:00.000001+01:00",
+                "2020-07-01T12:34:56.789012+02:00",
+            ],
+            name="timestamp",
+            tz="UTC",
+        ).tz_convert("Europe/Paris")
+        data_df = pd.DataFrame({ts_0.id: [0, 1, 2]}, index=index)
+
+        with CurrentUser(admin_user):
+            tsdio.set_timeseries_data(data_df, ds_1, use_copy=use_copy)
+
+        data = (
+            db.session.query(TimeseriesData.timestamp, TimeseriesData.value)
+            .order_by(TimeseriesData.timestamp)
+            .all()
+        )
+        assert data == [
+            (timestamp.to_pydatetime(), float(i)) for i, timestamp in enumerate(index)
+        ]
+
+    @pytest.mark.parametrize(
+        "config", ({"TIMESERIES_DATA_IO_USE_COPY": True},), indirect=True
+    )
+    @pytest.mark.parametrize("timeseries", (1,), indirect=True)
+    def test_timeseries_data_io_set_timeseries_data_use_copy_setting(
+        self, users, timeseries
+    ):
+        admin_user = users[0]
+        assert admin_user.is_admin
+        ts_0 = timeseries[0]
+
+        with OpenBar():
+            ds_1 = TimeseriesDataState.get(name="Raw").first()
+
+        index = pd.DatetimeIndex(
+            [
+                "2020-01-01T00:00:00+00:00",
+                "2020-01-01T01:00:00+00:00",
+            ],
+            name="timestamp",
+        ).as_unit("us")
+        data_df = pd.DataFrame({ts_0.id: [0, 1]}, index=index)
+
+        with CurrentUser(admin_user):
+            with mock.patch.object(
+                TimeseriesDataIO,
+                "_copy_timeseries_data",
+                wraps=TimeseriesDataIO._copy_timeseries_data,
+            ) as copy_mock:
+                tsdio.set_timeseries_data(data_df, ds_1)
+                copy_mock.assert_called_once()
+                # Conflicting rows are ignored, new rows are inserted
+                data_df = pd.DataFrame(
+                    {ts_0.id: [12, 2]}, index=index + pd.Timedelta("1h")
+                )
+                tsdio.set_timeseries_data(data_df, ds_1)
+
+        data = (
+            db.session.query(TimeseriesData.timestamp, TimeseriesData.value)
+            .order_by(TimeseriesData.timestamp)
+            .all()
+        )
+        assert data == [
+            (dt.datetime(2020, 1, 1, i, tzinfo=dt.UTC), float(i)) for i in range(3)
+        ]
+
+    @pytest.mark.parametrize(
+        "config",
+        ({"TIMESERIES_DATA_ROLLUPS": False}, {"TIMESERIES_DATA_ROLLUPS": True}),
+        indirect=True,
+    )
+    @pytest.mark.parametrize("timeseries", (2,), indirect=True)
+    def test_timeseries_data_io_read_replica(self, replica_db, users, timeseries):
+        admin_user = users[0]
+        assert admin_user.is_admin
+        ts_0, ts_1 = timeseries
+
+        with OpenBar():
+            ds_1 = TimeseriesDataState.get(name="Raw").first()
+
+        start_dt = dt.datetime(2020, 1, 1, tzinfo=dt.UTC)
+        end_dt = start_dt + dt.timedelta(hours=3)
+        timestamps = pd.date_range(
+            start=start_dt, end=end_dt, inclusive="left", freq="h", name="timestamp"
+        )
+        create_timeseries_data(ts_0, ds_1, timestamps, [0, 1, 2])
+
+        with CurrentUser(admin_user):
+            data_df = tsdio.get_timeseries_data(start_dt, end_dt, timeseries, ds_1)
+            assert data_df[ts_0.id].tolist() == [0.0, 1.0, 2.0]
+
+            # Read replica database has no data: check reads are sent to replica
+            # in ReadReplica context only
+            db.set_replica_url(replica_db)
+            data_df = tsdio.get_timeseries_data(start_dt, end_dt, timeseries, ds_1)
+            assert data_df[ts_0.id].tolist() == [0.0, 1.0, 2.0]
+            with ReadReplica():
+                data_df = tsdio.get_timeseries_data(start_dt, end_dt, timeseries, ds_1)
+                assert data_df.empty
+                data_df = tsdio.get_timeseries_buckets_data(
+                    start_dt, end_dt, timeseries, ds_1, 1, "hour", "count"
+                )
+                assert (data_df == 0).all(axis=None)
+                data_df = tsdio.get_last(None, None, timeseries, ds_1)
+                assert data_df["value"].isna().all()
+                data_df = tsdio.get_timeseries_stats(timeseries, ds_1)
+                assert (data_df["count"] == 0).all()
+
+            # Reads are sent to primary database outside of ReadReplica context
+            data_df = pd.DataFrame({ts_1.id: [3.0, 4.0, 5.0]}, index=timestamps)
+            tsdio.set_timeseries_data(data_df, ds_1)
+            db.session.commit()
+            data_df = tsdio.get_timeseries_data(start_dt, end_dt, timeseries, ds_1)
+            assert data_df[ts_1.id].tolist() == [3.0, 4.0, 5.0]
 
     @pytest.mark.parametrize("timezone", ("UTC", "Europe/Paris"))
     @pytest.mark.parametrize("timeseries", (5,), indirect=True)
@@ -912,6 +1070,50 @@ class TestTimeseriesDataIO:
         expected_data_df.columns.name = col_label
         assert_frame_equal(data_df, expected_data_df)
 
+    @pytest.mark.parametrize("timeseries", (3,), indirect=True)
+    @pytest.mark.parametrize("chunk_size", (1, 2, 100))
+    def test_timeseries_data_io_iter_timeseries_data_as_admin(
+        self, users, timeseries, chunk_size
+    ):
+        admin_user = users[0]
+        assert admin_user.is_admin
+        ts_0, ts_1, ts_2 = timeseries
+
+        with OpenBar():
+            ds_1 = TimeseriesDataState.get(name="Raw").first()
+
+        start_dt = dt.datetime(2020, 1, 1, tzinfo=dt.UTC)
+        end_dt = start_dt + dt.timedelta(hours=3)
+
+        timestamps = pd.date_range(
+            start=start_dt, end=end_dt, inclusive="left", freq="h"
+        )
+        create_timeseries_data(ts_0, ds_1, timestamps, range(3))
+        create_timeseries_data(ts_2, ds_1, timestamps[:2], [10, 12])
+
+        ts_l = (ts_0, ts_1, ts_2)
+
+        with CurrentUser(admin_user):
+            expected = tsdio.get_timeseries_data(start_dt, end_dt, ts_l, ds_1)
+            chunks = list(
+                tsdio.iter_timeseries_data(
+                    start_dt, end_dt, ts_l, ds_1, chunk_size=chunk_size
+                )
+            )
+            # Values of a given timestamp are never split across chunks
+            assert len(chunks) == (3 if chunk_size < 5 else 2)
+            assert_frame_equal(pd.concat(chunks), expected, check_freq=False)
+
+            # No data
+            chunks = list(
+                tsdio.iter_timeseries_data(
+                    end_dt, None, ts_l, ds_1, chunk_size=chunk_size
+                )
+            )
+            assert len(chunks) == 1
+            assert chunks[0].empty
+            assert list(chunks[0].columns) == [ts.id for ts in ts_l]
+
     @pytest.mark.parametrize("timeseries", (5,), indirect=True)
     @pytest.mark.parametrize("agg", ("avg", "min", "max", "count"))
     @pytest.mark.parametrize("col_label", ("id", "name"))
@@ -1669,6 +1871,147 @@ class TestTimeseriesDataIO:
             expected_data_df.columns.name = "name"
             assert_frame_equal(data_df, expected_data_df)
 
+    def test_timeseries_data_io_get_timeseries_buckets_data_fixed_size_avg_as_admin(
+        self, users, timeseries
+    ):
+        """Check N x unit buckets average raw values, not 1 x unit averages"""
+        admin_user = users[0]
+        assert admin_user.is_admin
+        ts_0 = timeseries[0]
+
+        with OpenBar():
+            ds_1 = TimeseriesDataState.get(name="Raw").first()
+
+        start_dt = dt.datetime(2020, 1, 1, tzinfo=dt.UTC)
+        end_dt = start_dt + dt.timedelta(hours=4)
+
+        # 2 values in first hour, 1 value in second hour, no value after
+        timestamps = pd.DatetimeIndex(
+            [
+                start_dt,
+                start_dt + dt.timedelta(minutes=30),
+                start_dt + dt.timedelta(hours=1),
+            ]
+        )
+        create_timeseries_data(ts_0, ds_1, timestamps, [0, 2, 10])
+
+        with CurrentUser(admin_user):
+            data_df = tsdio.get_timeseries_buckets_data(
+                start_dt, end_dt, (ts_0,), ds_1, 2, "hour"
+            )
+            index = pd.DatetimeIndex(
+                ["2020-01-01T00:00:00", "2020-01-01T02:00:00"],
+                name="timestamp",
+                tz="UTC",
+                freq="2h",
+            ).as_unit("us")
+            expected_data_df = pd.DataFrame({ts_0.id: [4.0, np.nan]}, index=index)
+            expected_data_df.columns.name = "id"
+            assert_frame_equal(data_df, expected_data_df)
+
+            # Buckets are aligned on start in local TZ
+            data_df = tsdio.get_timeseries_buckets_data(
+                start_dt,
+                end_dt,
+                (ts_0,),
+                ds_1,
+                2,
+                "hour",
+                "count",
+                timezone="Asia/Kolkata",
+            )
+            index = pd.DatetimeIndex(
+                ["2020-01-01T04:00:00", "2020-01-01T06:00:00", "2020-01-01T08:00:00"],
+                name="timestamp",
+                tz=ZoneInfo("Asia/Kolkata"),
+                freq="2h",
+            ).as_unit("us")
+            # 00:00 UTC is in first bucket, 00:30 and 01:00 UTC in second bucket
+            expected_data_df = pd.DataFrame({ts_0.id: [1, 2, 0]}, index=index)
+            expected_data_df.columns.name = "id"
+            assert_frame_equal(data_df, expected_data_df)
+
+    @pytest.mark.parametrize(
+        "config", ({"TIMESERIES_DATA_ROLLUPS": True},), indirect=True
+    )
+    @pytest.mark.parametrize("timeseries", (2,), indirect=True)
+    def test_timeseries_data_io_get_timeseries_buckets_data_rollups_as_admin(
+        self, users, timeseries
+    ):
+        """Check buckets computed from rollups match buckets from raw data"""
+        admin_user = users[0]
+        assert admin_user.is_admin
+        ts_0, ts_1 = timeseries
+
+        with OpenBar():
+            ds_1 = TimeseriesDataState.get(name="Raw").first()
+
+        start_dt = dt.datetime(2020, 1, 1, tzinfo=dt.UTC)
+        end_dt = dt.datetime(2020, 3, 15, tzinfo=dt.UTC)
+        index = pd.date_range(
+            start_dt, end_dt, freq="17min", inclusive="left", name="timestamp"
+        )
+        rng = np.random.default_rng(42)
+        values_0 = rng.normal(size=len(index))
+        values_1 = rng.normal(size=len(index))
+        values_1[rng.random(len(index)) < 0.3] = np.nan
+        data_df = pd.DataFrame({ts_0.id: values_0, ts_1.id: values_1}, index=index)
+
+        def check_buckets():
+            for bucket_width_value, bucket_width_unit in (
+                (1, "hour"),
+                (3, "hour"),
+                (1, "day"),
+                (1, "week"),
+                (1, "month"),
+            ):
+                for timezone in ("UTC", "Europe/Paris", "Asia/Kolkata"):
+                    for aggregation in AGGREGATION_FUNCTIONS:
+                        args = (
+                            start_dt + dt.timedelta(minutes=90),
+                            end_dt,
+                            (ts_0, ts_1),
+                            ds_1,
+                            bucket_width_value,
+                            bucket_width_unit,
+                            aggregation,
+                        )
+                        data_df = tsdio.get_timeseries_buckets_data(
+                            *args, timezone=timezone
+                        )
+                        with mock.patch.object(TimeseriesDataIO, "_use_rollups", False):
+                            expected_data_df = tsdio.get_timeseries_buckets_data(
+                                *args, timezone=timezone
+                            )
+                        assert_frame_equal(data_df, expected_data_df)
+
+        with CurrentUser(admin_user):
+            tsdio.set_timeseries_data(data_df, ds_1)
+
+            # Rollups not refreshed: data is read from raw data
+            check_buckets()
+            # Reads don't refresh rollups
+            assert db.session.query(TimeseriesDataDirtyInterval).count()
+            assert not db.session.query(TimeseriesDataRollup).count()
+
+            TimeseriesDataRollup.refresh()
+            assert not db.session.query(TimeseriesDataDirtyInterval).count()
+            check_buckets()
+
+            # Add data: rollups of modified periods are read from raw data
+            new_index = pd.date_range(
+                dt.datetime(2020, 2, 10, 0, 5, tzinfo=dt.UTC),
+                dt.datetime(2020, 2, 12, 6, 5, tzinfo=dt.UTC),
+                freq="2h",
+                name="timestamp",
+            )
+            new_data_df = pd.DataFrame(
+                {ts_0.id: rng.normal(100, size=len(new_index))}, index=new_index
+            )
+            tsdio.set_timeseries_data(new_data_df, ds_1)
+            assert db.session.query(TimeseriesDataDirtyInterval).count()
+            check_buckets()
+
     @pytest.mark.parametrize("timeseries", (5,), indirect=True)
     def test_timeseries_data_io_get_timeseries_buckets_data_variable_size_as_admin(
         self, users, timeseries
@@ -2200,6 +2543,59 @@ class TestTimeseriesDataIO:
             )
 
 
+class TestToUTCIndex:
+    @pytest.mark.parametrize(
+        "index",
+        (
+            # Common offset (fast path)
+            [
+                "2020-01-01T01:00:00+01:00",
+                "2020-01-01T02:00:00+01:00",
+            ],
+            # Mixed offsets (slow path)
+            [
+                "2020-01-01T00:00:00+00:00",
+                "2020-01-01T02:00:00+01:00",
+            ],
+            ["2020-01-01T00:00:00Z", "2020-01-01T01:00:00Z"],
+        ),
+    )
+    def test_to_utc_index(self, index):
+        expected = pd.DatetimeIndex(
+            [
+                dt.datetime(2020, 1, 1, 0, tzinfo=dt.UTC),
+                dt.datetime(2020, 1, 1, 1, tzinfo=dt.UTC),
+            ],
+            name="timestamp",
+        ).as_unit("us")
+        ret = to_utc_index(pd.Index(index))
+        assert ret.equals(expected)
+        assert ret.dtype == expected.dtype
+        assert ret.name == "timestamp"
+
+    def test_to_utc_index_empty(self):
+        ret = to_utc_index(pd.Index([], dtype=object))
+        assert ret.empty
+        assert ret.dtype == "datetime64[us, UTC]"
+
+    @pytest.mark.parametrize(
+        "index",
+        (
+            # TZ-naive (fast path)
+            ["2020-01-01T00:00:00", "2020-01-01T01:00:00"],
+            # Mixed naive and aware (slow path)
+            ["2020-01-01T00:00:00+00:00", "2020-01-01T01:00:00"],
+            # Invalid
+            ["2020-01-01T00:00:00+00:00", "dummy"],
+            ["10000-01-01T00:00:00+00:00"],
+            [0],
+        ),
+    )
+    def test_to_utc_index_error(self, index):
+        with pytest.raises(TimeseriesDataIODatetimeError):
+            to_utc_index(pd.Index(index))
+
+
 class TestTimeseriesDataCSVIO:
     @pytest.mark.parametrize("campaigns", (2,), indirect=True)
     @pytest.mark.parametrize("timeseries", (3,), indirect=True)
@@ -2595,6 +2991,89 @@ class TestTimeseriesDataCSVIO:
                 "2020-01-01T02:00:00+0000,2.0,\n"
             )
 
+    @pytest.mark.parametrize("timeseries", (5,), indirect=True)
+    @pytest.mark.parametrize("col_label", ("id", "name"))
+    @pytest.mark.parametrize("chunk_size", (1, 100))
+    def test_timeseries_data_io_iter_export_csv_as_admin(
+        self, users, timeseries, col_label, chunk_size
+    ):
+        admin_user = users[0]
+        assert admin_user.is_admin
+        ts_0 = timeseries[0]
+        ts_2 = timeseries[2]
+        ts_4 = timeseries[4]
+
+        with OpenBar():
+            ds_1 = TimeseriesDataState.get(name="Raw").first()
+            ts_0.unit_symbol = "meter"
+
+        start_dt = dt.datetime(2020, 1, 1, tzinfo=dt.UTC)
+        end_dt = start_dt + dt.timedelta(hours=3)
+
+        timestamps = pd.date_range(
+            start=start_dt, end=end_dt, inclusive="left", freq="h"
+        )
+        values_1 = range(3)
+        create_timeseries_data(ts_0, ds_1, timestamps, values_1)
+        values_2 = [10 + 2 * i for i in range(2)]
+        create_timeseries_data(ts_4, ds_1, timestamps[:2], values_2)
+
+        ts_l = (ts_0, ts_2, ts_4)
+
+        with CurrentUser(admin_user):
+            for kwargs in (
+                {},
+                {"timezone": "Europe/Paris"},
+                {"convert_to": {getattr(ts_0, col_label): "mm"}},
+            ):
+                fragments = list(
+                    tsdcsvio.iter_export_csv(
+                        start_dt,
+                        end_dt,
+                        ts_l,
+                        ds_1,
+                        col_label=col_label,
+                        chunk_size=chunk_size,
+                        **kwargs,
+                    )
+                )
+                assert len(fragments) == (3 if chunk_size == 1 else 2)
+                assert "".join(fragments) == tsdcsvio.export_csv(
+                    start_dt, end_dt, ts_l, ds_1, col_label=col_label, **kwargs
+                )
+
+            # No data
+            data = "".join(
+                tsdcsvio.iter_export_csv(end_dt, None, ts_l, ds_1, col_label=col_label)
+            )
+            assert data == tsdcsvio.export_csv(
+                end_dt, None, ts_l, ds_1, col_label=col_label
+            )
+
+    @pytest.mark.parametrize("campaigns", (2,), indirect=True)
+    @pytest.mark.parametrize("timeseries", (5,), indirect=True)
+    @pytest.mark.usefixtures("users_by_user_groups")
+    @pytest.mark.usefixtures("user_groups_by_campaigns")
+    @pytest.mark.usefixtures("user_groups_by_campaign_scopes")
+    def test_timeseries_data_io_iter_export_csv_as_user(self, users, timeseries):
+        user_1 = users[1]
+        assert not user_1.is_admin
+        ts_0 = timeseries[0]
+        ts_1 = timeseries[1]
+
+        with OpenBar():
+            ds_1 = TimeseriesDataState.get(name="Raw").first()
+
+        start_dt = dt.datetime(2020, 1, 1, tzinfo=dt.UTC)
+        end_dt = start_dt + dt.timedelta(hours=3)
+
+        with CurrentUser(user_1):
+            # Permissions are checked before iterating
+            with pytest.raises(BEMServerAuthorizationError):
+                tsdcsvio.iter_export_csv(start_dt, end_dt, (ts_0,), ds_1)
+            data = "".join(tsdcsvio.iter_export_csv(start_dt, end_dt, (ts_1,), ds_1))
+            assert data == f"Datetime,{ts_1.id}\n"
+
     @pytest.mark.parametrize("timeseries", (5,), indirect=True)
     @pytest.mark.parametrize("col_label", ("id", "name"))
     def test_timeseries_data_io_export_csv_bucket_as_admin(
@@ -3228,6 +3707,99 @@ class TestTimeseriesDataJSONIO:
             }
             assert json.loads(data) == expected
 
+    @pytest.mark.parametrize("timeseries", (5,), indirect=True)
+    @pytest.mark.parametrize("col_label", ("id", "name"))
+    @pytest.mark.parametrize("chunk_size", (1, 100))
+    def test_timeseries_data_io_iter_export_json_as_admin(
+        self, users, timeseries, col_label, chunk_size
+    ):
+        admin_user = users[0]
+        assert admin_user.is_admin
+        ts_0 = timeseries[0]
+        ts_2 = timeseries[2]
+        ts_4 = timeseries[4]
+
+        with OpenBar():
+            ds_1 = TimeseriesDataState.get(name="Raw").first()
+            ts_0.unit_symbol = "meter"
+
+        start_dt = dt.datetime(2020, 1, 1, tzinfo=dt.UTC)
+        end_dt = start_dt + dt.timedelta(hours=3)
+
+        timestamps = pd.date_range(
+            start=start_dt, end=end_dt, inclusive="left", freq="h"
+        )
+        values_1 = range(3)
+        create_timeseries_data(ts_0, ds_1, timestamps, values_1)
+        values_2 = [10 + 2 * i for i in range(2)]
+        create_timeseries_data(ts_4, ds_1, timestamps[:2], values_2)
+
+        ts_l = (ts_0, ts_2, ts_4)
+
+        with CurrentUser(admin_user):
+            for kwargs in (
+                {},
+                {"timezone": "Europe/Paris"},
+                {"convert_to": {getattr(ts_0, col_label): "mm"}},
+            ):
+                data = "".join(
+                    tsdjsonio.iter_export_json(
+                        start_dt,
+                        end_dt,
+                        ts_l,
+                        ds_1,
+                        col_label=col_label,
+                        chunk_size=chunk_size,
+                        **kwargs,
+                    )
+                )
+                assert data == tsdjsonio.export_json(
+                    start_dt, end_dt, ts_l, ds_1, col_label=col_label, **kwargs
+                )
+
+            # No data
+            data = "".join(
+                tsdjsonio.iter_export_json(
+                    end_dt, None, ts_l, ds_1, col_label=col_label
+                )
+            )
+            assert data == "{}"
+
+    @pytest.mark.parametrize("campaigns", (2,), indirect=True)
+    @pytest.mark.parametrize("timeseries", (5,), indirect=True)
+    @pytest.mark.usefixtures("users_by_user_groups")
+    @pytest.mark.usefixtures("user_groups_by_campaigns")
+    @pytest.mark.usefixtures("user_groups_by_campaign_scopes")
+    def test_timeseries_data_io_iter_export_json_as_user(self, users, timeseries):
+        user_1 = users[1]
+        assert not user_1.is_admin
+        ts_0 = timeseries[0]
+        ts_1 = timeseries[1]
+
+        with OpenBar():
+            ds_1 = TimeseriesDataState.get(name="Raw").first()
+
+        start_dt = dt.datetime(2020, 1, 1, tzinfo=dt.UTC)
+        end_dt = start_dt + dt.timedelta(hours=3)
+
+        with CurrentUser(user_1):
+            # Permissions are checked before iterating
+            with pytest.raises(BEMServerAuthorizationError):
+                tsdjsonio.iter_export_json(start_dt, end_dt, (ts_1, ts_0), ds_1)
+            data = "".join(tsdjsonio.iter_export_json(start_dt, end_dt, (ts_1,), ds_1))
+            assert data == "{}"
+
+        # Iterator may be consumed out of user context (e.g. streamed response)
+        timestamps = pd.date_range(
+            start=start_dt, end=end_dt, inclusive="left", freq="h"
+        )
+        create_timeseries_data(ts_1, ds_1, timestamps, range(3))
+        with CurrentUser(user_1):
+            data_iter = tsdjsonio.iter_export_json(start_dt, end_dt, (ts_1,), ds_1)
+        assert json.loads("".join(data_iter)) == {
+            str(ts_1.id): {ts.isoformat(): float(i) for i, ts in enumerate(timestamps)}
+        }
+
     @pytest.mark.parametrize("timeseries", (5,), indirect=True)
     @pytest.mark.parametrize("col_label", ("id", "name"))
     def test_timeseries_data_io_export_json_bucket_as_admin(
@@ -3518,3 +4090,245 @@ class TestTimeseriesDataJSONIO:
                 },
             }
             assert json.loads(data) == expected
+
+
+def read_arrow(fmt, data):
+    if fmt == "parquet":
+        return pa.parquet.read_table(pa.py_buffer(data))
+    return pa.ipc.open_file(data).read_all()
+
+
+def write_arrow(fmt, table):
+    sink = pa.BufferOutputStream()
+    if fmt == "parquet":
+        pa.parquet.write_table(table, sink)
+    else:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+ARROW_IO = {"arrow": tsdarrowio, "parquet": tsdparquetio}
+
+
+@pytest.mark.parametrize("fmt", ("arrow", "parquet"))
+class TestTimeseriesDataArrowIO:
+    @pytest.mark.parametrize("campaigns", (2,), indirect=True)
+    @pytest.mark.parametrize("timeseries", (3,), indirect=True)
+    @pytest.mark.parametrize("col_label", ("id", "name"))
+    def test_timeseries_data_io_arrow_round_trip_as_admin(
+        self, users, campaigns, timeseries, col_label, fmt
+    ):
+        admin_user = users[0]
+        assert admin_user.is_admin
+        ts_0 = timeseries[0]
+        ts_2 = timeseries[2]
+        campaign = campaigns[0] if col_label == "name" else None
+        io = ARROW_IO[fmt]
+
+        with OpenBar():
+            ds_1 = TimeseriesDataState.get(name="Raw").first()
+            ds_2 = TimeseriesDataState.get(name="Clean").first()
+
+        start_dt = dt.datetime(2020, 1, 1, tzinfo=dt.UTC)
+        end_dt = start_dt + dt.timedelta(hours=3)
+
+        timestamps = pd.date_range(
+            start=start_dt, end=end_dt, inclusive="left", freq="h"
+        )
+        create_timeseries_data(ts_0, ds_1, timestamps, range(3))
+        create_timeseries_data(ts_2, ds_1, timestamps[:2], [10, 12])
+
+        ts_l = (ts_0, ts_2)
+
+        with CurrentUser(admin_user):
+            data = getattr(io, f"export_{fmt}")(
+                start_dt,
+                end_dt,
+                ts_l,
+                ds_1,
+                timezone="Europe/Paris",
+                col_label=col_label,
+            )
+            table = read_arrow(fmt, data)
+            assert table.column_names == [
+                "Datetime",
+                *(str(getattr(ts, col_label)) for ts in ts_l),
+            ]
+            assert table.schema.field("Datetime").type == pa.timestamp(
+                "us", tz="Europe/Paris"
+            )
+            assert table.column(1).to_pylist() == [0.0, 1.0, 2.0]
+            assert table.column(2).to_pylist() == [10.0, 12.0, None]
+
+            getattr(io, f"import_{fmt}")(data, ds_2, campaign)
+            assert_frame_equal(
+                tsdio.get_timeseries_data(start_dt, end_dt, ts_l, ds_2),
+                tsdio.get_timeseries_data(start_dt, end_dt, ts_l, ds_1),
+            )
+
+            # No data
+            data = getattr(io, f"export_{fmt}")(
+                end_dt, None, ts_l, ds_1, col_label=col_label
+            )
+            table = read_arrow(fmt, data)
+            assert table.num_rows == 0
+            assert len(table.column_names) == 3
+
+    @pytest.mark.parametrize("timeseries", (3,), indirect=True)
+    def test_timeseries_data_io_export_arrow_convert_as_admin(
+        self, users, timeseries, fmt
+    ):
+        admin_user = users[0]
+        assert admin_user.is_admin
+        ts_0 = timeseries[0]
+        ts_1 = timeseries[1]
+        ts_2 = timeseries[2]
+        io = ARROW_IO[fmt]
+
+        with OpenBar():
+            ds_1 = TimeseriesDataState.get(name="Raw").first()
+            ts_0.unit_symbol = "meter"
+            ts_1.unit_symbol = "°C"
+
+        start_dt = dt.datetime(2020, 1, 1, tzinfo=dt.UTC)
+        end_dt = start_dt + dt.timedelta(hours=3)
+
+        timestamps = pd.date_range(
+            start=start_dt, end=end_dt, inclusive="left", freq="h"
+        )
+        create_timeseries_data(ts_0, ds_1, timestamps, [0.0, None, 2.0])
+        create_timeseries_data(ts_1, ds_1, timestamps[1:], [10.0, 20.0])
+
+        # Timeseries without data and timeseries order are preserved
+        ts_l = (ts_2, ts_1, ts_0)
+
+        with CurrentUser(admin_user):
+            data = getattr(io, f"export_{fmt}")(
+                start_dt,
+                end_dt,
+                ts_l,
+                ds_1,
+                convert_to={ts_0.id: "mm", ts_1.id: "K"},
+            )
+            table = read_arrow(fmt, data)
+            assert table.column_names == ["Datetime", *(str(ts.id) for ts in ts_l)]
+            assert table.column("Datetime").to_pylist() == list(timestamps)
+            assert table.column(1).to_pylist() == [None, None, None]
+            assert table.column(2).to_pylist() == pytest.approx([None, 283.15, 293.15])
+            assert table.column(3).to_pylist() == [0.0, None, 2000.0]
+
+    @pytest.mark.parametrize("timeseries", (3,), indirect=True)
+    def test_timeseries_data_io_export_arrow_bucket_as_admin(
+        self, users, timeseries, fmt
+    ):
+        admin_user = users[0]
+        assert admin_user.is_admin
+        ts_0 = timeseries[0]
+        io = ARROW_IO[fmt]
+
+        with OpenBar():
+            ds_1 = TimeseriesDataState.get(name="Raw").first()
+
+        start_dt = dt.datetime(2020, 1, 1, tzinfo=dt.UTC)
+        end_dt = start_dt + dt.timedelta(hours=24 * 2)
+
+        timestamps = pd.date_range(
+            start=start_dt, end=end_dt, inclusive="left", freq="h"
+        )
+        create_timeseries_data(ts_0, ds_1, timestamps, range(24 * 2))
+
+        with CurrentUser(admin_user):
+            data = getattr(io, f"export_{fmt}_bucket")(
+                start_dt, end_dt, (ts_0,), ds_1, 1, "day", "sum"
+            )
+            table = read_arrow(fmt, data)
+            assert table.column("Datetime").to_pylist() == [
+                start_dt,
+                start_dt + dt.timedelta(days=1),
+            ]
+            assert table.column(str(ts_0.id)).to_pylist() == [276.0, 852.0]
+
+    @pytest.mark.parametrize("campaigns", (2,), indirect=True)
+    @pytest.mark.parametrize("timeseries", (5,), indirect=True)
+    @pytest.mark.usefixtures("users_by_user_groups")
+    @pytest.mark.usefixtures("user_groups_by_campaigns")
+    @pytest.mark.usefixtures("user_groups_by_campaign_scopes")
+    def test_timeseries_data_io_arrow_as_user(self, users, timeseries, fmt):
+        user_1 = users[1]
+        assert not user_1.is_admin
+        ts_0 = timeseries[0]
+        ts_1 = timeseries[1]
+        io = ARROW_IO[fmt]
+
+        with OpenBar():
+            ds_1 = TimeseriesDataState.get(name="Raw").first()
+
+        start_dt = dt.datetime(2020, 1, 1, tzinfo=dt.UTC)
+        end_dt = start_dt + dt.timedelta(hours=3)
+
+        table = pa.table(
+            {
+                "Datetime": pa.array([start_dt], pa.timestamp("us", tz="UTC")),
+                str(ts_0.id): [0.0],
+            }
+        )
+        data = write_arrow(fmt, table)
+
+        with CurrentUser(user_1):
+            with pytest.raises(BEMServerAuthorizationError):
+                getattr(io, f"export_{fmt}")(start_dt, end_dt, (ts_0,), ds_1)
+            with pytest.raises(BEMServerAuthorizationError):
+                getattr(io, f"import_{fmt}")(data, ds_1)
+            getattr(io, f"export_{fmt}")(start_dt, end_dt, (ts_1,), ds_1)
+
+    @pytest.mark.parametrize(
+        "table_error",
+        (
+            # Missing Datetime column
+            ({"Time": pa.array([dt.datetime(2020, 1, 1, tzinfo=dt.UTC)])}, None),
+            # TZ-naive timestamps
+            (
+                {"Datetime": pa.array([dt.datetime(2020, 1, 1)]), "1": [0.0]},
+                TimeseriesDataIODatetimeError,
+            ),
+            # Wrong Datetime type
+            (
+                {"Datetime": ["2020-01-01T00:00:00+00:00"], "1": [0.0]},
+                TimeseriesDataIODatetimeError,
+            ),
+            # Invalid values
+            (
+                {
+                    "Datetime": pa.array([dt.datetime(2020, 1, 1, tzinfo=dt.UTC)]),
+                    "1": ["dummy"],
+                },
+                None,
+            ),
+            # Empty timeseries name
+            (
+                {
+                    "Datetime": pa.array([dt.datetime(2020, 1, 1, tzinfo=dt.UTC)]),
+                    "": [0.0],
+                },
+                None,
+            ),
+        ),
+    )
+    def test_timeseries_data_io_import_arrow_error(self, users, table_error, fmt):
+        admin_user = users[0]
+        assert admin_user.is_admin
+        table, error = table_error
+        io = ARROW_IO[fmt]
+
+        with OpenBar():
+            ds_1 = TimeseriesDataState.get(name="Raw").first()
+
+        data = write_arrow(fmt, pa.table(table))
+
+        with CurrentUser(admin_user):
+            with pytest.raises(error or TimeseriesDataArrowIOError):
+                getattr(io, f"import_{fmt}")(data, ds_1)
+            # Not an Arrow file
+            with pytest.raises(TimeseriesDataArrowIOError):
+                getattr(io, f"import_{fmt}")(b"Datetime,1\n", ds_1)
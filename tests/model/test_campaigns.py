@@ -4,7 +4,11 @@ import pytest
 
 import sqlalchemy as sqla
 
-from bemserver_core.authorization import CurrentUser
+from bemserver_core.authorization import (
+    CurrentUser,
+    OpenBar,
+    get_current_user_cache,
+)
 from bemserver_core.database import db
 from bemserver_core.exceptions import BEMServerAuthorizationError
 from bemserver_core.model import (
@@ -16,6 +20,7 @@ from bemserver_core.model import (
     Space,
     Storey,
     Timeseries,
+    UserByUserGroup,
     UserGroupByCampaign,
     UserGroupByCampaignScope,
     Zone,
@@ -264,6 +269,58 @@ class TestCampaignScopeModel:
             with pytest.raises(BEMServerAuthorizationError):
                 campaign_scope.delete()
 
+    @pytest.mark.usefixtures("users_by_user_groups")
+    @pytest.mark.usefixtures("user_groups_by_campaign_scopes")
+    def test_campaign_scope_is_member_of_all(self, users, campaign_scopes):
+        user_1 = users[1]
+        cs_1, cs_2, cs_3 = campaign_scopes
+
+        with OpenBar():
+            assert CampaignScope.is_member_of_all(user_1, [cs_2.id])
+            assert CampaignScope.is_member_of_all(user_1, [cs_2.id, cs_3.id, cs_2.id])
+            assert not CampaignScope.is_member_of_all(user_1, [cs_1.id])
+            assert not CampaignScope.is_member_of_all(user_1, [cs_1.id, cs_2.id])
+
+    @pytest.mark.usefixtures("users_by_user_groups")
+    def test_campaign_scope_is_member_memoized(
+        self, users, user_groups, campaign_scopes, user_groups_by_campaign_scopes
+    ):
+        user_1 = users[1]
+        user_group_1 = user_groups[0]
+        cs_1, cs_2, cs_3 = campaign_scopes
+        ugbcs_3 = user_groups_by_campaign_scopes[2]
+
+        with CurrentUser(user_1):
+            assert not cs_1.is_member(user_1)
+            assert cs_2.is_member(user_1)
+            assert CampaignScope.is_member_of_all(user_1, [cs_2.id, cs_3.id])
+            cache = get_current_user_cache(user_1)
+            assert cache == {("member_ids", "campaign_scope_id"): {cs_2.id, cs_3.id}}
+
+            # Cache is invalidated when memberships are modified
+            with OpenBar():
+                ubug = UserByUserGroup.new(
+                    user_id=user_1.id,
+                    user_group_id=user_group_1.id,
+                )
+                assert cache == {}
+                db.session.commit()
+            assert cs_1.is_member(user_1)
+            assert CampaignScope.is_member_of_all(user_1, [cs_1.id, cs_2.id])
+            assert cache
+
+            with OpenBar():
+                ubug.delete()
+                ugbcs_3.delete()
+                db.session.commit()
+            assert cache == {}
+            assert not cs_1.is_member(user_1)
+            assert not cs_3.is_member(user_1)
+            assert cs_2.is_member(user_1)
+
+            # Cache is not used for other users
+            assert cs_1.is_member(users[0])
+
 
 class TestUserGroupByCampaignScopeModel:
     @pytest.mark.usefixtures("users_by_user_groups")
@@ -555,8 +555,9 @@ class TestEventModel:
             level=EventLevelEnum.INFO,
             source="src",
         )
-        event_i.notify(dt.datetime.now())
+        notif_ids = event_i.notify(dt.datetime.now())
         notifs = list(Notification.get())
+        assert notif_ids == [notifs[0].id]
         assert len(notifs) == 1
         assert notifs[0].user_id == user_0.id
         assert notifs[0].event_id == event_i.id
@@ -712,6 +713,55 @@ class TestTimeseriesByEventModel:
             tbe_1.delete()
             db.session.flush()
 
+    @pytest.mark.parametrize("timeseries", (4,), indirect=True)
+    def test_timeseries_by_event_get_last_category_for_many_timeseries(
+        self, users, timeseries, campaign_scopes, event_categories
+    ):
+        admin_user = users[0]
+        assert admin_user.is_admin
+
+        ts_1 = timeseries[0]
+        ts_2 = timeseries[1]
+        ts_4 = timeseries[3]
+        cs_1 = campaign_scopes[0]
+        ec_1 = event_categories[0]
+        ec_2 = event_categories[1]
+
+        with CurrentUser(admin_user):
+            event_1 = Event.new(
+                campaign_scope_id=cs_1.id,
+                timestamp=dt.datetime(2020, 1, 1, tzinfo=dt.UTC),
+                category_id=ec_1.id,
+                level=EventLevelEnum.WARNING,
+                source="src",
+            )
+            event_2 = Event.new(
+                campaign_scope_id=cs_1.id,
+                timestamp=dt.datetime(2020, 1, 2, tzinfo=dt.UTC),
+                category_id=ec_2.id,
+                level=EventLevelEnum.INFO,
+                source="src",
+            )
+            db.session.flush()
+            TimeseriesByEvent.new(timeseries_id=ts_1.id, event_id=event_1.id)
+            TimeseriesByEvent.new(timeseries_id=ts_4.id, event_id=event_1.id)
+            TimeseriesByEvent.new(timeseries_id=ts_1.id, event_id=event_2.id)
+            db.session.flush()
+
+            ts_ids = [ts_1.id, ts_2.id, ts_4.id]
+            assert TimeseriesByEvent.get_last_category_for_many_timeseries(
+                ts_ids, [ec_1.id, ec_2.id]
+            ) == {ts_1.id: ec_2.id, ts_4.id: ec_1.id}
+            assert TimeseriesByEvent.get_last_category_for_many_timeseries(
+                ts_ids, [ec_1.id]
+            ) == {ts_1.id: ec_1.id, ts_4.id: ec_1.id}
+            assert (
+                TimeseriesByEvent.get_last_category_for_many_timeseries(
+                    [ts_2.id], [ec_1.id, ec_2.id]
+                )
+                == {}
+            )
+
     @pytest.mark.usefixtures("users_by_user_groups")
     @pytest.mark.usefixtures("user_groups_by_campaigns")
     @pytest.mark.usefixtures("user_groups_by_campaign_scopes")
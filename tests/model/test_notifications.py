@@ -1,6 +1,7 @@
 """Notification tests"""
 
 import datetime as dt
+import smtplib
 from email.message import EmailMessage
 from unittest import mock
 
@@ -15,7 +16,10 @@ from bemserver_core.exceptions import (
     BEMServerCoreTaskError,
 )
 from bemserver_core.model import Event, EventLevelEnum, Notification
-from bemserver_core.model.notifications import send_notification_email
+from bemserver_core.model.notifications import (
+    send_notification_email,
+    send_notification_email_digest,
+)
 
 DUMMY_ID = 69
 
@@ -379,21 +383,22 @@ def test_send_notification_email_task(smtp_mock, users, events):
     )
     db.session.flush()
 
-    with smtp_mock() as smtp:
-        smtp.send_message.assert_not_called()
+    smtp = smtp_mock.return_value
+    smtp.send_message.assert_not_called()
 
-        send_notification_email(notif_1.id)
+    send_notification_email(notif_1.id)
+    assert notif_1.email_sent
 
-        smtp.send_message.assert_called_once()
-        assert not smtp.send_message.call_args.kwargs
-        call_args = smtp.send_message.call_args.args
-        assert len(call_args) == 1
-        msg = call_args[0]
-        assert isinstance(msg, EmailMessage)
-        assert msg["From"] == "test@bemserver.org"
-        assert msg["To"] == user_1.email
-        assert msg["Subject"] == "[Campaign 1] WARNING: Custom event category 1"
-        assert msg.get_content() == "\n"
+    smtp.send_message.assert_called_once()
+    assert not smtp.send_message.call_args.kwargs
+    call_args = smtp.send_message.call_args.args
+    assert len(call_args) == 1
+    msg = call_args[0]
+    assert isinstance(msg, EmailMessage)
+    assert msg["From"] == "test@bemserver.org"
+    assert msg["To"] == user_1.email
+    assert msg["Subject"] == "[Campaign 1] WARNING: Custom event category 1"
+    assert msg.get_content() == "\n"
 
 
 @pytest.mark.parametrize(
@@ -407,51 +412,106 @@ def test_send_notification_email_task(smtp_mock, users, events):
     ),
     indirect=True,
 )
+@mock.patch("smtplib.SMTP")
 @pytest.mark.usefixtures("as_admin")
-@mock.patch("bemserver_core.model.notifications.send_notification_email.delay")
-def test_notification_after_insert(send_notification_email_delay_mock, users, events):
-    """Test notification mail task called on insert"""
+def test_send_notification_email_digest_task(smtp_mock, users, events):
+    """Test send_notification_email_digest sends one email per user"""
 
     user_1 = users[0]
+    user_2 = users[1]
     event_1 = events[0]
+    event_2 = events[1]
 
     timestamp_1 = dt.datetime(2020, 5, 1, tzinfo=dt.UTC)
+    timestamp_2 = dt.datetime(2020, 5, 2, tzinfo=dt.UTC)
+
+    smtp = smtp_mock.return_value
+    send_notification_email_digest()
+    smtp.send_message.assert_not_called()
 
     notif_1 = Notification.new(
+        user_id=user_1.id,
+        event_id=event_2.id,
+        timestamp=timestamp_2,
+    )
+    notif_2 = Notification.new(
         user_id=user_1.id,
         event_id=event_1.id,
         timestamp=timestamp_1,
     )
+    notif_3 = Notification.new(
+        user_id=user_2.id,
+        event_id=event_1.id,
+        timestamp=timestamp_1,
+    )
+    db.session.commit()
+    assert not any(n.email_sent for n in (notif_1, notif_2, notif_3))
 
-    # Flush. send_email not called.
-    db.session.flush()
-    send_notification_email_delay_mock.assert_not_called()
+    send_notification_email_digest()
 
-    # Commit. send_email called.
-    db.session.commit()
-    send_notification_email_delay_mock.assert_called_once()
-    send_notification_email_delay_mock.assert_called_with(notif_1.id)
+    assert smtp.send_message.call_count == 2
+    msg_1, msg_2 = (call.args[0] for call in smtp.send_message.call_args_list)
+    assert msg_1["To"] == user_1.email
+    assert msg_1["Subject"] == "2 new notifications"
+    assert msg_1.get_content() == (
+        "[Campaign 1] WARNING: Custom event category 1\n\n"
+        "[Campaign 2] DEBUG: Custom event category 2\n"
+    )
+    assert msg_2["To"] == user_2.email
+    assert msg_2["Subject"] == "[Campaign 1] WARNING: Custom event category 1"
+    assert all(n.email_sent for n in (notif_1, notif_2, notif_3))
+
+    # Notifications are only emailed once
+    smtp.send_message.reset_mock()
+    send_notification_email_digest()
+    smtp.send_message.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "config",
+    (
+        {
+            "SMTP_ENABLED": True,
+            "SMTP_FROM_ADDR": "test@bemserver.org",
+            "SMTP_HOST": "bemserver.org",
+        },
+    ),
+    indirect=True,
+)
+@mock.patch("smtplib.SMTP")
+@pytest.mark.usefixtures("as_admin")
+def test_send_notification_email_digest_task_send_error(smtp_mock, users, events):
+    """Test send_notification_email_digest keeps going when a send fails"""
+
+    user_1 = users[0]
+    user_2 = users[1]
+    event_1 = events[0]
+
+    timestamp_1 = dt.datetime(2020, 5, 1, tzinfo=dt.UTC)
 
-    # Commit after flush + delete. Notify not called.
-    send_notification_email_delay_mock.reset_mock()
-    notif = Notification.new(
+    notif_1 = Notification.new(
         user_id=user_1.id,
         event_id=event_1.id,
         timestamp=timestamp_1,
     )
-    db.session.flush()
-    notif.delete()
-    db.session.commit()
-    send_notification_email_delay_mock.assert_not_called()
-
-    # Commit after flush + rollback. Notify not called.
-    send_notification_email_delay_mock.reset_mock()
-    notif = Notification.new(
-        user_id=user_1.id,
+    notif_2 = Notification.new(
+        user_id=user_2.id,
         event_id=event_1.id,
         timestamp=timestamp_1,
     )
-    db.session.flush()
-    db.session.rollback()
     db.session.commit()
-    send_notification_email_delay_mock.assert_not_called()
+
+    # Second send fails: first user notification is flagged as sent
+    smtp = smtp_mock.return_value
+    smtp.send_message.side_effect = [None, smtplib.SMTPException("Failure")]
+    send_notification_email_digest()
+    assert smtp.send_message.call_count == 2
+    assert notif_1.email_sent
+    assert not notif_2.email_sent
+
+    # Only second user is emailed on next run
+    smtp.send_message.reset_mock(side_effect=True)
+    send_notification_email_digest()
+    assert smtp.send_message.call_count == 1
+    assert smtp.send_message.call_args.args[0]["To"] == user_2.email
+    assert notif_2.email_sent
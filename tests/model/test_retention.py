@@ -0,0 +1,147 @@
+"""Test retention policies"""
+
+import pytest
+
+from bemserver_core.authorization import CurrentUser, OpenBar
+from bemserver_core.database import db
+from bemserver_core.exceptions import (
+    BEMServerAuthorizationError,
+    BEMServerCoreRetentionPolicyError,
+)
+from bemserver_core.model import RetentionPolicy, TimeseriesDataState
+from bemserver_core.time_utils import PeriodEnum
+
+
+class TestRetentionPolicyModel:
+    @pytest.mark.usefixtures("retention_policies")
+    def test_retention_policy_delete_cascade(self, users, campaigns):
+        admin_user = users[0]
+        campaign_1 = campaigns[0]
+
+        with CurrentUser(admin_user):
+            assert len(list(RetentionPolicy.get())) == 2
+            campaign_1.delete()
+            db.session.commit()
+            assert len(list(RetentionPolicy.get())) == 1
+
+    def test_retention_policy_integrity(self, users, campaigns):
+        admin_user = users[0]
+        campaign_1 = campaigns[0]
+
+        with CurrentUser(admin_user):
+            ds_raw = TimeseriesDataState.get(name="Raw").first()
+            ds_clean = TimeseriesDataState.get(name="Clean").first()
+            RetentionPolicy.new(
+                campaign_id=campaign_1.id,
+                source_data_state_id=ds_raw.id,
+                target_data_state_id=ds_clean.id,
+                retention_unit=PeriodEnum.day,
+                retention_value=90,
+            )
+            with pytest.raises(BEMServerCoreRetentionPolicyError):
+                db.session.flush()
+            db.session.rollback()
+            RetentionPolicy.new(
+                campaign_id=campaign_1.id,
+                source_data_state_id=ds_raw.id,
+                target_data_state_id=ds_raw.id,
+                retention_unit=PeriodEnum.day,
+                retention_value=90,
+                bucket_width_unit=PeriodEnum.hour,
+                bucket_width_value=1,
+            )
+            with pytest.raises(BEMServerCoreRetentionPolicyError):
+                db.session.flush()
+            db.session.rollback()
+            RetentionPolicy.new(
+                campaign_id=campaign_1.id,
+                source_data_state_id=ds_raw.id,
+                target_data_state_id=ds_clean.id,
+                retention_unit=PeriodEnum.day,
+                retention_value=90,
+                bucket_width_unit=PeriodEnum.hour,
+                bucket_width_value=1,
+                aggregation="median",
+            )
+            with pytest.raises(BEMServerCoreRetentionPolicyError):
+                db.session.flush()
+            db.session.rollback()
+            RetentionPolicy.new(
+                campaign_id=campaign_1.id,
+                source_data_state_id=ds_raw.id,
+                target_data_state_id=ds_clean.id,
+                retention_unit=PeriodEnum.day,
+                retention_value=90,
+                bucket_width_unit=PeriodEnum.day,
+                bucket_width_value=2,
+            )
+            with pytest.raises(BEMServerCoreRetentionPolicyError):
+                db.session.flush()
+            db.session.rollback()
+            RetentionPolicy.new(
+                campaign_id=campaign_1.id,
+                source_data_state_id=ds_raw.id,
+                target_data_state_id=ds_clean.id,
+                retention_unit=PeriodEnum.day,
+                retention_value=90,
+                bucket_width_unit=PeriodEnum.hour,
+                bucket_width_value=6,
+                aggregation="max",
+            )
+            db.session.flush()
+
+    def test_retention_policy_authorizations_as_admin(self, users, campaigns):
+        admin_user = users[0]
+        assert admin_user.is_admin
+        campaign_1 = campaigns[0]
+        campaign_2 = campaigns[1]
+
+        with CurrentUser(admin_user):
+            ds_raw = TimeseriesDataState.get(name="Raw").first()
+            rp_1 = RetentionPolicy.new(
+                campaign_id=campaign_1.id,
+                source_data_state_id=ds_raw.id,
+                retention_unit=PeriodEnum.day,
+                retention_value=90,
+            )
+            db.session.commit()
+            rp = RetentionPolicy.get_by_id(rp_1.id)
+            assert rp.id == rp_1.id
+            rps = list(RetentionPolicy.get())
+            assert rps == [rp_1]
+            rp.update(campaign_id=campaign_2.id)
+            rp.delete()
+            db.session.commit()
+
+    @pytest.mark.usefixtures("users_by_user_groups")
+    @pytest.mark.usefixtures("user_groups_by_campaigns")
+    def test_retention_policy_authorizations_as_user(
+        self, users, campaigns, retention_policies
+    ):
+        user_1 = users[1]
+        assert not user_1.is_admin
+        campaign_1 = campaigns[0]
+        campaign_2 = campaigns[1]
+        rp_1 = retention_policies[0]
+        rp_2 = retention_policies[1]
+
+        with OpenBar():
+            ds_clean = TimeseriesDataState.get(name="Clean").first()
+
+        with CurrentUser(user_1):
+            with pytest.raises(BEMServerAuthorizationError):
+                RetentionPolicy.new(
+                    campaign_id=campaign_2.id,
+                    source_data_state_id=ds_clean.id,
+                    retention_unit=PeriodEnum.day,
+                    retention_value=90,
+                )
+            with pytest.raises(BEMServerAuthorizationError):
+                RetentionPolicy.get_by_id(rp_1.id)
+            RetentionPolicy.get_by_id(rp_2.id)
+            rps = list(RetentionPolicy.get())
+            assert rps == [rp_2]
+            with pytest.raises(BEMServerAuthorizationError):
+                rp_2.update(campaign_id=campaign_1.id)
+            with pytest.raises(BEMServerAuthorizationError):
+                rp_2.delete()
@@ -31,6 +31,7 @@ from bemserver_core.model import (
     TimeseriesProperty,
     TimeseriesPropertyData,
 )
+from bemserver_core.model.timeseries import TSBDS_CACHE
 
 DUMMY_ID = 69
 DUMMY_NAME = "Dummy name"
@@ -214,6 +215,54 @@ class TestTimeseriesModel:
         tsbds_l = list(TimeseriesByDataState.get())
         assert len(tsbds_l) == 1
 
+    @pytest.mark.usefixtures("as_admin")
+    @pytest.mark.parametrize("timeseries", (3,), indirect=True)
+    def test_timeseries_get_many_timeseries_by_data_state_ids(self, timeseries):
+        """Check timeseries x data_states associations are fetched or created"""
+        ts_1, ts_2, ts_3 = timeseries
+
+        ds_1 = TimeseriesDataState.get(name="Raw").first()
+        ds_2 = TimeseriesDataState.get(name="Clean").first()
+
+        tsbds_1 = ts_1.get_timeseries_by_data_state(ds_1)
+        db.session.commit()
+
+        # Create missing associations, fetch existing ones
+        tsbds_ids = Timeseries.get_many_timeseries_by_data_state_ids(
+            (ts_3, ts_1, ts_2), ds_1
+        )
+        tsbds_l = list(TimeseriesByDataState.get(data_state_id=ds_1.id))
+        assert len(tsbds_l) == 3
+        assert tsbds_ids == [
+            next(tsbds.id for tsbds in tsbds_l if tsbds.timeseries_id == ts.id)
+            for ts in (ts_3, ts_1, ts_2)
+        ]
+        assert tsbds_ids[1] == tsbds_1.id
+
+        # Associations are cached on commit only
+        assert TSBDS_CACHE.get((ts_3.id, ds_1.id)) is None
+        db.session.commit()
+        assert TSBDS_CACHE.get((ts_3.id, ds_1.id)) == tsbds_ids[0]
+        assert (
+            Timeseries.get_many_timeseries_by_data_state_ids((ts_3, ts_1, ts_2), ds_1)
+            == tsbds_ids
+        )
+
+        # Rolled-back associations are not cached
+        tsbds_ids = Timeseries.get_many_timeseries_by_data_state_ids((ts_1, ts_2), ds_2)
+        assert len(list(TimeseriesByDataState.get(data_state_id=ds_2.id))) == 2
+        db.session.rollback()
+        db.session.commit()
+        assert not list(TimeseriesByDataState.get(data_state_id=ds_2.id))
+        assert TSBDS_CACHE.get((ts_1.id, ds_2.id)) is None
+
+        # Deleted associations are removed from cache
+        tsbds_1.delete()
+        db.session.commit()
+        assert TSBDS_CACHE.get((ts_1.id, ds_1.id)) is None
+        tsbds_ids = Timeseries.get_many_timeseries_by_data_state_ids((ts_1,), ds_1)
+        assert tsbds_ids[0] != tsbds_1.id
+
     @pytest.mark.usefixtures("as_admin")
     def test_timeseries_get_by_name(self, campaigns, timeseries):
         campaign_1 = campaigns[0]
@@ -231,8 +280,26 @@ class TestTimeseriesModel:
         assert set(Timeseries.get_many_by_id([ts_1.id, ts_2.id])) == {ts_1, ts_2}
         assert set(Timeseries.get_many_by_id([ts_1.id])) == {ts_1}
 
-        with pytest.raises(TimeseriesNotFoundError):
-            Timeseries.get_many_by_id([ts_1.id, ts_2.id, DUMMY_ID])
+        with pytest.raises(
+            TimeseriesNotFoundError,
+            match=rf"Unknown timeseries: \[{DUMMY_ID}, {DUMMY_ID + 1}\]",
+        ):
+            Timeseries.get_many_by_id([ts_1.id, DUMMY_ID, ts_2.id, DUMMY_ID + 1])
+
+    @pytest.mark.usefixtures("users_by_user_groups")
+    @pytest.mark.usefixtures("user_groups_by_campaign_scopes")
+    def test_timeseries_get_many_by_id_as_user(self, users, timeseries):
+        user_1 = users[1]
+        assert not user_1.is_admin
+        ts_1 = timeseries[0]
+        ts_2 = timeseries[1]
+
+        with CurrentUser(user_1):
+            assert Timeseries.get_many_by_id([ts_2.id]) == [ts_2]
+            with pytest.raises(BEMServerAuthorizationError):
+                Timeseries.get_many_by_id([ts_1.id, ts_2.id])
+            with pytest.raises(TimeseriesNotFoundError):
+                Timeseries.get_many_by_id([ts_2.id, DUMMY_ID])
 
     @pytest.mark.usefixtures("as_admin")
     def test_timeseries_get_many_by_name(self, campaigns, timeseries):
@@ -249,7 +316,10 @@ class TestTimeseriesModel:
             )
         ) == {ts_1}
 
-        with pytest.raises(TimeseriesNotFoundError):
+        with pytest.raises(
+            TimeseriesNotFoundError,
+            match=rf"Unknown timeseries: \['{ts_2.name}', '{DUMMY_NAME}'\]",
+        ):
             Timeseries.get_many_by_name(campaign_1, [ts_1.name, ts_2.name, DUMMY_NAME])
 
     def test_timeseries_get_property_value(
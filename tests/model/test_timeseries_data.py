@@ -0,0 +1,362 @@
+"""Timeseries data tests"""
+
+import datetime as dt
+
+import pytest
+
+import sqlalchemy as sqla
+
+import pandas as pd
+
+from bemserver_core.authorization import OpenBar
+from bemserver_core.database import db
+from bemserver_core.input_output import tsdio
+from bemserver_core.model import (
+    TimeseriesData,
+    TimeseriesDataDirtyInterval,
+    TimeseriesDataRollup,
+    TimeseriesDataState,
+)
+from bemserver_core.time_utils import PeriodEnum
+from tests.utils import create_timeseries_data
+
+
+def get_rollups(period):
+    return [
+        (
+            r.timeseries_by_data_state_id,
+            r.bucket,
+            r.count,
+            r.sum,
+            r.min,
+            r.max,
+            r.first,
+            r.last,
+        )
+        for r in db.session.scalars(
+            sqla.select(TimeseriesDataRollup)
+            .filter_by(period=PeriodEnum(period))
+            .order_by(
+                TimeseriesDataRollup.timeseries_by_data_state_id,
+                TimeseriesDataRollup.bucket,
+            )
+        )
+    ]
+
+
+def get_partition_counts():
+    return db.session.execute(
+        sqla.text(
+            "SELECT CAST(tableoid AS regclass)::text, count(*) FROM ts_data "
+            "GROUP BY 1 ORDER BY 1"
+        )
+    ).all()
+
+
+class TestTimeseriesDataModel:
+    @pytest.mark.usefixtures("bemservercore")
+    def test_timeseries_data_partitions(self, timeseries):
+        ts_0 = timeseries[0]
+
+        with OpenBar():
+            ds_1 = TimeseriesDataState.get(name="Raw").first()
+            # Partitions for current and upcoming months are created at setup
+            upcoming = TimeseriesData.get_partitions()
+            assert len(upcoming) == 4
+            assert upcoming[0][1] == dt.datetime.now(tz=dt.UTC).replace(
+                day=1, hour=0, minute=0, second=0, microsecond=0
+            )
+
+            # Data goes to default partition
+            timestamps = pd.DatetimeIndex(
+                [
+                    "2020-01-15T00:00:00+00:00",
+                    "2020-01-31T23:30:00-02:00",
+                    "2020-03-01T00:00:00+00:00",
+                ],
+                tz="UTC",
+            )
+            create_timeseries_data(ts_0, ds_1, timestamps, [1.0, 2.0, 3.0])
+            assert get_partition_counts() == [("ts_data_default", 3)]
+
+            # Create partitions, moving data from default partition
+            start_dt = dt.datetime(2020, 1, 31, 12, tzinfo=dt.UTC)
+            end_dt = dt.datetime(2020, 3, 1, tzinfo=dt.UTC)
+            assert TimeseriesData.create_partitions(start_dt, end_dt) == [
+                "ts_data_p2020_01",
+                "ts_data_p2020_02",
+            ]
+            assert TimeseriesData.get_partitions() == [
+                (
+                    "ts_data_p2020_01",
+                    dt.datetime(2020, 1, 1, tzinfo=dt.UTC),
+                    dt.datetime(2020, 2, 1, tzinfo=dt.UTC),
+                ),
+                (
+                    "ts_data_p2020_02",
+                    dt.datetime(2020, 2, 1, tzinfo=dt.UTC),
+                    dt.datetime(2020, 3, 1, tzinfo=dt.UTC),
+                ),
+                *upcoming,
+            ]
+            assert get_partition_counts() == [
+                ("ts_data_default", 1),
+                ("ts_data_p2020_01", 1),
+                ("ts_data_p2020_02", 1),
+            ]
+
+            # Existing partitions are skipped
+            end_dt = dt.datetime(2020, 3, 2, tzinfo=dt.UTC)
+            assert TimeseriesData.create_partitions(start_dt, end_dt) == [
+                "ts_data_p2020_03"
+            ]
+            assert get_partition_counts() == [
+                ("ts_data_p2020_01", 1),
+                ("ts_data_p2020_02", 1),
+                ("ts_data_p2020_03", 1),
+            ]
+
+            # Data is routed to partitions
+            data_df = pd.DataFrame(
+                {ts_0.id: [4.0, 5.0]},
+                index=pd.DatetimeIndex(
+                    ["2020-01-01T00:00:00+00:00", "2021-01-01T00:00:00+00:00"],
+                    name="timestamp",
+                ),
+            )
+            tsdio.set_timeseries_data(data_df, ds_1)
+            assert get_partition_counts() == [
+                ("ts_data_default", 1),
+                ("ts_data_p2020_01", 2),
+                ("ts_data_p2020_02", 1),
+                ("ts_data_p2020_03", 1),
+            ]
+
+            # Drop partitions ending before datetime
+            assert TimeseriesData.drop_partitions(
+                dt.datetime(2020, 3, 15, tzinfo=dt.UTC)
+            ) == ["ts_data_p2020_01", "ts_data_p2020_02"]
+            assert [p[0] for p in TimeseriesData.get_partitions()] == [
+                "ts_data_p2020_03",
+                *(p[0] for p in upcoming),
+            ]
+            assert get_partition_counts() == [
+                ("ts_data_default", 1),
+                ("ts_data_p2020_03", 1),
+            ]
+
+
+class TestTimeseriesDataRollupModel:
+    @pytest.mark.parametrize(
+        "config", ({"TIMESERIES_DATA_ROLLUPS": True},), indirect=True
+    )
+    @pytest.mark.parametrize("timeseries", (2,), indirect=True)
+    def test_timeseries_data_rollup_refresh(self, timeseries):
+        ts_0, ts_1 = timeseries
+        start_dt = dt.datetime(2020, 1, 1, 23, tzinfo=dt.UTC)
+
+        with OpenBar():
+            ds_1 = TimeseriesDataState.get(name="Raw").first()
+            tsbds_0 = ts_0.get_timeseries_by_data_state(ds_1)
+            tsbds_1 = ts_1.get_timeseries_by_data_state(ds_1)
+            db.session.commit()
+
+            index = pd.date_range(start_dt, periods=4, freq="30min", name="timestamp")
+            data_df = pd.DataFrame(
+                {ts_0.id: [1.0, 2.0, 3.0, 4.0], ts_1.id: [5.0, None, None, 6.0]},
+                index=index,
+            )
+            tsdio.set_timeseries_data(data_df, ds_1)
+            assert len(
+                db.session.scalars(sqla.select(TimeseriesDataDirtyInterval)).all()
+            )
+            db.session.commit()
+
+            # Only refresh TS 0
+            TimeseriesDataRollup.refresh([tsbds_0.id])
+            assert get_rollups("hour") == [
+                (tsbds_0.id, start_dt, 2, 3.0, 1.0, 2.0, 1.0, 2.0),
+                (
+                    tsbds_0.id,
+                    start_dt + dt.timedelta(hours=1),
+                    2,
+                    7.0,
+                    3.0,
+                    4.0,
+                    3.0,
+                    4.0,
+                ),
+            ]
+            assert get_rollups("day") == [
+                (
+                    tsbds_0.id,
+                    start_dt - dt.timedelta(hours=23),
+                    2,
+                    3.0,
+                    1.0,
+                    2.0,
+                    1.0,
+                    2.0,
+                ),
+                (
+                    tsbds_0.id,
+                    start_dt + dt.timedelta(hours=1),
+                    2,
+                    7.0,
+                    3.0,
+                    4.0,
+                    3.0,
+                    4.0,
+                ),
+            ]
+
+            # Refresh all
+            TimeseriesDataRollup.refresh()
+            assert not db.session.scalars(
+                sqla.select(TimeseriesDataDirtyInterval)
+            ).all()
+            assert get_rollups("hour")[2:] == [
+                (tsbds_1.id, start_dt, 1, 5.0, 5.0, 5.0, 5.0, 5.0),
+                (
+                    tsbds_1.id,
+                    start_dt + dt.timedelta(hours=1),
+                    1,
+                    6.0,
+                    6.0,
+                    6.0,
+                    6.0,
+                    6.0,
+                ),
+            ]
+
+            # Incremental refresh: write data in the same day
+            data_df = pd.DataFrame(
+                {ts_0.id: [0.0]},
+                index=pd.DatetimeIndex(
+                    [start_dt - dt.timedelta(hours=2)], name="timestamp"
+                ),
+            )
+            tsdio.set_timeseries_data(data_df, ds_1)
+            TimeseriesDataRollup.refresh()
+            assert get_rollups("hour")[:3] == [
+                (
+                    tsbds_0.id,
+                    start_dt - dt.timedelta(hours=2),
+                    1,
+                    0.0,
+                    0.0,
+                    0.0,
+                    0.0,
+                    0.0,
+                ),
+                (tsbds_0.id, start_dt, 2, 3.0, 1.0, 2.0, 1.0, 2.0),
+                (
+                    tsbds_0.id,
+                    start_dt + dt.timedelta(hours=1),
+                    2,
+                    7.0,
+                    3.0,
+                    4.0,
+                    3.0,
+                    4.0,
+                ),
+            ]
+            assert get_rollups("day")[:2] == [
+                (
+                    tsbds_0.id,
+                    start_dt - dt.timedelta(hours=23),
+                    3,
+                    3.0,
+                    0.0,
+                    2.0,
+                    0.0,
+                    2.0,
+                ),
+                (
+                    tsbds_0.id,
+                    start_dt + dt.timedelta(hours=1),
+                    2,
+                    7.0,
+                    3.0,
+                    4.0,
+                    3.0,
+                    4.0,
+                ),
+            ]
+
+            # Delete data
+            tsdio.delete(
+                start_dt + dt.timedelta(hours=1),
+                start_dt + dt.timedelta(hours=2),
+                (ts_0, ts_1),
+                ds_1,
+            )
+            TimeseriesDataRollup.refresh()
+            assert get_rollups("hour") == [
+                (
+                    tsbds_0.id,
+                    start_dt - dt.timedelta(hours=2),
+                    1,
+                    0.0,
+                    0.0,
+                    0.0,
+                    0.0,
+                    0.0,
+                ),
+                (tsbds_0.id, start_dt, 2, 3.0, 1.0, 2.0, 1.0, 2.0),
+                (tsbds_1.id, start_dt, 1, 5.0, 5.0, 5.0, 5.0, 5.0),
+            ]
+            assert get_rollups("day") == [
+                (
+                    tsbds_0.id,
+                    start_dt - dt.timedelta(hours=23),
+                    3,
+                    3.0,
+                    0.0,
+                    2.0,
+                    0.0,
+                    2.0,
+                ),
+                (
+                    tsbds_1.id,
+                    start_dt - dt.timedelta(hours=23),
+                    1,
+                    5.0,
+                    5.0,
+                    5.0,
+                    5.0,
+                    5.0,
+                ),
+            ]
+
+            # Deleting timeseries x data state deletes rollups
+            db.session.delete(tsbds_1)
+            db.session.flush()
+            assert len(get_rollups("hour")) == 2
+
+    @pytest.mark.parametrize("timeseries", (2,), indirect=True)
+    def test_timeseries_data_rollup_rebuild(self, timeseries):
+        ts_0, ts_1 = timeseries
+        start_dt = dt.datetime(2020, 1, 1, tzinfo=dt.UTC)
+
+        with OpenBar():
+            ds_1 = TimeseriesDataState.get(name="Raw").first()
+
+            # Rollups are disabled: no dirty interval is logged
+            timestamps = pd.date_range(start_dt, periods=3, freq="h")
+            create_timeseries_data(ts_0, ds_1, timestamps, [1.0, 2.0, 3.0])
+            create_timeseries_data(ts_1, ds_1, timestamps, [4.0, 5.0, 6.0])
+            tsbds_0 = ts_0.get_timeseries_by_data_state(ds_1)
+            data_df = pd.DataFrame({ts_0.id: [1.0]}, index=timestamps[:1])
+            tsdio.set_timeseries_data(data_df, ds_1)
+            assert not db.session.scalars(
+                sqla.select(TimeseriesDataDirtyInterval)
+            ).all()
+
+            TimeseriesDataRollup.rebuild([tsbds_0.id])
+            assert get_rollups("day") == [
+                (tsbds_0.id, start_dt, 3, 6.0, 1.0, 3.0, 1.0, 3.0),
+            ]
+            TimeseriesDataRollup.rebuild()
+            assert len(get_rollups("hour")) == 6
+            assert len(get_rollups("day")) == 2
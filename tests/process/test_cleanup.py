@@ -4,17 +4,22 @@ import datetime as dt
 
 import pytest
 
+import sqlalchemy as sqla
+
 import numpy as np
 import pandas as pd
 from pandas.testing import assert_frame_equal
 
 from bemserver_core.authorization import CurrentUser, OpenBar
+from bemserver_core.database import db
+from bemserver_core.input_output import tsdio
 from bemserver_core.model import (
+    TimeseriesDataDirtyInterval,
     TimeseriesDataState,
     TimeseriesProperty,
     TimeseriesPropertyData,
 )
-from bemserver_core.process.cleanup import cleanup
+from bemserver_core.process.cleanup import cleanup, cleanup_in_db
 from tests.utils import create_timeseries_data
 
 
@@ -87,3 +92,85 @@ class TestCleanupProcess:
             )
             expected.columns.name = "id"
             assert_frame_equal(ret, expected)
+
+    @pytest.mark.parametrize(
+        "config",
+        ({"TIMESERIES_DATA_ROLLUPS": False}, {"TIMESERIES_DATA_ROLLUPS": True}),
+        indirect=True,
+    )
+    @pytest.mark.parametrize("timeseries", (4,), indirect=True)
+    def test_cleanup_in_db_process(self, users, timeseries):
+        admin_user = users[0]
+        assert admin_user.is_admin
+        # Min/Max
+        ts_0 = timeseries[0]
+        # Min only
+        ts_1 = timeseries[1]
+        # None
+        ts_2 = timeseries[2]
+        # Min/Max, no data
+        ts_3 = timeseries[3]
+
+        with OpenBar():
+            ds_1 = TimeseriesDataState.get(name="Raw").first()
+            ds_2 = TimeseriesDataState.get(name="Clean").first()
+            ts_p_min = TimeseriesProperty.get(name="Min").first()
+            ts_p_max = TimeseriesProperty.get(name="Max").first()
+            for ts, prop, value in (
+                (ts_0, ts_p_min, "12"),
+                (ts_0, ts_p_max, "42"),
+                (ts_1, ts_p_min, "12"),
+                (ts_3, ts_p_min, "12"),
+                (ts_3, ts_p_max, "42"),
+            ):
+                TimeseriesPropertyData.new(
+                    timeseries_id=ts.id, property_id=prop.id, value=value
+                )
+
+        start_dt = dt.datetime(2020, 1, 1, tzinfo=dt.UTC)
+        end_dt = dt.datetime(2020, 1, 2, tzinfo=dt.UTC)
+        timestamps = pd.date_range(start_dt, end_dt, inclusive="both", freq="6h")
+        values = [0, 13, 33, 42, 69]
+        create_timeseries_data(ts_0, ds_1, timestamps, values)
+        create_timeseries_data(ts_1, ds_1, timestamps, values)
+        create_timeseries_data(ts_2, ds_1, timestamps, values)
+
+        with CurrentUser(admin_user):
+            ts_l = (ts_0, ts_1, ts_2, ts_3)
+            cleanup_in_db(start_dt, end_dt, ts_l, ds_1, ds_2)
+            ret = tsdio.get_timeseries_data(
+                start_dt, end_dt, ts_l, ds_2, inclusive="both"
+            )
+            # Same output as cleanup
+            expected = cleanup(start_dt, end_dt, ts_l, ds_1)
+            assert_frame_equal(ret, expected)
+
+            intervals = db.session.scalars(
+                sqla.select(TimeseriesDataDirtyInterval)
+            ).all()
+            if tsdio._use_rollups:
+                assert sorted(
+                    (i.timeseries_by_data_state_id, i.start_time, i.end_time)
+                    for i in intervals
+                ) == [
+                    (
+                        ts.get_timeseries_by_data_state(ds_2).id,
+                        start,
+                        timestamps[3] + dt.timedelta(microseconds=1),
+                    )
+                    for ts, start in (
+                        (ts_0, timestamps[1]),
+                        (ts_1, timestamps[1]),
+                        (ts_2, timestamps[0]),
+                    )
+                ]
+            else:
+                assert not intervals
+
+            # Data already in target data state is left untouched
+            cleanup_in_db(start_dt, end_dt, ts_l, ds_1, ds_2, inclusive="both")
+            ret = tsdio.get_timeseries_data(
+                start_dt, end_dt, ts_l, ds_2, inclusive="both"
+            )
+            expected = cleanup(start_dt, end_dt, ts_l, ds_1, inclusive="both")
+            assert_frame_equal(ret, expected)
@@ -1,16 +1,21 @@
 """Cleanup task tests"""
 
 import datetime as dt
+from unittest import mock
 
 import pytest
 
+import numpy as np
 import pandas as pd
 from pandas.testing import assert_frame_equal
 
 from bemserver_core.authorization import OpenBar
-from bemserver_core.database import db
+from bemserver_core.celery import celery
+from bemserver_core.database import ReadReplica, db
 from bemserver_core.input_output import tsdio
 from bemserver_core.model import (
+    Timeseries,
+    TimeseriesByDataState,
     TimeseriesDataState,
     TimeseriesProperty,
     TimeseriesPropertyData,
@@ -69,3 +74,186 @@ class TestCleanupScheduledTask:
             no_data_df = pd.DataFrame({ts_1.id: []}, index=index)
             no_data_df.columns.name = "id"
             assert_frame_equal(data_df, no_data_df)
+
+    @pytest.mark.parametrize("campaigns", (2,), indirect=True)
+    @pytest.mark.parametrize("timeseries", (4,), indirect=True)
+    @pytest.mark.parametrize("batch_size", (1, 100))
+    def test_cleanup_data_watermark(self, timeseries, campaigns, batch_size):
+        ts_0 = timeseries[0]
+        ts_2 = timeseries[2]
+        campaign_1 = campaigns[0]
+        assert list(campaign_1.timeseries) == [ts_0, ts_2]
+
+        with OpenBar():
+            ds_1 = TimeseriesDataState.get(name="Raw").first()
+            ds_2 = TimeseriesDataState.get(name="Clean").first()
+            ts_p_min = TimeseriesProperty.get(name="Min").first()
+            TimeseriesPropertyData.new(
+                timeseries_id=ts_0.id,
+                property_id=ts_p_min.id,
+                value="12",
+            )
+            db.session.flush()
+
+        start_dt = dt.datetime(2020, 1, 1, tzinfo=dt.UTC)
+        end_dt = dt.datetime(2020, 1, 2, tzinfo=dt.UTC)
+        create_timeseries_data(
+            ts_0,
+            ds_1,
+            pd.DatetimeIndex(["2020-01-01T06:00", "2020-01-01T12:00"], tz="UTC"),
+            [13, 0],
+        )
+        create_timeseries_data(
+            ts_2, ds_1, pd.DatetimeIndex(["2020-01-01T06:00"], tz="UTC"), [1]
+        )
+
+        with OpenBar():
+            cleanup_data(campaign_1, start_dt, end_dt, batch_size=batch_size)
+
+            # Watermark is last raw data, even if it is an outlier
+            tsbds_0 = ts_0.get_timeseries_by_data_state(ds_1)
+            tsbds_2 = ts_2.get_timeseries_by_data_state(ds_1)
+            assert tsbds_0.cleanup_watermark == dt.datetime(
+                2020, 1, 1, 12, tzinfo=dt.UTC
+            )
+            assert tsbds_2.cleanup_watermark == dt.datetime(
+                2020, 1, 1, 6, tzinfo=dt.UTC
+            )
+
+        # Late data before watermark moves watermark back
+        with OpenBar():
+            data_df = pd.DataFrame(
+                {ts_0.id: [14.0, 20.0], ts_2.id: [np.nan, 2.0]},
+                index=pd.DatetimeIndex(
+                    ["2020-01-01T18:00", "2020-01-01T09:00"], tz="UTC"
+                ),
+            )
+            tsdio.set_timeseries_data(data_df, ds_1)
+            db.session.commit()
+
+            assert tsbds_0.cleanup_watermark == dt.datetime(
+                2020, 1, 1, 8, 59, 59, 999999, tzinfo=dt.UTC
+            )
+            assert tsbds_2.cleanup_watermark == dt.datetime(
+                2020, 1, 1, 6, tzinfo=dt.UTC
+            )
+
+            # Writing data in another data state leaves watermarks untouched
+            with mock.patch.object(
+                TimeseriesByDataState, "rewind_cleanup_watermarks"
+            ) as rewind_mock:
+                data_df = pd.DataFrame(
+                    {ts_0.id: [1.0]},
+                    index=pd.DatetimeIndex(["2020-01-05T03:00"], tz="UTC"),
+                )
+                tsdio.set_timeseries_data(data_df, ds_2)
+                db.session.commit()
+                rewind_mock.assert_not_called()
+            assert tsbds_0.cleanup_watermark == dt.datetime(
+                2020, 1, 1, 8, 59, 59, 999999, tzinfo=dt.UTC
+            )
+
+            with mock.patch.object(
+                tsdio, "get_timeseries_data", wraps=tsdio.get_timeseries_data
+            ) as get_mock:
+                cleanup_data(campaign_1, start_dt, end_dt, batch_size=batch_size)
+                # Data is read from oldest watermark of each batch
+                expected_starts = [
+                    dt.datetime(2020, 1, 1, 8, 59, 59, 999999, tzinfo=dt.UTC),
+                    dt.datetime(2020, 1, 1, 6, tzinfo=dt.UTC),
+                ]
+                if batch_size != 1:
+                    expected_starts = expected_starts[1:]
+                assert [
+                    call.args[0] for call in get_mock.call_args_list
+                ] == expected_starts
+
+            data_df = tsdio.get_timeseries_data(start_dt, end_dt, (ts_0, ts_2), ds_2)
+            index = pd.DatetimeIndex(
+                [
+                    "2020-01-01T06:00:00+00:00",
+                    "2020-01-01T09:00:00+00:00",
+                    "2020-01-01T18:00:00+00:00",
+                ],
+                name="timestamp",
+                tz="UTC",
+            ).as_unit("us")
+            expected_data_df = pd.DataFrame(
+                {ts_0.id: [13.0, 20.0, 14.0], ts_2.id: [1.0, 2.0, np.nan]},
+                index=index,
+            )
+            expected_data_df.columns.name = "id"
+            assert_frame_equal(data_df, expected_data_df)
+
+    @pytest.mark.parametrize("timeseries", (4,), indirect=True)
+    def test_cleanup_data_no_raw_data(self, timeseries, campaigns):
+        ts_0 = timeseries[0]
+        ts_2 = timeseries[2]
+        campaign_1 = campaigns[0]
+
+        start_dt = dt.datetime(2020, 1, 1, tzinfo=dt.UTC)
+        end_dt = dt.datetime(2020, 1, 2, tzinfo=dt.UTC)
+
+        with OpenBar():
+            ds_1 = TimeseriesDataState.get(name="Raw").first()
+            ds_2 = TimeseriesDataState.get(name="Clean").first()
+
+        create_timeseries_data(
+            ts_0, ds_1, pd.DatetimeIndex(["2020-01-01T06:00"], tz="UTC"), [1]
+        )
+
+        with OpenBar():
+            with mock.patch.object(
+                tsdio, "get_timeseries_data", wraps=tsdio.get_timeseries_data
+            ) as get_mock:
+                cleanup_data(campaign_1, start_dt, end_dt)
+                # Timeseries without raw data are not read
+                assert get_mock.call_args_list[0].args[2] == [ts_0]
+
+            # No timeseries x data state is created for timeseries without data
+            for ts, ds, exists in (
+                (ts_2, ds_1, False),
+                (ts_2, ds_2, False),
+                (ts_0, ds_2, True),
+            ):
+                tsbds = TimeseriesByDataState.get(timeseries=ts, data_state=ds)
+                assert (tsbds.first() is not None) is exists
+
+    @pytest.mark.parametrize("timeseries", (4,), indirect=True)
+    def test_cleanup_data_lagging_read_replica(
+        self, replica_db, users, timeseries, campaigns
+    ):
+        """Check cleanup task reads data from primary database"""
+        admin_user_id = users[0].id
+        ts_0_id = timeseries[0].id
+        campaign_1_id = campaigns[0].id
+
+        start_dt = dt.datetime(2020, 1, 1, tzinfo=dt.UTC)
+        end_dt = dt.datetime(2020, 1, 2, tzinfo=dt.UTC)
+
+        with OpenBar():
+            ds_1 = TimeseriesDataState.get(name="Raw").first()
+        create_timeseries_data(
+            timeseries[0], ds_1, pd.DatetimeIndex(["2020-01-01T06:00"], tz="UTC"), [1]
+        )
+
+        # Read replica has no data, as if it was lagging behind primary database
+        db.set_replica_url(replica_db)
+        with ReadReplica():
+            celery.tasks["Cleanup"].apply(
+                (admin_user_id, campaign_1_id, start_dt, end_dt)
+            )
+
+        # Session was removed at the end of the task
+        with OpenBar():
+            ts_0 = Timeseries.get_by_id(ts_0_id)
+            ds_1 = TimeseriesDataState.get(name="Raw").first()
+            ds_2 = TimeseriesDataState.get(name="Clean").first()
+            data_df = tsdio.get_timeseries_data(start_dt, end_dt, (ts_0,), ds_2)
+            assert data_df[ts_0.id].tolist() == [1.0]
+            tsbds_0 = TimeseriesByDataState.get(
+                timeseries=ts_0, data_state=ds_1
+            ).first()
+            assert tsbds_0.cleanup_watermark == dt.datetime(
+                2020, 1, 1, 6, tzinfo=dt.UTC
+            )
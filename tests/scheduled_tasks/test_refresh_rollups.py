@@ -0,0 +1,61 @@
+"""Refresh rollups task tests"""
+
+import datetime as dt
+
+import pytest
+
+import sqlalchemy as sqla
+
+import pandas as pd
+
+from bemserver_core.authorization import OpenBar
+from bemserver_core.database import db
+from bemserver_core.input_output import tsdio
+from bemserver_core.model import (
+    TimeseriesDataDirtyInterval,
+    TimeseriesDataRollup,
+    TimeseriesDataState,
+)
+from bemserver_core.tasks.refresh_rollups import refresh_rollups
+
+
+class TestRefreshRollupsScheduledTask:
+    @pytest.mark.parametrize(
+        "config", ({"TIMESERIES_DATA_ROLLUPS": True},), indirect=True
+    )
+    @pytest.mark.parametrize("campaigns", (2,), indirect=True)
+    @pytest.mark.parametrize("timeseries", (2,), indirect=True)
+    def test_refresh_rollups(self, users, timeseries, campaigns):
+        admin_user = users[0]
+        assert admin_user.is_admin
+        ts_0, ts_1 = timeseries
+        campaign_1 = campaigns[0]
+
+        start_dt = dt.datetime(2020, 1, 1, tzinfo=dt.UTC)
+        end_dt = dt.datetime(2020, 1, 2, tzinfo=dt.UTC)
+
+        with OpenBar():
+            ds_1 = TimeseriesDataState.get(name="Raw").first()
+            index = pd.date_range(start_dt, end_dt, inclusive="left", freq="12h")
+            data_df = pd.DataFrame({ts_0.id: [1.0, 2.0], ts_1.id: [3.0, 4.0]}, index)
+            tsdio.set_timeseries_data(data_df, ds_1)
+            tsbds_0 = ts_0.get_timeseries_by_data_state(ds_1)
+            tsbds_1 = ts_1.get_timeseries_by_data_state(ds_1)
+
+            refresh_rollups(campaign_1, start_dt, end_dt)
+
+            # Only campaign 1 timeseries are refreshed
+            intervals = db.session.scalars(
+                sqla.select(TimeseriesDataDirtyInterval)
+            ).all()
+            assert [i.timeseries_by_data_state_id for i in intervals] == [tsbds_1.id]
+            rollups = db.session.scalars(
+                sqla.select(TimeseriesDataRollup).order_by(
+                    TimeseriesDataRollup.period, TimeseriesDataRollup.bucket
+                )
+            ).all()
+            assert [(r.timeseries_by_data_state_id, r.sum) for r in rollups] == [
+                (tsbds_0.id, 1.0),
+                (tsbds_0.id, 2.0),
+                (tsbds_0.id, 3.0),
+            ]
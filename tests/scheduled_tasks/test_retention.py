@@ -0,0 +1,204 @@
+"""Retention task tests"""
+
+import datetime as dt
+from unittest import mock
+from zoneinfo import ZoneInfo
+
+import pytest
+
+import numpy as np
+import pandas as pd
+from pandas.testing import assert_frame_equal
+
+from bemserver_core.authorization import OpenBar
+from bemserver_core.input_output import tsdio
+from bemserver_core.model import RetentionPolicy, TimeseriesDataState
+from bemserver_core.tasks.retention import apply_retention
+from bemserver_core.time_utils import PeriodEnum
+from tests.utils import create_timeseries_data
+
+
+class TestApplyRetentionScheduledTask:
+    @pytest.mark.parametrize("timeseries", (2,), indirect=True)
+    def test_apply_retention(self, timeseries, campaigns, retention_policies):
+        ts_0, ts_1 = timeseries
+        campaign_1 = campaigns[0]
+        campaign_2 = campaigns[1]
+        rp_1 = retention_policies[0]
+
+        timestamps = pd.DatetimeIndex(
+            [
+                "2019-12-31T23:50:00",
+                "2019-12-31T23:55:00",
+                "2020-01-15T00:00:00",
+                "2020-01-15T00:05:00",
+                "2020-01-15T00:10:00",
+                "2020-01-31T23:55:00",
+                "2020-02-01T00:00:00",
+            ],
+            tz="UTC",
+        )
+        values = [1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0]
+        start_dt = dt.datetime(2019, 1, 1, tzinfo=dt.UTC)
+        end_dt = dt.datetime(2020, 5, 1, tzinfo=dt.UTC)
+
+        with OpenBar():
+            ds_raw = TimeseriesDataState.get(name="Raw").first()
+            ds_clean = TimeseriesDataState.get(name="Clean").first()
+            create_timeseries_data(ts_0, ds_raw, timestamps, values)
+            create_timeseries_data(ts_1, ds_raw, timestamps, values)
+
+            # Crash while processing second batch
+            delete = tsdio.delete
+
+            def delete_then_crash(*args):
+                if delete_mock.call_count > 1:
+                    raise RuntimeError
+                delete(*args)
+
+            with mock.patch.object(
+                tsdio, "delete", side_effect=delete_then_crash
+            ) as delete_mock:
+                with pytest.raises(RuntimeError):
+                    apply_retention(campaign_1, start_dt, end_dt)
+                assert delete_mock.call_count == 2
+            # First batch was committed
+            assert rp_1.processed_until == dt.datetime(2020, 1, 1, tzinfo=dt.UTC)
+
+            # Resume
+            apply_retention(campaign_1, start_dt, end_dt)
+            assert rp_1.processed_until == dt.datetime(2020, 2, 1, tzinfo=dt.UTC)
+
+            raw_df = tsdio.get_timeseries_data(start_dt, end_dt, (ts_0, ts_1), ds_raw)
+            expected_raw_df = pd.DataFrame(
+                {
+                    ts_0.id: [np.nan] * 6 + [7.0],
+                    ts_1.id: values,
+                },
+                index=pd.DatetimeIndex(timestamps, name="timestamp").as_unit("us"),
+            )
+            expected_raw_df.columns.name = "id"
+            assert_frame_equal(raw_df, expected_raw_df, check_freq=False)
+
+            clean_df = tsdio.get_timeseries_data(
+                start_dt, end_dt, (ts_0, ts_1), ds_clean
+            )
+            expected_clean_df = pd.DataFrame(
+                {
+                    ts_0.id: [1.5, 4.0, 6.0],
+                    ts_1.id: [np.nan] * 3,
+                },
+                index=pd.DatetimeIndex(
+                    [
+                        "2019-12-31T23:45:00",
+                        "2020-01-15T00:00:00",
+                        "2020-01-31T23:45:00",
+                    ],
+                    tz="UTC",
+                    name="timestamp",
+                ).as_unit("us"),
+            )
+            expected_clean_df.columns.name = "id"
+            assert_frame_equal(clean_df, expected_clean_df, check_freq=False)
+
+            # Nothing more to process
+            with mock.patch.object(tsdio, "delete") as delete_mock:
+                apply_retention(campaign_1, start_dt, end_dt)
+                delete_mock.assert_not_called()
+
+            # Disabled policy
+            with mock.patch.object(tsdio, "delete") as delete_mock:
+                apply_retention(campaign_2, start_dt, end_dt)
+                delete_mock.assert_not_called()
+
+    @pytest.mark.parametrize("timeseries", (2,), indirect=True)
+    def test_apply_retention_delete_only(self, timeseries, campaigns):
+        ts_0, ts_1 = timeseries
+        campaign_1 = campaigns[0]
+
+        timestamps = pd.date_range(
+            "2020-01-01T00:00:00", "2020-03-01T00:00:00", freq="10D", tz="UTC"
+        )
+        values = np.arange(len(timestamps), dtype=float)
+
+        with OpenBar():
+            ds_raw = TimeseriesDataState.get(name="Raw").first()
+            create_timeseries_data(ts_0, ds_raw, timestamps, values)
+            RetentionPolicy.new(
+                campaign_id=campaign_1.id,
+                source_data_state_id=ds_raw.id,
+                retention_unit=PeriodEnum.week,
+                retention_value=2,
+            )
+
+            apply_retention(
+                campaign_1,
+                dt.datetime(2020, 1, 1, tzinfo=dt.UTC),
+                dt.datetime(2020, 3, 1, tzinfo=dt.UTC),
+            )
+
+            raw_df = tsdio.get_timeseries_data(None, None, (ts_0,), ds_raw)
+            # Data older than 2020-02-16 is deleted
+            assert list(raw_df.index) == list(timestamps[-2:])
+
+    @pytest.mark.parametrize("timeseries", (1,), indirect=True)
+    def test_apply_retention_count_local_timezone(self, timeseries, campaigns):
+        ts_0 = timeseries[0]
+        campaign_1 = campaigns[0]
+
+        timestamps = pd.DatetimeIndex(
+            [
+                "2020-01-31T22:30:00",
+                "2020-01-31T22:45:00",
+                "2020-02-15T10:00:00",
+            ],
+            tz="UTC",
+        )
+
+        with OpenBar():
+            campaign_1.timezone = "Europe/Paris"
+            ds_raw = TimeseriesDataState.get(name="Raw").first()
+            ds_clean = TimeseriesDataState.get(name="Clean").first()
+            create_timeseries_data(ts_0, ds_raw, timestamps, [1.0, 2.0, 3.0])
+            RetentionPolicy.new(
+                campaign_id=campaign_1.id,
+                source_data_state_id=ds_raw.id,
+                target_data_state_id=ds_clean.id,
+                retention_unit=PeriodEnum.day,
+                retention_value=1,
+                bucket_width_unit=PeriodEnum.hour,
+                bucket_width_value=1,
+                aggregation="count",
+            )
+
+            with mock.patch.object(tsdio, "delete", wraps=tsdio.delete) as delete_mock:
+                apply_retention(
+                    campaign_1,
+                    dt.datetime(2020, 1, 1, tzinfo=dt.UTC),
+                    dt.datetime(2020, 3, 1, 23, tzinfo=dt.UTC),
+                )
+            # Batches are aligned on local months
+            tz_info = ZoneInfo("Europe/Paris")
+            assert [call.args[:2] for call in delete_mock.call_args_list] == [
+                (
+                    dt.datetime(2020, 1, 31, 23, tzinfo=tz_info),
+                    dt.datetime(2020, 2, 1, tzinfo=tz_info),
+                ),
+                (
+                    dt.datetime(2020, 2, 1, tzinfo=tz_info),
+                    dt.datetime(2020, 3, 1, tzinfo=tz_info),
+                ),
+            ]
+
+            # Empty buckets are not written
+            clean_df = tsdio.get_timeseries_data(None, None, (ts_0,), ds_clean)
+            expected_clean_df = pd.DataFrame(
+                {ts_0.id: [2.0, 1.0]},
+                index=pd.DatetimeIndex(
+                    ["2020-01-31T22:00:00", "2020-02-15T10:00:00"],
+                    tz="UTC",
+                    name="timestamp",
+                ).as_unit("us"),
+            )
+            expected_clean_df.columns.name = "id"
+            assert_frame_equal(clean_df, expected_clean_df, check_freq=False)
@@ -0,0 +1,35 @@
+"""Timeseries data partitions task tests"""
+
+import datetime as dt
+
+import pytest
+
+from bemserver_core.authorization import OpenBar
+from bemserver_core.model import TimeseriesData
+from bemserver_core.tasks.ts_data_partitions import create_ts_data_partitions
+
+
+class TestCreateTimeseriesDataPartitionsScheduledTask:
+    @pytest.mark.usefixtures("bemservercore")
+    def test_create_ts_data_partitions(self):
+        now = dt.datetime.now(tz=dt.UTC)
+        month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+        with OpenBar():
+            # Drop partitions created at setup
+            TimeseriesData.drop_partitions(now + dt.timedelta(days=200))
+            assert TimeseriesData.get_partitions() == []
+
+            create_ts_data_partitions()
+            partitions = TimeseriesData.get_partitions()
+            assert len(partitions) == 4
+            assert partitions[0][1] == month_start
+            for prev, part in zip(partitions[:-1], partitions[1:], strict=True):
+                assert part[1] == prev[2]
+
+            # Running again does not create anything
+            create_ts_data_partitions(months_ahead=1)
+            assert TimeseriesData.get_partitions() == partitions
+
+            create_ts_data_partitions(months_ahead=4)
+            assert len(TimeseriesData.get_partitions()) == 5
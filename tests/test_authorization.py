@@ -6,9 +6,45 @@ import pytest
 
 import sqlalchemy as sqla
 
-from bemserver_core.authorization import AuthMgrMixin, AuthorizationsManager
+from bemserver_core.authorization import (
+    AuthMgrMixin,
+    AuthorizationsManager,
+    CurrentUser,
+    OpenBar,
+    clear_current_user_cache,
+    get_current_user_cache,
+)
 from bemserver_core.database import Base, db
-from bemserver_core.exceptions import BEMServerAuthorizationUndefinedActionError
+from bemserver_core.exceptions import (
+    BEMServerAuthorizationError,
+    BEMServerAuthorizationUndefinedActionError,
+)
+from bemserver_core.model import User
+
+
+class TestCurrentUser:
+    def test_current_user_cache(self, users):
+        user_1 = users[0]
+        user_2 = users[1]
+
+        assert get_current_user_cache(user_1) is None
+
+        with CurrentUser(user_1):
+            cache = get_current_user_cache(user_1)
+            assert cache == {}
+            assert get_current_user_cache(user_2) is None
+            cache["test"] = 42
+            assert get_current_user_cache(user_1) == {"test": 42}
+            # Nested context has its own cache
+            with CurrentUser(user_1):
+                assert get_current_user_cache(user_1) == {}
+            assert get_current_user_cache(user_1) == {"test": 42}
+            clear_current_user_cache()
+            assert get_current_user_cache(user_1) == {}
+
+        assert get_current_user_cache(user_1) is None
+        # No-op outside of a current user context
+        clear_current_user_cache()
 
 
 class TestAuthorizationsManager:
@@ -24,6 +60,52 @@ class TestAuthorizationsManager:
         with pytest.raises(BEMServerAuthorizationUndefinedActionError):
             auth_mgr.eval_rule("dummy", None, None)
 
+    def test_auth_mgr_eval_many_rule(self):
+        auth_mgr = AuthorizationsManager()
+
+        @auth_mgr.add_rule("test")
+        def test(actor, item):
+            return item > 0
+
+        # No many items rule: fallback to single item rule
+        assert auth_mgr.eval_many_rule("test", None, [1, 2]) is True
+        assert auth_mgr.eval_many_rule("test", None, [1, 0]) is False
+
+        @auth_mgr.add_many_rule("test")
+        def test_many(actor, items):
+            return min(items) > 1
+
+        assert auth_mgr.eval_many_rule("test", None, [2, 3]) is True
+        assert auth_mgr.eval_many_rule("test", None, [1, 2]) is False
+
+        with pytest.raises(BEMServerAuthorizationUndefinedActionError):
+            auth_mgr.eval_many_rule("dummy", None, [1])
+
+    @pytest.mark.usefixtures("bemservercore")
+    def test_auth_mgr_authorize_many(self):
+        auth_mgr = AuthorizationsManager()
+
+        @auth_mgr.add_many_rule("test")
+        def test_many(actor, items):
+            return all(items)
+
+        user = User(
+            name="John", email="john@test.com", _is_admin=False, _is_active=True
+        )
+        admin = User(
+            name="Chuck", email="chuck@test.com", _is_admin=True, _is_active=True
+        )
+
+        with CurrentUser(user):
+            auth_mgr.authorize_many("test", [True, True])
+            auth_mgr.authorize_many("test", [])
+            with pytest.raises(BEMServerAuthorizationError):
+                auth_mgr.authorize_many("test", [True, False])
+        with CurrentUser(admin):
+            auth_mgr.authorize_many("test", [True, False])
+        with OpenBar():
+            auth_mgr.authorize_many("test", [True, False])
+
 
 class TestAuthMgrMixin:
     @pytest.mark.usefixtures("database")
@@ -1,13 +1,27 @@
 """Celery task manager tests"""
 
+import datetime as dt
+from unittest import mock
+from zoneinfo import ZoneInfo
+
 import pytest
 
 import sqlalchemy as sqla
 
-from bemserver_core.authorization import OPEN_BAR, auth_mgr
-from bemserver_core.celery import BEMServerCoreCelery, BEMServerCoreSystemTask
-from bemserver_core.database import db
-from bemserver_core.model import User
+from celery import current_task
+
+from bemserver_core.authorization import OPEN_BAR, OpenBar, auth_mgr
+from bemserver_core.celery import (
+    BEMServerCoreAsyncTask,
+    BEMServerCoreCelery,
+    BEMServerCoreSystemTask,
+    celery,
+    worker_process_init_cb,
+)
+from bemserver_core.database import READ_REPLICA, ReadReplica, db
+from bemserver_core.model import TaskByCampaign, User
+from bemserver_core.settings import DEFAULT_CONFIG
+from bemserver_core.time_utils import PeriodEnum
 
 
 class TestCelery:
@@ -28,6 +42,20 @@ class TestCelery:
 
         assert result.state == "SUCCESS"
 
+    @pytest.mark.usefixtures("bemservercore")
+    def test_celery_base_task_primary_db(self):
+        """Check base task sends all queries to primary database"""
+        celery = BEMServerCoreCelery("BEMServer Core")
+
+        @celery.task(base=BEMServerCoreSystemTask)
+        def dummy_task():
+            assert READ_REPLICA.get() is False
+
+        with ReadReplica():
+            result = dummy_task.apply()
+
+        assert result.state == "SUCCESS"
+
     @pytest.mark.usefixtures("bemservercore")
     def test_celery_base_task_rollback(self):
         """Check base task rollback
@@ -79,3 +107,156 @@ class TestCelery:
         assert result.state == "SUCCESS"
         result = success_session_ok_2.apply()
         assert result.state == "SUCCESS"
+
+    @pytest.mark.parametrize(
+        "config",
+        ({"SCHEDULED_TASKS_CONCURRENCY": 0}, {"SCHEDULED_TASKS_CONCURRENCY": 2}),
+        indirect=True,
+    )
+    def test_celery_scheduled_task_fan_out(self, campaigns, monkeypatch):
+        """Check scheduled task runs task function for each enabled campaign"""
+        monkeypatch.setattr(celery.conf, "task_always_eager", True)
+        calls = []
+        child_task_ids = set()
+
+        def dummy_function(campaign, start_dt, end_dt, param):
+            calls.append((campaign.id, param))
+            child_task_ids.add(current_task.request.id)
+
+        class DummyTask(BEMServerCoreAsyncTask):
+            TASK_FUNCTION = dummy_function
+            DEFAULT_PARAMETERS = {"param": 0}
+
+        celery.register_task(DummyTask)
+        scheduled_task = celery.tasks["DummyTaskScheduled"]
+
+        with OpenBar():
+            for campaign in campaigns:
+                TaskByCampaign.new(
+                    task_name="DummyTaskScheduled",
+                    campaign_id=campaign.id,
+                    offset_unit=PeriodEnum.day,
+                    parameters={"param": campaign.id},
+                )
+            TaskByCampaign.new(
+                task_name="DummyTaskScheduled",
+                campaign_id=campaigns[0].id,
+                offset_unit=PeriodEnum.day,
+                is_enabled=False,
+            )
+            db.session.commit()
+            campaign_ids = sorted(c.id for c in campaigns)
+
+        result = scheduled_task.apply()
+        assert result.state == "SUCCESS"
+
+        assert sorted(calls) == [(c_id, c_id) for c_id in campaign_ids]
+        nb_child_tasks = celery.scheduled_tasks_concurrency or len(campaigns)
+        assert len(child_task_ids) == nb_child_tasks
+
+    def test_celery_async_task_time_windows(self, users, campaigns, monkeypatch):
+        """Check async task processes time windows and resumes on retry"""
+        monkeypatch.setattr(celery.conf, "task_always_eager", True)
+        admin_user = users[0]
+        campaign_1 = campaigns[0]
+        tz_info = ZoneInfo(campaign_1.timezone)
+        start_dt = dt.datetime(2020, 1, 1, tzinfo=tz_info)
+        end_dt = dt.datetime(2020, 4, 1, tzinfo=tz_info)
+        calls = []
+        failures = []
+
+        def dummy_function(campaign, start_dt, end_dt, param):
+            calls.append((start_dt, end_dt, param))
+            # Fail once, on second window
+            if param and len(calls) == 2 and not failures:
+                failures.append(start_dt)
+                raise ValueError("Failure")
+
+        class DummyWindowTask(BEMServerCoreAsyncTask):
+            TASK_FUNCTION = dummy_function
+            DEFAULT_PARAMETERS = {"param": 0}
+
+        task = celery.register_task(DummyWindowTask)
+
+        # No window
+        task.apply((admin_user.id, campaign_1.id, start_dt, end_dt))
+        assert calls == [(start_dt, end_dt, 0)]
+        calls.clear()
+
+        # Windows, failed window is retried
+        task.apply(
+            (admin_user.id, campaign_1.id, start_dt, end_dt),
+            {"window_unit": "month", "param": 1},
+        )
+        feb_dt = dt.datetime(2020, 2, 1, tzinfo=tz_info)
+        mar_dt = dt.datetime(2020, 3, 1, tzinfo=tz_info)
+        assert failures == [feb_dt]
+        assert calls == [
+            (start_dt, feb_dt, 1),
+            (feb_dt, mar_dt, 1),
+            (feb_dt, mar_dt, 1),
+            (mar_dt, end_dt, 1),
+        ]
+
+    @pytest.mark.parametrize(
+        "config",
+        (
+            {
+                "SQLALCHEMY_ENGINE_OPTIONS": {"pool_size": 3},
+                "SQLALCHEMY_WORKER_ENGINE_OPTIONS": {"pool_size": 1},
+            },
+        ),
+        indirect=True,
+    )
+    def test_celery_worker_process_init(self, bemservercore):
+        parent_engine = db.engine
+        with (
+            mock.patch.object(parent_engine, "dispose") as dispose_mock,
+            mock.patch.object(db, "init_core", wraps=db.init_core) as init_core_mock,
+        ):
+            worker_process_init_cb()
+        # Connections inherited from parent process are not closed
+        dispose_mock.assert_called_once_with(close=False)
+        # Engines are created once, with worker options
+        init_core_mock.assert_called_once()
+        assert init_core_mock.call_args.kwargs == {"worker": True}
+        assert db.engine is not parent_engine
+        assert db.get_pool_status()["size"] == 1
+
+    def test_celery_notification_email_digest_beat_schedule(self):
+        celery = BEMServerCoreCelery("BEMServer Core")
+        bsc = mock.Mock(config=DEFAULT_CONFIG.copy())
+
+        # Digest task is scheduled by default
+        celery.init_app(bsc)
+        assert celery.conf.beat_schedule == {
+            "notification_email_digest": {
+                "task": "NotificationEmailDigest",
+                "schedule": 300,
+            },
+        }
+
+        # Digest task added to beat schedule
+        beat_schedule = {"cleanup": {"task": "CleanupScheduled", "schedule": 60}}
+        bsc.config["CELERY_CONFIG"] = {"beat_schedule": beat_schedule}
+        bsc.config["NOTIFICATION_EMAIL_DIGEST_INTERVAL"] = 30
+        celery.init_app(bsc)
+        assert celery.conf.beat_schedule == {
+            **beat_schedule,
+            "notification_email_digest": {
+                "task": "NotificationEmailDigest",
+                "schedule": 30,
+            },
+        }
+
+        # Digest task already in beat schedule
+        beat_schedule = {"digest": {"task": "NotificationEmailDigest", "schedule": 60}}
+        bsc.config["CELERY_CONFIG"] = {"beat_schedule": beat_schedule}
+        celery.init_app(bsc)
+        assert celery.conf.beat_schedule == beat_schedule
+
+        # Default digest schedule disabled
+        bsc.config["CELERY_CONFIG"] = {}
+        bsc.config["NOTIFICATION_EMAIL_DIGEST_INTERVAL"] = None
+        celery.init_app(bsc)
+        assert celery.conf.beat_schedule == {}
@@ -1,7 +1,11 @@
 """BEMServerCore tests"""
 
+import subprocess
+import sys
+
 import pytest
 
+import bemserver_core
 from bemserver_core import BEMServerCore
 from bemserver_core.exceptions import BEMServerCoreSettingsError
 
@@ -41,3 +45,25 @@ class TestBEMServerCore:
         assert bsc.config["test"] == 1
         assert "_test" not in bsc.config
         assert "__test" not in bsc.config
+
+    def test_lazy_imports(self):
+        # Run in a new interpreter as modules are already imported here
+        script = (
+            "import sys; import bemserver_core; "
+            "print(' '.join(m for m in ("
+            "'pandas', 'sqlalchemy', 'celery', 'pint', 'requests', "
+            "'bemserver_core.model', 'bemserver_core.tasks'"
+            ") if m in sys.modules))"
+        )
+        ret = subprocess.run(
+            [sys.executable, "-c", script], capture_output=True, check=True, text=True
+        )
+        assert ret.stdout.strip() == ""
+
+    def test_lazy_attributes(self):
+        assert bemserver_core.celery_app is bemserver_core.celery.celery
+        assert bemserver_core.ems is bemserver_core.email.ems
+        assert bemserver_core.wdp is bemserver_core.process.weather.wdp
+        assert "Cleanup" in bemserver_core.celery_app.tasks
+        with pytest.raises(AttributeError, match="has no attribute 'dummy'"):
+            bemserver_core.dummy  # noqa: B018
@@ -1,13 +1,68 @@
 """Email tests"""
 
+import socket
 from email.message import EmailMessage
 from unittest import mock
 
 import pytest
 
+from aiosmtpd.controller import Controller
+
 from bemserver_core.email import ems, send_email
 
 
+class SMTPHandler:
+    """aiosmtpd handler recording sessions and messages"""
+
+    def __init__(self):
+        self.nb_sessions = 0
+        self.envelopes = []
+
+    async def handle_EHLO(self, server, session, envelope, hostname, responses):
+        self.nb_sessions += 1
+        session.host_name = hostname
+        return responses
+
+    async def handle_DATA(self, server, session, envelope):
+        self.envelopes.append(envelope)
+        return "250 Message accepted for delivery"
+
+
+def get_free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+SMTP_PORT = get_free_port()
+
+
+class SMTPServer:
+    """Local SMTP server"""
+
+    def __init__(self):
+        self.handler = SMTPHandler()
+        self.controller = None
+
+    def start(self):
+        self.controller = Controller(self.handler, hostname="127.0.0.1", port=SMTP_PORT)
+        self.controller.start()
+
+    def stop(self):
+        self.controller.stop()
+        self.controller = None
+
+
+@pytest.fixture
+def smtp_server():
+    server = SMTPServer()
+    server.start()
+    yield server
+    ems.close()
+    if server.controller is not None:
+        server.stop()
+
+
 class TestEmail:
     @mock.patch("bemserver_core.email.send_email.delay")
     def test_email_send_smtp_disabled(self, send_email_delay_mock, bemservercore):
@@ -30,17 +85,17 @@ class TestEmail:
     def test_email_send_smtp_enabled(self, smtp_mock, bemservercore):
         assert bemservercore.config["SMTP_ENABLED"] is True
         ems.send(["test1@test.com", "test2@test.com"], "Test subject", "Test content")
-        with smtp_mock() as smtp:
-            smtp.send_message.assert_called_once()
-            assert not smtp.send_message.call_args.kwargs
-            call_args = smtp.send_message.call_args.args
-            assert len(call_args) == 1
-            msg = call_args[0]
-            assert isinstance(msg, EmailMessage)
-            assert msg["From"] == "test@bemserver.org"
-            assert msg["To"] == "test1@test.com, test2@test.com"
-            assert msg["Subject"] == "Test subject"
-            assert msg.get_content() == "Test content\n"
+        smtp = smtp_mock.return_value
+        smtp.send_message.assert_called_once()
+        assert not smtp.send_message.call_args.kwargs
+        call_args = smtp.send_message.call_args.args
+        assert len(call_args) == 1
+        msg = call_args[0]
+        assert isinstance(msg, EmailMessage)
+        assert msg["From"] == "test@bemserver.org"
+        assert msg["To"] == "test1@test.com, test2@test.com"
+        assert msg["Subject"] == "Test subject"
+        assert msg.get_content() == "Test content\n"
 
     @pytest.mark.parametrize(
         "config",
@@ -57,13 +112,51 @@ class TestEmail:
     @mock.patch("smtplib.SMTP")
     def test_email_send_email_task(self, smtp_mock):
         send_email(["test1@test.com", "test2@test.com"], "Test subject", "Test content")
-        with smtp_mock() as smtp:
-            smtp.send_message.assert_called_once()
-            assert not smtp.send_message.call_args.kwargs
-            call_args = smtp.send_message.call_args.args
-            assert len(call_args) == 1
-            msg = call_args[0]
-            assert msg["From"] == "test@bemserver.org"
-            assert msg["To"] == "test1@test.com, test2@test.com"
-            assert msg["Subject"] == "Test subject"
-            assert msg.get_content() == "Test content\n"
+        smtp = smtp_mock.return_value
+        smtp.send_message.assert_called_once()
+        assert not smtp.send_message.call_args.kwargs
+        call_args = smtp.send_message.call_args.args
+        assert len(call_args) == 1
+        msg = call_args[0]
+        assert msg["From"] == "test@bemserver.org"
+        assert msg["To"] == "test1@test.com, test2@test.com"
+        assert msg["Subject"] == "Test subject"
+        assert msg.get_content() == "Test content\n"
+
+    @pytest.mark.parametrize(
+        "config",
+        (
+            {
+                "SMTP_ENABLED": True,
+                "SMTP_FROM_ADDR": "test@bemserver.org",
+                "SMTP_HOST": "127.0.0.1",
+                "SMTP_PORT": SMTP_PORT,
+            },
+        ),
+        indirect=True,
+    )
+    @pytest.mark.usefixtures("bemservercore")
+    def test_email_send_many_smtp_server(self, smtp_server):
+        handler = smtp_server.handler
+
+        # Messages are sent over a single connection
+        ems.send_many(
+            [
+                (["test1@test.com"], f"Test subject {i}", "Test content")
+                for i in range(10)
+            ]
+        )
+        ems.send(["test2@test.com"], "Test subject", "Test content")
+        assert handler.nb_sessions == 1
+        assert len(handler.envelopes) == 11
+        assert handler.envelopes[0].mail_from == "test@bemserver.org"
+        assert handler.envelopes[0].rcpt_tos == ["test1@test.com"]
+        assert handler.envelopes[-1].rcpt_tos == ["test2@test.com"]
+
+        # Connection is reopened if closed by server
+        smtp_server.stop()
+        smtp_server.start()
+        ems.send(["test3@test.com"], "Test subject", "Test content")
+        assert handler.nb_sessions == 2
+        assert len(handler.envelopes) == 12
+        assert handler.envelopes[-1].rcpt_tos == ["test3@test.com"]
@@ -13,6 +13,7 @@ from bemserver_core.time_utils import (
     floor,
     make_date_offset,
     make_date_range_around_datetime,
+    make_time_windows,
 )
 
 PERIODS = ("second", "minute", "hour", "day", "week", "month", "year")
@@ -179,3 +180,26 @@ def test_make_date_range_around_datetime(timezone):
         dt.datetime(2019, 12, 30, 0, 0, tzinfo=timezone),
         dt.datetime(2020, 1, 4, 0, 0, tzinfo=timezone),
     )
+
+
+@pytest.mark.parametrize("timezone", (dt.UTC, ZoneInfo("Europe/Paris")))
+def test_make_time_windows(timezone):
+    dt_1 = dt.datetime(2020, 1, 1, tzinfo=timezone)
+    dt_2 = dt.datetime(2020, 3, 15, tzinfo=timezone)
+    assert list(make_time_windows(dt_1, dt_2, "month")) == [
+        (dt_1, dt.datetime(2020, 2, 1, tzinfo=timezone)),
+        (
+            dt.datetime(2020, 2, 1, tzinfo=timezone),
+            dt.datetime(2020, 3, 1, tzinfo=timezone),
+        ),
+        (dt.datetime(2020, 3, 1, tzinfo=timezone), dt_2),
+    ]
+    assert list(make_time_windows(dt_1, dt_2, "day", 30)) == [
+        (dt_1, dt.datetime(2020, 1, 31, tzinfo=timezone)),
+        (
+            dt.datetime(2020, 1, 31, tzinfo=timezone),
+            dt.datetime(2020, 3, 1, tzinfo=timezone),
+        ),
+        (dt.datetime(2020, 3, 1, tzinfo=timezone), dt_2),
+    ]
+    assert list(make_time_windows(dt_1, dt_1, "day")) == []
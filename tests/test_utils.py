@@ -0,0 +1,30 @@
+"""Utils tests"""
+
+from bemserver_core.utils import LRUCache
+
+
+class TestLRUCache:
+    def test_lru_cache(self):
+        cache = LRUCache(maxsize=2)
+        assert len(cache) == 0
+        assert cache.get("a") is None
+        assert cache.get("a", 0) == 0
+
+        cache.set("a", 1)
+        cache.set("b", 2)
+        assert len(cache) == 2
+        assert cache.get("a") == 1
+
+        # Least recently used item is discarded
+        cache.set("c", 3)
+        assert len(cache) == 2
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+
+        assert cache.pop("a") == 1
+        assert cache.pop("a") is None
+        assert cache.get("a") is None
+
+        cache.clear()
+        assert len(cache) == 0